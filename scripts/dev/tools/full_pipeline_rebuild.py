@@ -59,7 +59,7 @@ from worker.app.config import settings  # type: ignore
 from worker.app.utils.docids import (  # single-source ID + path helpers
     canonicalize_relpath,
     document_id_for_relpath,
-    chunk_id_for,
+    chunk_ids_for,
 )
 from worker.app.services.chunker import chunk_text  # type: ignore
 from worker.app.services.embed_ollama import embed_texts as embed_texts_real  # type: ignore
@@ -200,29 +200,15 @@ def _reindex(indexing_threshold: int, debug: bool) -> Dict[str, Any]:
         return {"ok": False, "error": f"ensure failed: {e}"}
 
     # reinsert
-    inserted = 0
-    batch: List[Tuple[str, List[float], Dict[str, Any]]] = []
-    for pid, payload, vec in points:
-        batch.append((pid, vec, payload))
-        if len(batch) >= 128:
-            upsert_points(
-                batch,
-                collection_name=CANONICAL_COLLECTION,
-                client=client,
-                batch_size=len(batch),
-                ensure=False,
-            )
-            inserted += len(batch)
-            batch.clear()
-    if batch:
-        upsert_points(
-            batch,
-            collection_name=CANONICAL_COLLECTION,
-            client=client,
-            batch_size=len(batch),
-            ensure=False,
-        )
-        inserted += len(batch)
+    # a list (not a generator): one upload and one worker pool for the whole
+    # reload, with HNSW indexing paused until it is done
+    inserted = upsert_points(
+        [(pid, vec, payload) for pid, payload, vec in points],
+        collection_name=CANONICAL_COLLECTION,
+        client=client,
+        ensure=False,
+        bulk=True,
+    )
     return {
         "ok": True,
         "reindexed": recreated,
@@ -321,6 +307,7 @@ def _process_audio_files(
                 print(f"[debug] delete_by_document_id failed {rel}: {e}")
 
         payload_items: List[Tuple[str, List[float], Dict[str, Any]]] = []
+        chunk_ids = chunk_ids_for(doc_id, len(raw_chunks))
         for idx, (chunk_text_str, vec) in enumerate(zip(raw_chunks, vectors)):
             payload = {
                 "document_id": str(doc_id),
@@ -334,7 +321,7 @@ def _process_audio_files(
                     "mtime": fp.stat().st_mtime,
                 },
             }
-            payload_items.append((str(chunk_id_for(doc_id, idx)), vec, payload))
+            payload_items.append((str(chunk_ids[idx]), vec, payload))
 
         inserted = upsert_points(
             payload_items,
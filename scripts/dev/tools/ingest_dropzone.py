@@ -79,6 +79,7 @@ from worker.app.utils.docids import (  # noqa: E402
     canonicalize_relpath,
     document_id_for_relpath,
     chunk_id_for,
+    chunk_ids_for,
 )
 
 # Local alias to keep call sites unchanged after module import above
@@ -471,6 +472,7 @@ def ingest_dir(
 
         # build items
         items: List[Tuple[str, List[float], Dict[str, Any]]] = []
+        chunk_ids = chunk_ids_for(document_uuid, len(chunks))
         for idx, (text, vec) in enumerate(zip(chunks, vecs)):
             key = (document_id, idx)
             if key in seen_points:
@@ -478,7 +480,7 @@ def ingest_dir(
                 continue
             seen_points.add(key)
             rec = ChunkRecord(
-                id=str(chunk_id_for(document_uuid, idx)),
+                id=str(chunk_ids[idx]),
                 document_id=document_id,
                 path=rel_path,
                 kind=kind,
@@ -542,13 +544,15 @@ def do_stats(
     document_id: str | None, kind: str | None, path: str | None
 ) -> Dict[str, Any]:
     client = get_qdrant_client()
-    total = q_count(collection_name=CANONICAL_COLLECTION, client=client)
+    # Reported numbers: ask for exact counts, not segment estimates
+    total = q_count(collection_name=CANONICAL_COLLECTION, client=client, exact=True)
     per_kind: Dict[str, int] = {}
     for k in ("text", "pdf", "audio", "image"):
         per_kind[k] = q_count(
             collection_name=CANONICAL_COLLECTION,
             client=client,
             query_filter=build_filter(document_id=document_id, path=path, kind=k),
+            exact=True,
         )
     filtered = None
     if document_id or kind or path:
@@ -556,6 +560,7 @@ def do_stats(
             collection_name=CANONICAL_COLLECTION,
             client=client,
             query_filter=build_filter(document_id=document_id, kind=kind, path=path),
+            exact=True,
         )
     return {
         "ok": True,
@@ -49,9 +49,7 @@ def ensure_collection(
 ) -> None:
     try:
         # Check if collection exists
-        collections = client.get_collections()
-        existing_names = [c.name for c in collections.collections]
-        if coll in existing_names:
+        if client.collection_exists(coll):
             print(f"[ok] collection {coll} (exists)")
             return
 
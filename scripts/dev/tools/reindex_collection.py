@@ -217,29 +217,16 @@ def main():
 
     # 3) Reinsert
     if points:
-        batch: List[Tuple[str, List[float], Dict[str, Any]]] = []
-        inserted = 0
-        for pid, payload, vec in points:
-            batch.append((pid, vec, payload))
-            if len(batch) >= args.batch_size:
-                upsert_points(
-                    batch,
-                    collection_name=collection,
-                    client=client,
-                    batch_size=len(batch),
-                    ensure=False,
-                )
-                inserted += len(batch)
-                batch.clear()
-        if batch:
-            upsert_points(
-                batch,
-                collection_name=collection,
-                client=client,
-                batch_size=len(batch),
-                ensure=False,
-            )
-            inserted += len(batch)
+        # A list (not a generator): one upload and one worker pool for the
+        # whole reload, with HNSW indexing paused until it is done
+        inserted = upsert_points(
+            [(pid, vec, payload) for pid, payload, vec in points],
+            collection_name=collection,
+            client=client,
+            batch_size=args.batch_size,
+            ensure=False,
+            bulk=True,
+        )
         print(
             json.dumps(
                 {
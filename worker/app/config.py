@@ -32,6 +32,11 @@ class Settings(BaseSettings):
     # --- Service URLs ---------------------------------------------------------
     OLLAMA_URL: str = "http://host.docker.internal:11434"
     QDRANT_URL: str = "http://host.docker.internal:6333"
+    # Transport for the shared qdrant_client.QdrantClient: gRPC needs the
+    # gRPC port reachable; REST keeps a keep-alive pool of QDRANT_POOL_SIZE.
+    QDRANT_PREFER_GRPC: int = 0
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_POOL_SIZE: int = 32
 
     # --- Collections (text and optional images) -------------------------------
     QDRANT_COLLECTION: str = "jsonify2ai_chunks"
@@ -44,6 +49,10 @@ class Settings(BaseSettings):
     # Batch sizes (keep small for CPU/dev, bump in prod)
     EMBED_BATCH_SIZE: int = 64
     QDRANT_UPSERT_BATCH_SIZE: int = 128
+    # Batches at/above this many points go through upload_collection
+    QDRANT_UPLOAD_MIN_POINTS: int = 1024
+    # Uploader worker processes for bulk loads and bulk_upload (0 -> min(8, cpu count))
+    QDRANT_UPLOAD_PARALLEL: int = 0
 
     # --- Chunking (token-ish sizing) -----------------------------------------
     CHUNK_SIZE: int = 800
@@ -64,8 +73,21 @@ class Settings(BaseSettings):
         "IMAGES_CAPTION_MODEL", "Salesforce/blip-image-captioning-base"
     )
     STT_MODEL: str = "tiny"
+    # Content-hash cache for captions/transcripts: off unless set, use an absolute path
+    MEDIA_CACHE_DIR: str = ""
     DEBUG_CONFIG: Optional[int] = 0
     QDRANT_RECREATE_BAD: int = 0  # 1 -> auto recreate bad/mismatched collection
+    QDRANT_QUANTIZATION: int = 0  # 1 -> new collections use int8 scalar quantization
+    # With quantization: fetch k * N int8 candidates and rescore on FP32 (<=1 -> server default)
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0
+    # HNSW beam width per search (recall vs latency); 0 -> server default (ef_construct)
+    QDRANT_HNSW_EF: int = 0
+    # Seconds to reuse results of an identical search (same vector/k/filter); 0 (default)
+    # disables. Writes from other processes (ingest scripts) only show up after the TTL
+    QDRANT_SEARCH_CACHE_TTL: int = 0
+    # Concurrent query_batch_points calls for large search_batch inputs (1 disables);
+    # helps most on collections with few segments
+    QDRANT_CLIENT_SEARCH_PARALLELISM: int = 4
 
     # --- Dropzone / Exports (used by scripts + status summaries) --------------
     DROPZONE_DIR: str = "data/dropzone"
@@ -2,16 +2,19 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-import requests
 import time
 from worker.app.services.qdrant_client import search as q_search
 from qdrant_client.models import Filter, FieldCondition, MatchValue, Range
 from worker.app.config import settings
 from worker.app.services.embed_ollama import embed_texts
 from worker.app.telemetry import telemetry
+from worker.app.utils.http import json_loads, pooled_session
 
 router = APIRouter()
 
+# Pooled keep-alive connections to Ollama for synthesis calls
+_SESSION = pooled_session(pool_connections=10, pool_maxsize=50)
+
 
 class AskBody(BaseModel):
     query: str
@@ -229,7 +232,7 @@ def _format_prompt(q: str, text_hits: List[dict], img_hits: List[dict]):
 
 def _ollama_generate(prompt: str, model: str = None):
     try:
-        r = requests.post(
+        r = _SESSION.post(
             f"{settings.OLLAMA_URL}/api/generate",
             json={
                 "model": model or settings.ASK_MODEL,
@@ -243,7 +246,7 @@ def _ollama_generate(prompt: str, model: str = None):
             timeout=180,
         )
         if r.ok:
-            j = r.json()
+            j = json_loads(r.content)
             return j.get("response", "").strip()
     except Exception:
         pass
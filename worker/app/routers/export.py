@@ -3,12 +3,15 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Query, Depends
 from fastapi.responses import PlainTextResponse, StreamingResponse
 from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import Filter, FieldCondition, MatchValue
 from worker.app.config import settings
 from worker.app.services.qdrant_client import get_qdrant_client
 from worker.app.telemetry import telemetry
 from worker.app.dependencies.auth import require_auth
 import logging
 import io
+import json
 import os
 import os.path
 import zipfile
@@ -26,9 +29,6 @@ def _scroll_by_docid(client: QdrantClient, collection: str, document_id: str) ->
     """Scroll through points for a document_id in a collection.
     Returns empty list if collection doesn't exist (404).
     """
-    from qdrant_client.models import Filter, FieldCondition, MatchValue
-    from qdrant_client.http.exceptions import UnexpectedResponse
-
     try:
         filt = Filter(
             must=[
@@ -74,8 +74,6 @@ def _export_doc(client: QdrantClient, collection: str, document_id: str) -> str:
             "text": pl.get("text"),
             "meta": pl.get("meta", {}),
         }
-        import json
-
         out_lines.append(json.dumps(row, ensure_ascii=False))
     return "\n".join(out_lines)
 
@@ -143,8 +141,6 @@ def export_get(
             "text": pl.get("text"),
             "meta": pl.get("meta", {}),
         }
-        import json
-
         out_lines.append(json.dumps(row, ensure_ascii=False))
 
     data = "\n".join(out_lines)
@@ -243,9 +239,7 @@ def export_archive_get(
                 "text": pl.get("text"),
                 "meta": pl.get("meta", {}),
             }
-            import json as _json
-
-            jsonl_buf.write(_json.dumps(row, ensure_ascii=False))
+            jsonl_buf.write(json.dumps(row, ensure_ascii=False))
             jsonl_buf.write("\n")
 
             # Determine source file to include (first existing path under data/)
@@ -349,8 +343,6 @@ For more information, visit: https://github.com/Mugiwara555343/jsonify2ai
                 }
 
             # Build manifest as last entry
-            import json as _json
-
             manifest = {
                 "request_id": request_id,
                 "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
@@ -363,9 +355,7 @@ For more information, visit: https://github.com/Mugiwara555343/jsonify2ai
             }
             if source_entry:
                 manifest["files"].append(source_entry)
-            zf.writestr(
-                "manifest.json", _json.dumps(manifest, indent=2).encode("utf-8")
-            )
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
 
         zip_bytes.seek(0)
 
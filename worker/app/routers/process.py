@@ -17,12 +17,14 @@ from worker.app.utils.docids import (
     document_id_for_relpath,
     canonicalize_relpath,
     chunk_id_for,
+    chunk_ids_for,
 )
 from worker.app.services.qdrant_client import (
     get_qdrant_client,
     upsert_points,
     delete_by_document_id,
     ensure_collection,
+    replace_document,
 )
 from worker.app.services.embed_ollama import embed_texts
 from worker.app.services.file_router import extract_text_auto
@@ -574,15 +576,6 @@ async def process_text(request: Request, _: bool = Depends(require_auth)):
                 )
 
         # Regular text processing (not a transcript or transcript parsing failed)
-        # Delete existing points for this document (idempotent re-ingest)
-        try:
-            delete_by_document_id(docid, client=client)
-            log.info("[process/text] cleared existing points for doc=%s", docid)
-        except Exception as e:
-            log.warning(
-                "[process/text] delete_by_document_id failed doc=%s err=%s", docid, e
-            )
-
         # Chunk using config defaults (same as CLI)
         chunks = chunk_text(
             raw_text,
@@ -620,12 +613,12 @@ async def process_text(request: Request, _: bool = Depends(require_auth)):
             }
             items.append((point_id, vec, payload_data))
 
-        # Upsert to collection (same as CLI)
-        upserted = upsert_points(
+        # Replace this document's points (idempotent re-ingest)
+        upserted = replace_document(
+            docid,
             items,
             collection_name=settings.QDRANT_COLLECTION,
             client=client,
-            ensure=False,
         )
 
         # Record status summary
@@ -751,15 +744,6 @@ async def process_pdf(request: Request, _: bool = Depends(require_auth)):
             dim=settings.EMBEDDING_DIM,
         )
 
-        # Delete existing points for this document
-        try:
-            delete_by_document_id(docid, client=client)
-            log.info("[process/pdf] cleared existing points for doc=%s", docid)
-        except Exception as e:
-            log.warning(
-                "[process/pdf] delete_by_document_id failed doc=%s err=%s", docid, e
-            )
-
         # Chunk using config defaults
         chunks = chunk_text(
             raw_text,
@@ -797,12 +781,12 @@ async def process_pdf(request: Request, _: bool = Depends(require_auth)):
             }
             items.append((point_id, vec, payload_data))
 
-        # Upsert to collection
-        upserted = upsert_points(
+        # Replace this document's points
+        upserted = replace_document(
+            docid,
             items,
             collection_name=settings.QDRANT_COLLECTION,
             client=client,
-            ensure=False,
         )
 
         # Record status summary
@@ -918,17 +902,6 @@ async def process_image(request: Request, _: bool = Depends(require_auth)):
             dim=settings.EMBEDDING_DIM,
         )
 
-        # Delete existing points for this document
-        try:
-            delete_by_document_id(
-                docid, collection_name=settings.QDRANT_COLLECTION_IMAGES, client=client
-            )
-            log.info("[process/image] cleared existing points for doc=%s", docid)
-        except Exception as e:
-            log.warning(
-                "[process/image] delete_by_document_id failed doc=%s err=%s", docid, e
-            )
-
         # Create single chunk from caption
         chunks = [text]
         vectors = embed_texts(chunks)
@@ -958,12 +931,12 @@ async def process_image(request: Request, _: bool = Depends(require_auth)):
             }
             items.append((point_id, vec, payload_data))
 
-        # Upsert to images collection
-        upserted = upsert_points(
+        # Replace this document's points in the images collection
+        upserted = replace_document(
+            docid,
             items,
             collection_name=settings.QDRANT_COLLECTION_IMAGES,
             client=client,
-            ensure=False,
         )
 
         # Record status summary
@@ -1125,15 +1098,6 @@ async def process_audio(request: Request, _: bool = Depends(require_auth)):
             dim=settings.EMBEDDING_DIM,
         )
 
-        # Delete existing points for this document
-        try:
-            delete_by_document_id(docid, client=client)
-            log.info("[process/audio] cleared existing points for doc=%s", docid)
-        except Exception as e:
-            log.warning(
-                "[process/audio] delete_by_document_id failed doc=%s err=%s", docid, e
-            )
-
         # Chunk transcript using config defaults
         chunks = chunk_text(
             transcript,
@@ -1148,8 +1112,9 @@ async def process_audio(request: Request, _: bool = Depends(require_auth)):
 
         # Build items with deterministic IDs
         items = []
+        chunk_ids = chunk_ids_for(uuid.UUID(docid), len(chunks))
         for idx, (text_chunk, vec) in enumerate(zip(chunks, vectors)):
-            point_id = str(chunk_id_for(uuid.UUID(docid), idx))
+            point_id = str(chunk_ids[idx])
             base_meta = {
                 "source_ext": Path(abs_path).suffix.lower(),
                 "content_sig": "",
@@ -1171,12 +1136,12 @@ async def process_audio(request: Request, _: bool = Depends(require_auth)):
             }
             items.append((point_id, vec, payload_data))
 
-        # Upsert to collection
-        upserted = upsert_points(
+        # Replace this document's points
+        upserted = replace_document(
+            docid,
             items,
             collection_name=settings.QDRANT_COLLECTION,
             client=client,
-            ensure=False,
         )
 
         # Record status summary
@@ -1491,12 +1456,6 @@ async def process_json(request: Request, _: bool = Depends(require_auth)):
                 dim=settings.EMBEDDING_DIM,
             )
 
-            # Delete existing points
-            try:
-                delete_by_document_id(docid, client=client)
-            except Exception as e:
-                log.warning(f"[process/json] delete failed: {e}")
-
             # Chunk
             chunks = chunk_text(
                 text,
@@ -1534,12 +1493,12 @@ async def process_json(request: Request, _: bool = Depends(require_auth)):
                 }
                 items.append((point_id, vec, payload_data))
 
-            # Upsert
-            upserted = upsert_points(
+            # Replace this document's points
+            upserted = replace_document(
+                docid,
                 items,
                 collection_name=settings.QDRANT_COLLECTION,
                 client=client,
-                ensure=False,
             )
 
             # Record status summary
@@ -1,18 +1,19 @@
 # worker/app/routers/qdrant_utils.py
+from itertools import islice
 from typing import Iterable, Tuple, Dict, Any
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
-import os
+from qdrant_client.models import Batch, VectorParams, Distance
+
+from worker.app.services.qdrant_client import get_qdrant_client
 
 
 def get_client() -> QdrantClient:
-    url = os.getenv("QDRANT_URL", "http://host.docker.internal:6333")
-    return QdrantClient(url=url)
+    """The shared worker client: one pool, gRPC when QDRANT_PREFER_GRPC=1."""
+    return get_qdrant_client()
 
 
 def ensure_collection(client: QdrantClient, name: str, dim: int):
-    cols = [c.name for c in client.get_collections().collections]
-    if name in cols:
+    if client.collection_exists(name):
         return
     client.create_collection(
         collection_name=name,
@@ -21,8 +22,23 @@ def ensure_collection(client: QdrantClient, name: str, dim: int):
 
 
 def upsert_points(
-    client: QdrantClient, name: str, items: Iterable[Tuple[str, list, Dict[str, Any]]]
+    client: QdrantClient,
+    name: str,
+    items: Iterable[Tuple[str, list, Dict[str, Any]]],
+    batch_size: int = 256,
 ) -> int:
-    points = [PointStruct(id=i, vector=v, payload=p) for (i, v, p) in items]
-    client.upsert(collection_name=name, points=points)
-    return len(points)
+    """Upsert (id, vector, payload) items in columnar batches; returns the count.
+
+    `items` is consumed `batch_size` at a time, so generators never sit in
+    memory whole.
+    """
+    total = 0
+    it = iter(items)
+    while chunk := list(islice(it, batch_size)):
+        ids, vectors, payloads = (list(col) for col in zip(*chunk))
+        client.upsert(
+            collection_name=name,
+            points=Batch(ids=ids, vectors=vectors, payloads=payloads),
+        )
+        total += len(chunk)
+    return total
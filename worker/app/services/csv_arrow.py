@@ -0,0 +1,75 @@
+# worker/app/services/csv_arrow.py
+"""
+Optional pyarrow fast path shared by the CSV parsers.
+
+pyarrow parses in C++ and the per-row " | " join + whitespace trim run as
+vectorized compute kernels, so large/wide CSVs skip the per-cell Python work.
+Every column is read as a string so values come back exactly as written (no
+type inference). Callers must catch failures (ImportError when pyarrow is not
+installed, ArrowInvalid on ragged rows or bad UTF-8) and fall back to the
+stdlib csv module.
+"""
+
+from __future__ import annotations
+
+import csv
+from typing import List, Optional
+
+
+def arrow_join_rows(
+    path: str,
+    ncols: int,
+    *,
+    dialect=csv.excel,
+    skip_rows: int = 0,
+    max_rows: Optional[int] = None,
+    max_cols: Optional[int] = None,
+) -> List[str]:
+    """
+    Return one " | "-joined, whitespace-trimmed line per CSV row.
+
+    - ncols: column count (taken from the first row by the caller)
+    - skip_rows: leading rows to skip (e.g. 1 for a header handled separately)
+    - max_rows / max_cols: stop reading / keep only the first N columns
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    names = [f"c{i}" for i in range(ncols)]
+    keep = names[:max_cols] if max_cols is not None else names
+    read_options = pacsv.ReadOptions(
+        block_size=1 << 20, skip_rows=skip_rows, column_names=names
+    )
+    parse_options = pacsv.ParseOptions(
+        delimiter=dialect.delimiter,
+        quote_char=dialect.quotechar or False,
+        double_quote=dialect.doublequote,
+        escape_char=dialect.escapechar or False,
+    )
+    convert_options = pacsv.ConvertOptions(
+        column_types={n: pa.string() for n in names},
+        include_columns=keep,
+        strings_can_be_null=False,
+    )
+    sep = pa.scalar(" | ")
+    out: List[str] = []
+    remaining = max_rows
+    # Memory-mapped input: pyarrow tokenizes straight out of the page cache
+    # instead of copying each block through a Python file object.
+    with pa.memory_map(path, "r") as source:
+        reader = pacsv.open_csv(
+            source,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        for batch in reader:
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+            cols = [pc.utf8_trim_whitespace(col) for col in batch.columns]
+            out.extend(pc.binary_join_element_wise(*cols, sep).to_pylist())
+    return out
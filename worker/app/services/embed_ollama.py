@@ -2,7 +2,26 @@ import requests
 import hashlib
 import os
 from typing import List
+from urllib3.util.retry import Retry
 from worker.app.config import settings
+from worker.app.utils.http import json_loads, pooled_session
+
+# Keep-alive session for /api/embed: ingest embeds batch after batch, so reuse
+# pooled sockets instead of a fresh TCP connect per call. Connection errors
+# and 502/503/504 (Ollama still starting) get a couple of quick retries; POST
+# must be allowed explicitly (embedding is idempotent). The last 5xx response
+# is returned rather than raised, so callers still see it as an HTTPError.
+_SESSION = pooled_session(
+    pool_connections=10,
+    pool_maxsize=50,
+    retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    ),
+)
 
 
 def _parse_embeddings(json_obj) -> List[List[float]]:
@@ -88,9 +107,9 @@ def embed_texts(
     payload = {"model": model, "input": texts}
 
     try:
-        resp = requests.post(url, json=payload, timeout=180)
+        resp = _SESSION.post(url, json=payload, timeout=180)
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
 
         embeddings = _parse_embeddings(data)
 
@@ -112,3 +131,25 @@ def embed_texts(
         raise ValueError(f"Response parsing error: {e}")
     except Exception as e:
         raise ValueError(f"Unexpected error: {e}")
+
+
+def embed_texts_array(
+    texts: List[str],
+    model: str | None = None,
+    base_url: str | None = None,
+    dim: int | None = None,
+):
+    """
+    Same as embed_texts, but packs the result into one float32 matrix.
+
+    Returns:
+        np.ndarray of shape (len(texts), dim), dtype float32
+        (~6x smaller than list[list[float]] for 768-D vectors)
+    """
+    import numpy as np  # comes with qdrant-client; imported lazily for scripts
+
+    dim = dim or settings.EMBEDDING_DIM
+    vectors = embed_texts(texts, model=model, base_url=base_url, dim=dim)
+    if not vectors:
+        return np.empty((0, dim), dtype=np.float32)
+    return np.asarray(vectors, dtype=np.float32)
@@ -26,7 +26,7 @@ def extract_text_auto(path: str | Path, mime: Optional[str] = None) -> str:
 
     Optional parsers:
       - .pdf    -> requires `pypdf`      (pip install -r worker/requirements.pdf.txt)
-      - .docx   -> requires `python-docx`(pip install -r worker/requirements.docx.txt)
+      - .docx   -> requires `lxml`       (pip install -r worker/requirements.txt)
       - audio   -> requires faster-whisper + ffmpeg
                    (pip install -r worker/requirements.audio.txt)
 
@@ -62,7 +62,7 @@ def extract_text_auto(path: str | Path, mime: Optional[str] = None) -> str:
             from .parsers_docx import parse_docx  # noqa: WPS433 (local import)
         except Exception as e:  # ModuleNotFoundError or other import-time issues
             raise ModuleNotFoundError(
-                "DOCX support not installed. Run: pip install -r worker/requirements.docx.txt"
+                "DOCX support not installed. Run: pip install -r worker/requirements.txt"
             ) from e
         parts = parse_docx(str(p))
         return "\n\n".join(parts)
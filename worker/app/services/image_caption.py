@@ -1,7 +1,9 @@
 from __future__ import annotations
 from pathlib import Path
 from worker.app.config import settings
+from worker.app.services.media_cache import content_cached
 
+_BLIP_MODEL = "Salesforce/blip-image-captioning-base"
 _BLIP = None
 
 
@@ -13,10 +15,8 @@ def _load():
         from PIL import Image
         from transformers import BlipProcessor, BlipForConditionalGeneration
 
-        proc = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-        model = BlipForConditionalGeneration.from_pretrained(
-            "Salesforce/blip-image-captioning-base"
-        )
+        proc = BlipProcessor.from_pretrained(_BLIP_MODEL)
+        model = BlipForConditionalGeneration.from_pretrained(_BLIP_MODEL)
         _BLIP = (proc, model, Image)
         return _BLIP
     except Exception:
@@ -26,6 +26,10 @@ def _load():
         raise
 
 
+@content_cached(
+    model_key=lambda: _BLIP_MODEL,
+    bypass=lambda: bool(settings.EMBED_DEV_MODE),
+)
 def caption_image(path: str | Path) -> str:
     proc, _model, Image = _load()
     if proc == "DEV":
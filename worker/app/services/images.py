@@ -1,5 +1,6 @@
 from functools import lru_cache
 from worker.app.config import settings
+from worker.app.services.media_cache import content_cached
 
 
 @lru_cache(maxsize=1)
@@ -10,6 +11,10 @@ def _get_caption_pipeline():
     return pipeline("image-to-text", model=settings.IMAGES_CAPTION_MODEL)  # BLIP base
 
 
+@content_cached(
+    model_key=lambda: settings.IMAGES_CAPTION_MODEL,
+    bypass=lambda: not settings.IMAGES_CAPTION,
+)
 def generate_caption(image_path: str) -> str:
     if not settings.IMAGES_CAPTION:
         return ""
@@ -19,9 +24,10 @@ def generate_caption(image_path: str) -> str:
         from PIL import Image
 
         image = Image.open(image_path).convert("RGB")
-        # Ensure minimum size for BLIP model
+        # Ensure minimum size for BLIP model. The pipeline's processor rescales
+        # to 384x384 right after, so a cheap bilinear upscale is enough here.
         if image.size[0] < 224 or image.size[1] < 224:
-            image = image.resize((224, 224), Image.Resampling.LANCZOS)
+            image = image.resize((224, 224), Image.Resampling.BILINEAR)
         out = pipe(image)
         if isinstance(out, list) and out and "generated_text" in out[0]:
             return str(out[0]["generated_text"]).strip()
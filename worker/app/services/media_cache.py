@@ -0,0 +1,101 @@
+# worker/app/services/media_cache.py
+"""
+Content-addressed cache for expensive media leaves (captions, transcripts).
+
+Entries are keyed by (model, call args, file fingerprint) and stored as small
+UTF-8 files under settings.MEDIA_CACHE_DIR, so re-ingesting a byte-identical
+image or audio file skips BLIP/Whisper entirely. Off by default; set
+MEDIA_CACHE_DIR (absolute, e.g. /data/cache/media) to enable. Cache failures
+never break the wrapped call.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from worker.app.config import settings
+
+log = logging.getLogger(__name__)
+
+# Files up to 2 * _SAMPLE bytes are hashed in full; larger ones are fingerprinted
+# imohash-style from the first and last _SAMPLE bytes plus the total size.
+_SAMPLE = 1 << 20
+
+
+def file_fingerprint(path: str | Path) -> str:
+    """Return a blake2b fingerprint of the file contents (head + tail + size)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        h.update(str(size).encode("ascii"))
+        if size <= 2 * _SAMPLE:
+            h.update(f.read())
+        else:
+            h.update(f.read(_SAMPLE))
+            f.seek(-_SAMPLE, os.SEEK_END)
+            h.update(f.read(_SAMPLE))
+    return h.hexdigest()
+
+
+def _cache_path(namespace: str, key: str) -> Optional[Path]:
+    root = (settings.MEDIA_CACHE_DIR or "").strip()
+    if not root:
+        return None
+    return Path(root) / namespace / f"{key}.txt"
+
+
+def content_cached(
+    model_key: Callable[[], str],
+    bypass: Optional[Callable[[], bool]] = None,
+) -> Callable[[Callable[..., str]], Callable[..., str]]:
+    """
+    Decorate `fn(path, *args, **kwargs) -> str` with an on-disk content cache.
+
+    - model_key: returns the active model name (part of the cache key)
+    - bypass: returns True when the cache must be skipped (e.g. dev stubs)
+
+    Empty results are never stored so soft failures are retried next time.
+    """
+
+    def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+        namespace = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(path, *args, **kwargs) -> str:
+            if bypass is not None and bypass():
+                return fn(path, *args, **kwargs)
+            try:
+                h = hashlib.blake2b(digest_size=16)
+                h.update(model_key().encode("utf-8"))
+                h.update(repr((args, sorted(kwargs.items()))).encode("utf-8"))
+                h.update(file_fingerprint(path).encode("ascii"))
+                entry = _cache_path(namespace, h.hexdigest())
+            except Exception:
+                entry = None
+            if entry is None:
+                return fn(path, *args, **kwargs)
+
+            try:
+                return entry.read_text(encoding="utf-8")
+            except OSError:
+                pass
+
+            result = fn(path, *args, **kwargs)
+            if result:
+                try:
+                    entry.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text(result, encoding="utf-8")
+                    os.replace(tmp, entry)
+                except OSError as e:
+                    log.warning("media cache write failed for %s: %s", entry, e)
+            return result
+
+        return wrapper
+
+    return decorator
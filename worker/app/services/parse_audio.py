@@ -6,34 +6,51 @@ from pathlib import Path
 from typing import Optional
 
 from worker.app.config import settings
+from worker.app.services.media_cache import content_cached
 
+# Below this length Silero VAD costs more than it saves; Whisper handles the clip directly.
+_VAD_MIN_SECONDS = 30.0
+_WHISPER_SAMPLE_RATE = 16000
 
+
+def _audio_dev_mode() -> bool:
+    return (
+        str(getattr(settings, "AUDIO_DEV_MODE", 0)) == "1"
+        or os.getenv("AUDIO_DEV_MODE") == "1"
+    )
+
+
+@content_cached(
+    model_key=lambda: str(getattr(settings, "STT_MODEL", "tiny")),
+    bypass=_audio_dev_mode,
+)
 def transcribe_audio(
     path: str,
     model_size: Optional[str] = None,
     beam_size: int = 1,
     vad_filter: bool = True,
+    without_timestamps: bool = True,
 ) -> str:
     """
     Transcribe an audio file to text.
 
     - If AUDIO_DEV_MODE=1 (env or settings), returns a quick stub so tests/CI stay fast.
     - Otherwise uses faster-whisper on CPU (compute_type=int8).
+    - Timestamps are skipped by default (we only keep the text), and VAD only
+      runs for clips longer than _VAD_MIN_SECONDS.
+    - Results are cached by file content (see media_cache) so re-ingests are cheap.
     - Requires ffmpeg available on PATH for mp3/m4a etc.
 
     Returns: plain text transcript.
     """
     # Dev-mode short-circuit for tests/CI/local
-    if (
-        str(getattr(settings, "AUDIO_DEV_MODE", 0)) == "1"
-        or os.getenv("AUDIO_DEV_MODE") == "1"
-    ):
+    if _audio_dev_mode():
         name = Path(path).name
         return f"[DEV] transcript of {name}"
 
     # Lazy import so importing this module doesn't require the heavy dep
     try:
-        from faster_whisper import WhisperModel  # type: ignore
+        from faster_whisper import WhisperModel, decode_audio  # type: ignore
     except Exception as e:
         raise RuntimeError(
             "faster-whisper is required for audio transcription. "
@@ -47,11 +64,16 @@ def transcribe_audio(
     # CPU-friendly config
     model = WhisperModel(size, device="cpu", compute_type="int8")
 
+    # Decode once: gives us the duration for free and is reused by transcribe()
+    audio = decode_audio(path, sampling_rate=_WHISPER_SAMPLE_RATE)
+    duration_s = len(audio) / _WHISPER_SAMPLE_RATE
+
     # Transcribe
     segments, _info = model.transcribe(
-        path,
-        vad_filter=vad_filter,
+        audio,
+        vad_filter=vad_filter and duration_s > _VAD_MIN_SECONDS,
         beam_size=beam_size,
+        without_timestamps=without_timestamps,
         language=None,  # let it auto-detect
     )
     # Join text pieces
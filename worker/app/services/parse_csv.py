@@ -1,23 +1,61 @@
 import csv
+import os
+from typing import TextIO, Union
 
+from ..utils.textio import open_text
+from .csv_arrow import arrow_join_rows
 
-def extract_text_from_csv(path: str, max_rows: int = 5000) -> str:
+# Below this size the stdlib reader wins (no pyarrow import/setup cost).
+_ARROW_MIN_BYTES = 1 << 20
+
+
+def extract_text_from_csv(path: Union[str, TextIO], max_rows: int = 5000) -> str:
     """
     Read CSV/TSV and return a simple line-based text:
     header: "col1 | col2", rows: "v1 | v2".
+
+    `path` may also be an open text stream (e.g. io.StringIO); it is read
+    from its current position and not closed. The stream must be seekable
+    (the dialect sniff reads ahead, then rewinds); ValueError otherwise.
+
+    Files >= 1 MiB go through pyarrow when it is installed (optional dep);
+    otherwise, or if pyarrow rejects the file, the stdlib reader is used.
+    Streams always use the stdlib reader.
     """
-    with open(path, "r", newline="", encoding="utf-8", errors="ignore") as f:
+    is_stream = hasattr(path, "read")
+    if is_stream and not path.seekable():
+        raise ValueError("extract_text_from_csv needs a seekable stream")
+    with open_text(path, newline="", errors="ignore") as f:
+        start = f.tell()
         sample = f.read(2048)
-        f.seek(0)
+        f.seek(start)
         try:
             dialect = csv.Sniffer().sniff(sample)
         except csv.Error:
             dialect = csv.excel  # fallback
         reader = csv.reader(f, dialect)
+
+        if not is_stream and os.path.getsize(path) >= _ARROW_MIN_BYTES:
+            header = next(reader, None)
+            if header is None:
+                return ""
+            try:
+                rows = arrow_join_rows(
+                    path, len(header), dialect=dialect, skip_rows=1, max_rows=max_rows
+                )
+                head = " | ".join(map(str.strip, header))
+                return "\n".join([head, *rows])
+            except Exception:
+                f.seek(start)
+                reader = csv.reader(f, dialect)
+
         out = []
-        for i, row in enumerate(reader):
-            line = " | ".join((cell or "").strip() for cell in row)
-            out.append(line)
-            if i >= max_rows:
+        join = " | ".join
+        strip = str.strip
+        for row in reader:
+            if not row:  # blank line: pyarrow skips these, so must we
+                continue
+            out.append(join(map(strip, row)))
+            if len(out) > max_rows:
                 break
     return "\n".join(out)
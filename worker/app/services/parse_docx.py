@@ -1,5 +1,9 @@
 # worker/app/services/parse_docx.py
-def extract_text_from_docx(path: str) -> str:
+from typing import BinaryIO, Union
+
+
+def extract_text_from_docx(path: Union[str, BinaryIO]) -> str:
+    """Paragraph text then table rows ("a | b"); `path` may be a binary stream."""
     try:
         from docx import Document
     except Exception as e:
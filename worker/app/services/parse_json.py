@@ -1,5 +1,7 @@
 import json
-from typing import Any, List
+from typing import Any, List, TextIO, Union
+
+from ..utils.textio import open_text
 
 
 def _flatten(obj: Any, prefix: str = "", out: List[str] | None = None) -> List[str]:
@@ -16,15 +18,15 @@ def _flatten(obj: Any, prefix: str = "", out: List[str] | None = None) -> List[s
     return out
 
 
-def extract_text_from_json(path: str) -> str:
-    with open(path, "r", encoding="utf-8") as f:
+def extract_text_from_json(path: Union[str, TextIO]) -> str:
+    with open_text(path) as f:
         data = json.load(f)
     return "\n".join(_flatten(data))
 
 
-def extract_text_from_jsonl(path: str, max_lines: int = 10000) -> str:
+def extract_text_from_jsonl(path: Union[str, TextIO], max_lines: int = 10000) -> str:
     out: List[str] = []
-    with open(path, "r", encoding="utf-8") as f:
+    with open_text(path) as f:
         for i, line in enumerate(f):
             s = line.strip()
             if not s:
@@ -13,40 +13,100 @@ from __future__ import annotations
 import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List, Tuple
 
+try:  # optional linear-time DFA engine: pip install google-re2
+    import re2 as _re
+except ImportError:  # pragma: no cover - exercised when re2 is absent
+    _re = re
+
 log = logging.getLogger(__name__)
 
+# Flags are written inline ("(?im)") because google-re2 takes no re.* flags.
+_FLAGS = "(?im)"
+
+# Role word, prefix-factored (user|assistant|system|human|ai|bot|agent) so the
+# engine commits on the first letter instead of trying all seven branches.
+_ROLES = r"(a(?:ssistant|gent|i)|bot|human|system|user)"
+
 # Detection patterns with weights
 # Higher weight = stronger signal of being a transcript
 
 # Pattern: "User:" / "Assistant:" / "System:" at line start (case-insensitive)
-ROLE_PREFIX_PATTERN = re.compile(
-    r"^(user|assistant|system|human|ai|bot|agent)\s*:\s*",
-    re.IGNORECASE | re.MULTILINE,
-)
+_ROLE_PREFIX_SRC = r"^" + _ROLES + r"\s*:\s*"
+ROLE_PREFIX_PATTERN = _re.compile(_FLAGS + _ROLE_PREFIX_SRC)
 
 # Pattern: "[YYYY-MM-DD HH:MM] role:" or "[YYYY-MM-DD] role:"
-TIMESTAMPED_ROLE_PATTERN = re.compile(
-    r"^\[?\d{4}-\d{2}-\d{2}[T\s]?\d{0,2}:?\d{0,2}:?\d{0,2}[^\]]*\]?\s*(user|assistant|system|human|ai|bot|agent)\s*:\s*",
-    re.IGNORECASE | re.MULTILINE,
+# (the free-form tail stays on one line so a stray date can't swallow the
+# role lines that follow it)
+_TIMESTAMPED_ROLE_SRC = (
+    r"^\[?\d{4}-\d{2}-\d{2}[T\s]?\d{0,2}:?\d{0,2}:?\d{0,2}[^\]\n]*\]?\s*"
+    + _ROLES
+    + r"\s*:\s*"
 )
+TIMESTAMPED_ROLE_PATTERN = _re.compile(_FLAGS + _TIMESTAMPED_ROLE_SRC)
 
 # Pattern: "role: user" / "role: assistant" (JSON-like blocks)
-JSON_ROLE_PATTERN = re.compile(
-    r'["\']?role["\']?\s*:\s*["\']?(user|assistant|system|human|ai|bot|agent)["\']?',
-    re.IGNORECASE,
-)
+_JSON_ROLE_SRC = r'["\']?role["\']?\s*:\s*["\']?' + _ROLES + r'["\']?'
+JSON_ROLE_PATTERN = _re.compile(_FLAGS + _JSON_ROLE_SRC)
 
 # Pattern: "**User:**" or "**Assistant:**" (Markdown bold roles)
-MARKDOWN_ROLE_PATTERN = re.compile(
-    r"^\*\*(user|assistant|system|human|ai|bot|agent)\*\*\s*:\s*",
-    re.IGNORECASE | re.MULTILINE,
+_MARKDOWN_ROLE_SRC = r"^\*\*" + _ROLES + r"\*\*\s*:\s*"
+MARKDOWN_ROLE_PATTERN = _re.compile(_FLAGS + _MARKDOWN_ROLE_SRC)
+
+# All four detectors fused into one alternation so detect_transcript scans the
+# text once. The outer group name tells which detector fired; the role word is
+# the group right after it (m.lastindex + 1).
+_DETECTORS = (
+    ("ts", _TIMESTAMPED_ROLE_SRC),
+    ("prefix", _ROLE_PREFIX_SRC),
+    ("md", _MARKDOWN_ROLE_SRC),
+    ("json", _JSON_ROLE_SRC),
+)
+_COMBINED_PATTERN = _re.compile(
+    _FLAGS + "|".join(f"(?P<{name}>{src})" for name, src in _DETECTORS)
+)
+
+# Message splitter for _extract_messages: an optional timestamp and/or
+# Markdown bold around the role word, captured so split() yields
+# [preamble, role1, content1, role2, content2, ...]
+_SPLIT_PATTERN = _re.compile(
+    r"(?i)(?:^|\n)(?:\[?\d{4}-\d{2}-\d{2}[T\s]?\d{0,2}:?\d{0,2}:?\d{0,2}[^\]]*\]?\s*)?"
+    r"(?:\*\*)?" + _ROLES + r"(?:\*\*)?\s*:\s*"
 )
 
+# Role aliases -> canonical role, and canonical role -> display label
+_ROLE_NORM = {
+    "user": "user",
+    "human": "user",
+    "assistant": "assistant",
+    "ai": "assistant",
+    "bot": "assistant",
+    "agent": "assistant",
+    "system": "system",
+}
+_ROLE_LABEL = {"user": "User", "assistant": "Assistant", "system": "System"}
+
+# Filename substrings that suggest a chat export
+_FILENAME_HINTS = ("chat", "transcript", "conversation", "dialog", "dialogue")
+
 # Minimum threshold for transcript detection
 DETECTION_THRESHOLD = 0.85
 
+# Inputs longer than this are scored on a head/middle/tail sample
+_SAMPLE_MIN_CHARS = 2 << 20  # keeps the three slices disjoint
+_SAMPLE_HEAD = 400_000
+_SAMPLE_MIDDLE = 200_000
+_SAMPLE_TAIL = 400_000
+
+# Memoized detection results keyed by (blake2b(text), filename); retries and
+# batch re-ingests of the same file skip the scan entirely.
+_DETECT_CACHE_SIZE = 1024
+_detect_cache: "OrderedDict[Tuple[bytes, str], Tuple[bool, float]]" = OrderedDict()
+_detect_cache_lock = threading.Lock()
+
 
 def detect_transcript(text: str, filename: str = "") -> Tuple[bool, float]:
     """Detect if text is a chat transcript with confidence score.
@@ -58,29 +118,94 @@ def detect_transcript(text: str, filename: str = "") -> Tuple[bool, float]:
     Returns:
         Tuple of (is_transcript, confidence) where confidence is 0.0-1.0
     """
+    if not text:
+        return False, 0.0
+
+    sig = hashlib.blake2b(
+        text.encode("utf-8", errors="replace"), digest_size=16
+    ).digest()
+    key = (sig, filename)
+    with _detect_cache_lock:
+        hit = _detect_cache.get(key)
+        if hit is not None:
+            _detect_cache.move_to_end(key)
+            return hit
+
+    result = _detect_transcript_uncached(text, filename)
+
+    with _detect_cache_lock:
+        _detect_cache[key] = result
+        if len(_detect_cache) > _DETECT_CACHE_SIZE:
+            _detect_cache.popitem(last=False)
+    return result
+
+
+def _sample_text(text: str) -> str:
+    """Head + middle + tail slices of `text`, each cut back to whole lines."""
+    n = len(text)
+    mid = n // 2
+    pieces = []
+    for start, end in (
+        (0, _SAMPLE_HEAD),
+        (mid, mid + _SAMPLE_MIDDLE),
+        (n - _SAMPLE_TAIL, n),
+    ):
+        if start:
+            # begin after the next newline so "^" anchors see a real line start
+            start = text.find("\n", start) + 1 or end
+        if end < n:
+            end = max(start, text.rfind("\n", start, end))
+        pieces.append(text[start:end])
+    return "\n".join(pieces)
+
+
+def _detect_transcript_uncached(text: str, filename: str) -> Tuple[bool, float]:
+    """Score `text` against the role-marker detectors (see detect_transcript)."""
     if not text or len(text.strip()) < 20:
         return False, 0.0
 
+    # Literal prescan: every detector needs a ":" after the role word, so text
+    # without one can't score. str.__contains__ is a memchr-speed scan, far
+    # cheaper than running the regex over a large non-chat document.
+    if ":" not in text:
+        return False, 0.0
+
     # Filename hints (boost confidence if filename suggests chat/transcript)
     filename_boost = 0.0
     filename_lower = filename.lower()
-    if any(
-        hint in filename_lower
-        for hint in ["chat", "transcript", "conversation", "dialog", "dialogue"]
-    ):
+    if any(hint in filename_lower for hint in _FILENAME_HINTS):
         filename_boost = 0.15
 
-    # Count pattern matches
-    lines = text.split("\n")
-    total_lines = len([line for line in lines if line.strip()])
-    if total_lines == 0:
-        return False, 0.0
-
-    # Count different pattern types
-    role_prefix_matches = len(ROLE_PREFIX_PATTERN.findall(text))
-    timestamped_matches = len(TIMESTAMPED_ROLE_PATTERN.findall(text))
-    json_role_matches = len(JSON_ROLE_PATTERN.findall(text))
-    markdown_role_matches = len(MARKDOWN_ROLE_PATTERN.findall(text))
+    # Approximate non-blank line count without splitting the text: every
+    # "\n\n" marks (at least) one blank line. Only the order of magnitude
+    # matters for the marker density below.
+    newlines = text.count("\n")
+    blank_runs = text.count("\n\n")
+    total_lines = max(1, newlines - blank_runs + 1)
+
+    # Very large inputs: scan a head/middle/tail sample and scale the counts
+    # back up. Chat structure shows up long before the first MB ends.
+    sample = text
+    scale = 1.0
+    if len(text) > _SAMPLE_MIN_CHARS:
+        sample = _sample_text(text)
+        scale = len(text) / len(sample)
+
+    # Count pattern matches and collect roles in a single scan
+    counts = dict.fromkeys(("ts", "prefix", "md", "json"), 0)
+    unique_roles_found = set()
+    for match in _COMBINED_PATTERN.finditer(sample):
+        kind = match.lastgroup
+        counts[kind] += 1
+        # JSON-like "role: x" blocks count toward the score but not the roles
+        if kind == "json":
+            continue
+        unique_roles_found.add(_ROLE_NORM[match.group(match.lastindex + 1).lower()])
+
+    role_prefix_matches = counts["prefix"] * scale
+    timestamped_matches = counts["ts"] * scale
+    json_role_matches = counts["json"] * scale
+    markdown_role_matches = counts["md"] * scale
 
     # Calculate weighted score
     # Timestamped patterns are strongest signal
@@ -93,23 +218,6 @@ def detect_transcript(text: str, filename: str = "") -> Tuple[bool, float]:
         + json_role_matches * 0.5
     )
 
-    # Need at least 2 role transitions to be a conversation
-    unique_roles_found = set()
-    for pattern in [
-        ROLE_PREFIX_PATTERN,
-        TIMESTAMPED_ROLE_PATTERN,
-        MARKDOWN_ROLE_PATTERN,
-    ]:
-        for match in pattern.finditer(text):
-            role = match.group(1).lower()
-            # Normalize role names
-            if role in ("human", "user"):
-                unique_roles_found.add("user")
-            elif role in ("assistant", "ai", "bot", "agent"):
-                unique_roles_found.add("assistant")
-            elif role == "system":
-                unique_roles_found.add("system")
-
     # Must have at least 2 different roles for it to be a conversation
     if len(unique_roles_found) < 2:
         # Single role doesn't make a conversation (unless it's a log)
@@ -149,22 +257,7 @@ def _extract_messages(text: str) -> List[Dict[str, Any]]:
     """
     messages = []
 
-    # Try timestamped pattern first
-    timestamped_parts = TIMESTAMPED_ROLE_PATTERN.split(text)
-    if len(timestamped_parts) > 2:
-        # Pattern splits into [before, role1, content1, role2, content2, ...]
-        # But we need to handle the timestamps too
-        pass
-
-    # Split by role prefix patterns
-    # This regex captures the role and splits around it
-    split_pattern = re.compile(
-        r"(?:^|\n)(?:\[?\d{4}-\d{2}-\d{2}[T\s]?\d{0,2}:?\d{0,2}:?\d{0,2}[^\]]*\]?\s*)?"
-        r"(?:\*\*)?(user|assistant|system|human|ai|bot|agent)(?:\*\*)?\s*:\s*",
-        re.IGNORECASE,
-    )
-
-    parts = split_pattern.split(text)
+    parts = _SPLIT_PATTERN.split(text)
 
     # parts[0] is text before first role marker (usually empty or preamble)
     # parts[1] is first role, parts[2] is first content, etc.
@@ -177,16 +270,7 @@ def _extract_messages(text: str) -> List[Dict[str, Any]]:
         if i + 1 < len(parts):
             role_raw = parts[i].lower().strip()
             content = parts[i + 1].strip()
-
-            # Normalize role
-            if role_raw in ("human", "user"):
-                role = "user"
-            elif role_raw in ("assistant", "ai", "bot", "agent"):
-                role = "assistant"
-            elif role_raw == "system":
-                role = "system"
-            else:
-                role = role_raw
+            role = _ROLE_NORM.get(role_raw, role_raw)
 
             if content:
                 messages.append({"role": role, "content": content})
@@ -194,15 +278,23 @@ def _extract_messages(text: str) -> List[Dict[str, Any]]:
     return messages
 
 
-def _generate_thread_id(text: str, index: int = 0) -> str:
-    """Generate deterministic thread ID from content."""
-    # Use SHA1 of first 1000 chars + index for determinism
-    content_sig = hashlib.sha1(
-        text[:1000].encode("utf-8", errors="replace")
-    ).hexdigest()[:12]
+def _generate_thread_id(encoded: bytes, index: int = 0) -> str:
+    """Generate deterministic thread ID from the UTF-8 encoded content."""
+    # Use BLAKE2b (12 hex chars) of first 1000 bytes + index for determinism
+    content_sig = hashlib.blake2b(encoded[:1000], digest_size=6).hexdigest()
     return f"{content_sig}_{index}"
 
 
+def _format_message(msg: Dict[str, Any]) -> str:
+    """Render one message as "Label: content" (or "[ts] Label: content")."""
+    role = str(msg["role"])
+    label = _ROLE_LABEL.get(role.lower()) or role.title()
+    timestamp = msg.get("timestamp", "")
+    if timestamp:
+        return f"[{timestamp}] {label}: {msg['content']}"
+    return f"{label}: {msg['content']}"
+
+
 def _derive_title(filename: str, messages: List[Dict[str, Any]]) -> str:
     """Derive title from filename and first meaningful message."""
     # Start with filename (without extension)
@@ -242,8 +334,9 @@ def parse_transcript(
     if not text.strip():
         return []
 
-    # Generate file signature for deterministic IDs
-    file_sig = hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()[:16]
+    # Generate file signature for deterministic IDs (encode once, reuse below)
+    encoded = text.encode("utf-8", errors="replace")
+    file_sig = hashlib.blake2b(encoded, digest_size=8).hexdigest()
 
     # Extract messages
     messages = _extract_messages(text)
@@ -252,23 +345,11 @@ def parse_transcript(
 
     # For now, treat entire file as one conversation
     # Future: could detect conversation boundaries (long gaps, explicit separators)
-    thread_id = _generate_thread_id(text, 0)
+    thread_id = _generate_thread_id(encoded, 0)
     document_id = f"transcript:{file_sig}:{thread_id}"
 
     # Format messages for output (same format as ChatGPT parser)
-    text_lines = []
-    ROLE_LABEL = {"user": "User", "assistant": "Assistant", "system": "System"}
-    for msg in messages:
-        role = msg["role"]
-        label = ROLE_LABEL.get(str(role).lower(), str(role).title())
-        content = msg["content"]
-        timestamp = msg.get("timestamp", "")
-        if timestamp:
-            text_lines.append(f"[{timestamp}] {label}: {content}")
-        else:
-            text_lines.append(f"{label}: {content}")
-
-    formatted_text = "\n\n".join(text_lines)
+    formatted_text = "\n\n".join(map(_format_message, messages))
 
     # Derive title
     title = _derive_title(filename, messages)
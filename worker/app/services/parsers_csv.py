@@ -1,6 +1,12 @@
 from __future__ import annotations
 from typing import List
 import csv
+import os
+
+from .csv_arrow import arrow_join_rows
+
+# Small files stay on the stdlib reader to avoid the pyarrow import cost.
+_ARROW_MIN_BYTES = 4 << 20
 
 
 def parse_csv(path: str, max_cols: int = 50, max_len: int = 2000) -> List[str]:
@@ -9,18 +15,38 @@ def parse_csv(path: str, max_cols: int = 50, max_len: int = 2000) -> List[str]:
     - Truncates very wide rows at max_cols
     - Joins cells with " | "
     - Truncates each row string at max_len chars (hard cap)
+
+    Files >= 4 MiB go through pyarrow when installed (see csv_arrow); the
+    stdlib reader handles everything else and any file pyarrow rejects.
     """
+    if os.path.getsize(path) >= _ARROW_MIN_BYTES:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                first = next(csv.reader(f), None)
+            if not first:
+                raise ValueError("no leading row to size columns from")
+            rows = arrow_join_rows(path, len(first), max_cols=max_cols)
+            return [s[:max_len] for s in rows if s]
+        except Exception:
+            pass
+
     out: List[str] = []
+    # Hot loop: bind lookups to locals once; csv.reader only yields str cells,
+    # so map(str.strip) trims them without a Python-level frame per cell
+    append = out.append
+    join = " | ".join
+    strip = str.strip
     with open(path, "r", encoding="utf-8", errors="replace") as f:
         reader = csv.reader(f)
         for row in reader:
             if not row:
                 continue
-            row = row[:max_cols]
-            s = " | ".join(cell.strip() for cell in row if cell is not None)
+            if len(row) > max_cols:
+                row = row[:max_cols]
+            s = join(map(strip, row))
             if not s:
                 continue
             if len(s) > max_len:
                 s = s[:max_len]
-            out.append(s)
+            append(s)
     return out
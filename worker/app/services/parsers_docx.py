@@ -1,16 +1,91 @@
 from __future__ import annotations
 from typing import List
-from docx import Document  # requires python-docx
+import zipfile
+
+from lxml import etree  # requires lxml (already a base worker dependency)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_R = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+
+# Run inner-content -> text, mirroring python-docx's Run.text
+_RUN_TEXT = {
+    _W + "t": None,  # element text
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_BR = _W + "br"
+_BR_TYPE = _W + "type"
+
+_PKG_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_OFFICE_DOC_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+
+def _main_part(zf: zipfile.ZipFile) -> str:
+    """Resolve the main document part (almost always word/document.xml)."""
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"))
+        for rel in rels.iterchildren(_PKG_RELS + "Relationship"):
+            if rel.get("Type") == _OFFICE_DOC_REL:
+                return rel.get("Target", "").lstrip("/")
+    except (KeyError, etree.XMLSyntaxError):
+        pass
+    return "word/document.xml"
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag] or child.text or "")
+        elif tag == _BR:
+            # line breaks only; page/column breaks carry no text
+            if child.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(_R))
+    return "".join(parts)
 
 
 def parse_docx(path: str) -> List[str]:
     """
     Parse DOCX paragraphs as a list of strings (skips empty).
+
+    Streams the main part (word/document.xml) with lxml iterparse instead of
+    building the full python-docx object tree; each body-level element is
+    cleared once handled so memory stays flat on large documents. Yields the
+    same paragraphs as python-docx's Document.paragraphs (tables, headers,
+    etc. are skipped).
     """
-    doc = Document(path)
     chunks: List[str] = []
-    for p in doc.paragraphs:
-        t = (p.text or "").strip()
-        if t:
-            chunks.append(t)
+    with zipfile.ZipFile(path) as zf, zf.open(_main_part(zf)) as stream:
+        for _event, el in etree.iterparse(
+            stream, events=("end",), tag=(_P, _W + "tbl", _W + "sdt")
+        ):
+            parent = el.getparent()
+            if parent is None or parent.tag != _BODY:
+                continue  # nested (table cell, content control): handled by owner
+            if el.tag == _P:
+                t = _paragraph_text(el).strip()
+                if t:
+                    chunks.append(t)
+            # Free the processed subtree and everything before it
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
     return chunks
@@ -1,6 +1,89 @@
 from __future__ import annotations
+import mmap
+import os
 from typing import List
-from bs4 import BeautifulSoup  # requires beautifulsoup4 and lxml
+
+try:  # optional: C-backed lexbor parser, no Python object per node
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # fall back to the streaming lxml path
+    LexborHTMLParser = None
+
+_DROP_TAGS = ["script", "style", "noscript"]
+_READ_CHUNK = 64 * 1024
+# lexbor needs the whole document in memory; past this size we stream instead
+_STREAM_MIN_BYTES = 8 * 1024 * 1024
+
+
+class _TextCollector:
+    """
+    lxml parser target: receives SAX-style events in document order and keeps
+    only visible text, one text node per line. No tree is ever built.
+    """
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def _break(self) -> None:
+        # Runs of tags collapse into one separator; blank lines are dropped
+        # later anyway, so there's no point keeping one "\n" per tag event
+        parts = self.parts
+        if parts and parts[-1] != "\n":
+            parts.append("\n")
+
+    def start(self, tag, attrib) -> None:
+        if tag in _DROP_TAGS:
+            self._skip += 1
+        self._break()
+
+    def end(self, tag) -> None:
+        if tag in _DROP_TAGS and self._skip:
+            self._skip -= 1
+        self._break()
+
+    def data(self, data: str) -> None:
+        if not self._skip:
+            self.parts.append(data)
+
+    def comment(self, text: str) -> None:
+        self._break()
+
+    def close(self) -> str:
+        return "".join(self.parts)
+
+
+def _stream_text(path: str) -> str:
+    """
+    Feed the file to lxml's HTML parser 64 KB at a time, straight from an
+    mmap of the page cache (lxml decodes UTF-8 itself, so no str copy).
+    """
+    from lxml import etree  # requires lxml
+
+    target = _TextCollector()
+    parser = etree.HTMLParser(target=target, encoding="utf-8")
+    if os.path.getsize(path) == 0:  # mmap can't map an empty file
+        return ""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mm:
+        for pos in range(0, len(mm), _READ_CHUNK):
+            parser.feed(mm[pos : pos + _READ_CHUNK])
+    try:
+        return parser.close()
+    except etree.XMLSyntaxError:  # empty/garbage input: keep whatever was seen
+        return "".join(target.parts)
+
+
+def _visible_text(path: str) -> str:
+    """Document text with script/style/noscript removed, one node per line."""
+    if LexborHTMLParser is None or os.path.getsize(path) >= _STREAM_MIN_BYTES:
+        return _stream_text(path)
+
+    # bytes in: lexbor decodes UTF-8 natively, skipping a Python str copy
+    with open(path, "rb") as f:
+        tree = LexborHTMLParser(f.read())
+    tree.strip_tags(_DROP_TAGS)
+    return tree.root.text(separator="\n") if tree.root is not None else ""
 
 
 def parse_html(path: str) -> List[str]:
@@ -8,17 +91,9 @@ def parse_html(path: str) -> List[str]:
     Parse HTML file, extracting visible text (drop scripts/styles).
     Returns a list with one big block per logical section (rough cut).
     """
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        html = f.read()
-    soup = BeautifulSoup(html, "lxml")
-
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-
-    text = soup.get_text(separator="\n")
-    # normalize & split: drop empty lines, merge short runs
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
+    text = _visible_text(path)
+    # normalize & split: strip and drop empty lines in one pass
+    lines = [ln for ln in map(str.strip, text.splitlines()) if ln]
     if not lines:
         return []
     # simple chunking heuristic here; the main chunker will still re-chunk downstream
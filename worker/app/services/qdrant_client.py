@@ -9,33 +9,114 @@ Goals:
 - Keep payload schema agnostic: we only assume `document_id`/`path`/`kind` exist
   when you want to filter.
 
-This module intentionally avoids advanced features so it works across
-qdrant-client 1.6–1.9 without surprises.
+Requires qdrant-client 1.10+ (query_batch_points, collection_exists) on
+pydantic v2 (points are built with model_construct).
 """
 
 from __future__ import annotations
 
 
-import requests
-import sys
-from typing import Iterable, List, Dict, Any, Tuple, Optional
-from requests.exceptions import HTTPError
-
-from qdrant_client import QdrantClient, models
+import asyncio
+import atexit
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import chain, islice
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Any,
+    Sequence,
+    Set,
+    Tuple,
+    Optional,
+)
+
+import numpy as np  # qdrant-client dependency
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import VectorParams
 from worker.app.config import settings
 from worker.app.services.embed_ollama import embed_texts
+from worker.app.utils.http import json_loads, pooled_session
 
+log = logging.getLogger(__name__)
 
 # -------------------------- Client helpers --------------------------
 
+# Keep-alive session for the raw REST calls (counts, debug dumps) so they
+# reuse pooled connections instead of a fresh TCP/TLS handshake each time.
+_HTTP = pooled_session(pool_connections=16, pool_maxsize=32)
+# Count/collection responses are tiny: skip gzip negotiation + decompression
+_HTTP.headers["Accept-Encoding"] = "identity"
+
+
+_CLIENT: Optional[QdrantClient] = None
+_CLIENT_LOCK = threading.Lock()
+
 
 def get_qdrant_client() -> QdrantClient:
-    """Return a Qdrant client configured from settings."""
-    return QdrantClient(url=settings.QDRANT_URL, timeout=10.0)
+    """Return the process-wide Qdrant client configured from settings.
+
+    Shared so upserts, searches and counts use one pooled connection
+    (gRPC channel or keep-alive HTTP pool) instead of reconnecting per call.
+    Created once under a lock, so concurrent first calls can't each open a
+    pool.
+    """
+    global _CLIENT
+    client = _CLIENT
+    if client is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _new_client()
+            client = _CLIENT
+    return client
+
+
+def _new_client() -> QdrantClient:
+    import httpx  # qdrant-client dependency
+
+    pool = settings.QDRANT_POOL_SIZE
+    client = QdrantClient(
+        url=settings.QDRANT_URL,
+        timeout=10.0,
+        prefer_grpc=bool(settings.QDRANT_PREFER_GRPC),
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+    )
+    # Close the pool / gRPC channel cleanly at interpreter exit
+    atexit.register(client.close)
+    return client
+
+
+def _is_not_found(e: Exception) -> bool:
+    """True for a missing-collection error (REST 404 or gRPC NOT_FOUND)."""
+    msg = str(e).lower()
+    return (
+        getattr(e, "status_code", None) == 404
+        or "not found" in msg
+        or "not_found" in msg
+        or "doesn't exist" in msg
+        or "does not exist" in msg
+    )
 
 
 def _collection_exists(client: QdrantClient, name: str) -> bool:
+    try:
+        # Direct lookup instead of listing every collection on the server
+        return bool(client.collection_exists(name))
+    except AttributeError:  # qdrant-client < 1.8 has no collection_exists
+        pass
+    except Exception:
+        return False
     try:
         cols = client.get_collections()
         items = getattr(cols, "collections", None) or []
@@ -72,6 +153,26 @@ def _current_vector_size(client: QdrantClient, name: str) -> Optional[int]:
     return None
 
 
+# Collections verified by ensure_collection in this process, keyed by
+# (server, name, dim, distance, quantization), and (server, name) pairs whose
+# payload indexes were created. Streaming ingest calls ensure per batch;
+# these skip the repeat round-trips.
+_ENSURED: Set[Tuple[str, str, int, str, bool]] = set()
+_INDEXED: Set[Tuple[str, str]] = set()
+
+
+def _server_key(client: QdrantClient) -> str:
+    """The ensure-cache key for the server `client` talks to.
+
+    The shared client is keyed on settings.QDRANT_URL; any client passed in
+    explicitly (possibly for another server) is scoped to that object, so it
+    is never served an ensure cached for a different server.
+    """
+    if client is _CLIENT:
+        return settings.QDRANT_URL.rstrip("/")
+    return f"client:{id(client)}"
+
+
 def ensure_collection(
     client: Optional[QdrantClient] = None,
     name: Optional[str] = None,
@@ -80,6 +181,7 @@ def ensure_collection(
     distance: str = "Cosine",
     recreate_bad: Optional[bool] = None,
     create_payload_indexes: bool = True,
+    quantization: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """Create the collection if missing; optionally repair dim mismatch.
 
@@ -87,7 +189,10 @@ def ensure_collection(
     - `dim`:  defaults to `settings.EMBEDDING_DIM`
     - `recreate_bad`: if True (or env QDRANT_RECREATE_BAD=1), will recreate the
       collection when a dimension mismatch is detected.
-    - Adds payload indexes for {document_id, kind, path, meta.ingested_at_ts} to speed filters.
+    - Adds payload indexes for {document_id, kind, path, meta.*_at_ts, provenance} to speed filters.
+    - `quantization`: if True (or env QDRANT_QUANTIZATION=1), new collections
+      keep int8 scalar-quantized vectors in RAM and the FP32 originals on disk.
+      An existing unquantized collection is only recreated when `recreate_bad`.
 
     Returns:
         Dict with the final collection configuration.
@@ -98,19 +203,56 @@ def ensure_collection(
     recreate_bad = (
         (settings.QDRANT_RECREATE_BAD == 1) if recreate_bad is None else recreate_bad
     )
-
-    # Use the stable minimal implementation with signature adaptation
-    config = _ensure_collection_with_signature_adapt(
-        qc, name=name, dim=dim, distance=distance, recreate_bad=recreate_bad
+    quantization = (
+        (settings.QDRANT_QUANTIZATION == 1) if quantization is None else quantization
     )
 
+    # Already verified in this process: skip the schema round-trip
+    server = _server_key(qc)
+    key = (server, name, dim, distance, quantization)
+    if key in _ENSURED:
+        config: Dict[str, Any] = {
+            "params": {"vectors": {"size": dim, "distance": distance}}
+        }
+    else:
+        # Use the stable minimal implementation with signature adaptation
+        config = _ensure_collection_with_signature_adapt(
+            qc,
+            name=name,
+            dim=dim,
+            distance=distance,
+            recreate_bad=recreate_bad,
+            quantization=quantization,
+        )
+        _ENSURED.add(key)
+
     # Create payload indexes after ensuring the collection
-    if create_payload_indexes:
+    if create_payload_indexes and (server, name) not in _INDEXED:
         _ensure_payload_indexes(qc, name)
+        _INDEXED.add((server, name))
 
     return config
 
 
+def invalidate_ensure_cache(name: Optional[str] = None) -> None:
+    """Forget that `name` (or every collection, if None) was ensured.
+
+    Call after deleting/recreating a collection outside ensure_collection so
+    the next ensure re-checks the schema and payload indexes. Also drops the
+    search-side schema and result cache entries.
+    """
+    if name is None:
+        _ENSURED.clear()
+        _INDEXED.clear()
+        _SCHEMA_CACHE.clear()
+        clear_search_cache()
+        return
+    _ENSURED.difference_update([k for k in _ENSURED if k[1] == name])
+    _INDEXED.difference_update([k for k in _INDEXED if k[1] == name])
+    _SCHEMA_CACHE.pop(name, None)
+    clear_search_cache(name)
+
+
 def _ensure_collection_with_signature_adapt(
     client: QdrantClient,
     *,
@@ -118,6 +260,7 @@ def _ensure_collection_with_signature_adapt(
     dim: int,
     distance: str = "Cosine",
     recreate_bad: bool = False,
+    quantization: bool = False,
 ) -> Dict[str, Any]:
     """
     Call ensure_collection_minimal with signature adaptation.
@@ -130,14 +273,23 @@ def _ensure_collection_with_signature_adapt(
         dim: Vector dimension
         distance: Distance metric (default: Cosine)
         recreate_bad: Whether to recreate collections with wrong schema
+        quantization: Create with int8 scalar quantization (see ensure_collection)
 
     Returns:
         Dict containing the collection config
     """
 
-    # Try to get the collection config first to check if it exists
+    synthetic = {"params": {"vectors": {"size": dim, "distance": distance}}}
+
+    # Three states: exists and matches, exists with the wrong schema, missing
     try:
         info = client.get_collection(name)
+    except Exception as e:
+        if not _is_not_found(e):
+            raise RuntimeError(f"Error accessing collection '{name}': {e}")
+        info = None
+
+    if info is not None:
         cfg = getattr(info, "config", {}) or {}
         params = getattr(cfg, "params", {}) or {}
         vectors = getattr(params, "vectors", {}) or {}
@@ -155,52 +307,75 @@ def _ensure_collection_with_signature_adapt(
             if "size" in vectors:
                 vector_size = int(vectors["size"])
                 vector_distance = vectors.get("distance", "Cosine")
-            else:
-                # Could be named vectors, which we don't want
-                if vectors:
-                    first_key = next(iter(vectors.keys()), None)
-                    if first_key:
-                        raise RuntimeError(
-                            f"Collection '{name}' uses named vectors ('{first_key}'), but the project requires unnamed vectors"
-                        )
-
-        # If we have valid info and it matches our requirements, return it
+            elif vectors:
+                # Named vectors, which we don't want
+                first_key = next(iter(vectors.keys()))
+                raise RuntimeError(
+                    f"Error accessing collection '{name}': collection uses named vectors ('{first_key}'), but the project requires unnamed vectors"
+                )
+
         if vector_size == dim and vector_distance == distance:
-            return {"params": {"vectors": {"size": dim, "distance": distance}}}
+            # exists_ok: no further round-trips
+            if not quantization or getattr(cfg, "quantization_config", None):
+                return synthetic
+            if not recreate_bad:
+                log.warning(
+                    "Collection '%s' is not quantized; set QDRANT_RECREATE_BAD=1 to rebuild it",
+                    name,
+                )
+                return synthetic
+        elif not recreate_bad:
+            raise RuntimeError(
+                f"Collection '{name}' schema mismatch: found size={vector_size}, "
+                f"distance={vector_distance}, expected size={dim}, distance={distance}"
+            )
 
-        # Schema mismatch detected
-        mismatch_msg = (
-            f"Collection '{name}' schema mismatch: found size={vector_size}, "
-            f"distance={vector_distance}, expected size={dim}, distance={distance}"
+        # exists_mismatch with recreate_bad: drop it, then create below
+        client.delete_collection(collection_name=name)
+        invalidate_ensure_cache(name)
+
+    # missing (or just dropped): create with unnamed vectors
+    quantization_config = None
+    if quantization:
+        # int8 copies (4x smaller) serve searches from RAM; FP32 stays on disk
+        quantization_config = models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
         )
-
-        if recreate_bad:
-            # Will be recreated below
-            client.delete_collection(collection_name=name)
-        else:
-            raise RuntimeError(mismatch_msg)
-
-    except Exception as e:
-        # If the collection doesn't exist or we're recreating, we'll create it below
-        if "does not exist" not in str(e) and "schema mismatch" not in str(e):
-            # Unexpected error
-            raise RuntimeError(f"Error accessing collection '{name}': {e}")
-
-    # Create or recreate collection with unnamed vectors
-    client.recreate_collection(
+    client.create_collection(
         collection_name=name,
-        vectors_config=VectorParams(size=dim, distance=distance),
+        vectors_config=VectorParams(
+            size=dim, distance=distance, on_disk=True if quantization else None
+        ),
+        quantization_config=quantization_config,
+        optimizers_config=models.OptimizersConfigDiff(
+            indexing_threshold=_DEFAULT_INDEXING_THRESHOLD
+        ),
+        on_disk_payload=True,
     )
 
-    # Return the final configuration
-    try:
-        info = client.get_collection(name)
-        return getattr(info, "config", {}) or {
-            "params": {"vectors": {"size": dim, "distance": distance}}
-        }
-    except Exception:
-        # If we can't get the config, return a synthetic one
-        return {"params": {"vectors": {"size": dim, "distance": distance}}}
+    # We just told the server the config; no need to read it back
+    return synthetic
+
+
+# Keyword/integer payload indexes created by _ensure_payload_indexes
+_RANGE_ONLY_INT = models.IntegerIndexParams(
+    type=models.IntegerIndexType.INTEGER, lookup=False, range=True
+)
+_PAYLOAD_INDEX_FIELDS: List[Tuple[str, Any]] = [
+    ("document_id", models.PayloadSchemaType.KEYWORD),
+    ("kind", models.PayloadSchemaType.KEYWORD),
+    ("path", models.PayloadSchemaType.KEYWORD),
+    # Timestamps are only ever range-filtered: skip the exact-match lookup
+    # structure and keep just the range index
+    ("meta.ingested_at_ts", _RANGE_ONLY_INT),
+    ("meta.created_at_ts", _RANGE_ONLY_INT),
+    # Provenance contract (Milestone 3)
+    ("meta.source_system", models.PayloadSchemaType.KEYWORD),
+    ("meta.doc_type", models.PayloadSchemaType.KEYWORD),
+    ("meta.detected_as", models.PayloadSchemaType.KEYWORD),
+]
 
 
 def _ensure_payload_indexes(client: QdrantClient, name: str) -> None:
@@ -211,7 +386,7 @@ def _ensure_payload_indexes(client: QdrantClient, name: str) -> None:
     - document_id (KEYWORD)
     - kind (KEYWORD)
     - path (KEYWORD)
-    - meta.ingested_at_ts (INTEGER)
+    - meta.ingested_at_ts, meta.created_at_ts (INTEGER, range only)
     - meta.source_system (KEYWORD)
     - meta.doc_type (KEYWORD)
     - meta.detected_as (KEYWORD)
@@ -224,99 +399,85 @@ def _ensure_payload_indexes(client: QdrantClient, name: str) -> None:
     except Exception:
         payload_schema = {}
 
+    fields: List[Tuple[str, Any]] = []
     if "content" not in payload_schema:
-        try:
-            client.create_payload_index(
-                collection_name=name,
-                field_name="content",
-                field_schema=models.TextIndexParams(
+        fields.append(
+            (
+                "content",
+                models.TextIndexParams(
                     type="text",
                     tokenizer=models.TokenizerType.WORD,
                     lowercase=True,
                 ),
             )
+        )
+    fields.extend(f for f in _PAYLOAD_INDEX_FIELDS if f[0] not in payload_schema)
+    if not fields:
+        return
+
+    def _create(field: Tuple[str, Any]) -> None:
+        try:
+            client.create_payload_index(
+                collection_name=name, field_name=field[0], field_schema=field[1]
+            )
         except Exception:
             pass
 
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="document_id",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="kind",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="path",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="meta.ingested_at_ts",
-            field_schema=models.PayloadSchemaType.INTEGER,
-        )
-    except Exception:
-        pass
-    # New indexes for provenance contract (Milestone 3)
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="meta.source_system",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="meta.doc_type",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
-    try:
-        client.create_payload_index(
-            collection_name=name,
-            field_name="meta.detected_as",
-            field_schema=models.PayloadSchemaType.KEYWORD,
-        )
-    except Exception:
-        pass
+    # Independent, idempotent calls: issue them concurrently (~1 RTT total)
+    with ThreadPoolExecutor(max_workers=len(fields)) as pool:
+        list(pool.map(_create, fields))
 
 
 # -------------------------- Upserts & deletes --------------------------
 
+# Qdrant's default optimizer indexing_threshold (KB of vectors per segment)
+_DEFAULT_INDEXING_THRESHOLD = 20000
+# Points validated/submitted at a time when upsert_points gets a non-list iterable
+_STREAM_WINDOW = 8192
+
 
 def upsert_points(
-    items: List[Tuple[str, List[float], Dict[str, Any]]],
+    items: Iterable[Tuple[str, List[float], Dict[str, Any]]],
     *,
     collection_name: Optional[str] = None,
     client: Optional[QdrantClient] = None,
     batch_size: int = 128,
     ensure: bool = True,
+    bulk: bool = False,
+    wait: bool = True,
 ) -> int:
     """Upsert (id, vector, payload) tuples into Qdrant in small batches.
 
     - Returns the number of points successfully submitted to Qdrant.
     - If `ensure`, the collection will be created/repaired before the first upsert.
     - Validates vector dimension against settings.EMBEDDING_DIM and skips invalid vectors.
+    - At/above settings.QDRANT_UPLOAD_MIN_POINTS valid points, ships them via
+      `upload_collection`; smaller inputs use per-batch `upsert`. The upload
+      runs in-process unless `bulk`, so request handlers never fork workers.
+    - Batches are sent with wait=False so building the next batch overlaps the
+      server's WAL flush; with `wait` (default) the final batch waits, which
+      also means everything before it has been applied when this returns.
+      On the upload path that final batch is held back and sent as a waiting
+      `upsert` after the upload.
+    - `bulk=True` pauses HNSW indexing for the duration (see `bulk_ingest`)
+      and lets the upload use settings.QDRANT_UPLOAD_PARALLEL worker
+      processes; only worth it when loading far more than ~10k points in one
+      call (scripts, not request handlers).
+    - `items` may be any iterable; non-list inputs (e.g. a generator from the
+      chunking pipeline) are consumed in windows of _STREAM_WINDOW points so
+      the whole input never has to sit in memory.
     - Never raises for empty input.
     """
-    if not items:
-        return 0
+    if isinstance(items, list):
+        if not items:
+            return 0
+        windows: Iterable[List[Any]] = [items]
+    else:
+        it = iter(items)
+        first = next(it, None)
+        if first is None:
+            return 0
+        windows = _batched(chain([first], it), _STREAM_WINDOW)
 
     qc = client or get_qdrant_client()
     col = collection_name or settings.QDRANT_COLLECTION
@@ -327,84 +488,435 @@ def upsert_points(
         try:
             ensure_collection(qc, col, expected_dim)
         except Exception as e:
-            print(f"[error] Collection ensure failed: {e}", file=sys.stderr)
+            log.error("Collection ensure failed: %s", e)
             return 0
 
     total = 0
     points_skipped_embed_error = 0
-    for batch in _batched(items, batch_size):
-        valid_points = []
-        for pid, vec, payload in batch:
+    with bulk_ingest(qc, col) if bulk else nullcontext():
+        for is_last, window in _mark_last(windows):
+            # Validate each window up front into parallel id/vector/payload lists
+            ids, vectors, payloads, skipped = _valid_columns(window, expected_dim)
+            points_skipped_embed_error += skipped
+            total += _submit_points(
+                qc,
+                col,
+                ids,
+                vectors,
+                payloads,
+                batch_size,
+                wait_last=wait and is_last,
+                parallel=None if bulk else 1,
+            )
+    clear_search_cache(col)
+
+    if points_skipped_embed_error > 0:
+        log.warning(
+            "Total points skipped due to embedding errors: %d",
+            points_skipped_embed_error,
+        )
+
+    return total
+
+
+async def upsert_points_async(
+    items: Iterable[Tuple[str, List[float], Dict[str, Any]]],
+    *,
+    collection_name: Optional[str] = None,
+    client: Optional[AsyncQdrantClient] = None,
+    batch_size: int = 128,
+    concurrency: int = 16,
+) -> int:
+    """Async counterpart of `upsert_points` for callers already in an event loop.
+
+    Same validation and payload normalization, but batches are sent
+    concurrently (at most `concurrency` in flight) with wait=False, so total
+    time tracks the slowest batch rather than the sum of round-trips. Does not
+    ensure the collection; call `ensure_collection` first. A client created
+    here is closed before returning.
+    """
+    items = list(items)
+    if not items:
+        return 0
+
+    col = collection_name or settings.QDRANT_COLLECTION
+    expected_dim = getattr(settings, "EMBEDDING_DIM", 768)
+    ids, vectors, payloads, points_skipped_embed_error = _valid_columns(
+        items, expected_dim
+    )
+
+    own_client = client is None
+    if own_client:
+        import httpx  # qdrant-client dependency
+
+        # One pooled connection per in-flight batch
+        aqc = AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            timeout=10.0,
+            prefer_grpc=bool(settings.QDRANT_PREFER_GRPC),
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+        )
+    else:
+        aqc = client
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _send(batch_ids, batch_vectors, batch_payloads) -> int:
+        batch = _points_batch(batch_ids, batch_vectors, batch_payloads)
+        async with sem:
+            try:
+                await aqc.upsert(collection_name=col, wait=False, points=batch)
+                return len(batch_ids)
+            except Exception as e:
+                _report_upsert_error(e, batch)
+                return 0
+
+    batches = zip(
+        _batched(ids, batch_size),
+        _batched(vectors, batch_size),
+        _batched(payloads, batch_size),
+    )
+    try:
+        sent = await asyncio.gather(*(_send(*batch) for batch in batches))
+    finally:
+        if own_client:
+            await aqc.close()
+        clear_search_cache(col)
+
+    if points_skipped_embed_error > 0:
+        log.warning(
+            "Total points skipped due to embedding errors: %d",
+            points_skipped_embed_error,
+        )
+
+    return sum(sent)
+
+
+def upsert_points_concurrent(
+    items: Iterable[Tuple[str, List[float], Dict[str, Any]]], **kwargs: Any
+) -> int:
+    """Blocking wrapper around `upsert_points_async` for sync callers (scripts).
+
+    Runs its own event loop, so it must not be called from inside one; async
+    handlers should await `upsert_points_async` directly.
+    """
+    return asyncio.run(upsert_points_async(items, **kwargs))
+
+
+def bulk_upload(
+    ids: Sequence[Any],
+    vectors: Sequence[List[float]] | np.ndarray,
+    payloads: Sequence[Dict[str, Any]],
+    *,
+    collection_name: Optional[str] = None,
+    client: Optional[QdrantClient] = None,
+    parallel: Optional[int] = None,
+    batch_size: int = 256,
+    ensure: bool = True,
+) -> int:
+    """Load columnar ids/vectors/payloads via `upload_collection`, always.
+
+    For callers that already hold parallel columns (reindex/rebuild tools):
+    no per-item tuples, and the parallel uploader is used regardless of
+    QDRANT_UPLOAD_MIN_POINTS. Invalid vectors are dropped as in
+    `upsert_points`; an (N, D) ndarray is checked once by shape and, if it
+    doesn't match EMBEDDING_DIM, nothing is uploaded. `parallel` defaults to settings.QDRANT_UPLOAD_PARALLEL
+    (0 -> min(8, cpu count)). Points become searchable shortly after return.
+    Returns the number of points submitted.
+    """
+    if not len(ids):
+        return 0
+    if not (len(ids) == len(vectors) == len(payloads)):
+        raise ValueError("ids, vectors and payloads must have the same length")
+
+    qc = client or get_qdrant_client()
+    col = collection_name or settings.QDRANT_COLLECTION
+    expected_dim = getattr(settings, "EMBEDDING_DIM", 768)
+    if ensure:
+        try:
+            ensure_collection(qc, col, expected_dim)
+        except Exception as e:
+            log.error("Collection ensure failed: %s", e)
+            return 0
+
+    if isinstance(vectors, np.ndarray):
+        # Contiguous (N, D) block from the embedder: one shape check instead
+        # of per-row validation
+        if vectors.ndim != 2 or vectors.shape[1] != expected_dim:
+            log.error(
+                "bulk upload skipped: vectors shape %s, expected (N, %d)",
+                vectors.shape,
+                expected_dim,
+            )
+            return 0
+        ids_, payloads_, skipped = list(ids), list(payloads), 0
+        # gRPC slices the block per batch; REST needs lists, converted once
+        vectors_ = vectors if settings.QDRANT_PREFER_GRPC else vectors.tolist()
+    else:
+        ids_, vectors_, payloads_, skipped = _valid_columns(
+            list(zip(ids, vectors, payloads)), expected_dim
+        )
+    if skipped:
+        log.warning("Total points skipped due to embedding errors: %d", skipped)
+    total = _upload_columns(qc, col, ids_, vectors_, payloads_, batch_size, parallel)
+    clear_search_cache(col)
+    return total
+
+
+@contextmanager
+def bulk_ingest(client: QdrantClient, collection: str) -> Iterator[None]:
+    """Pause HNSW indexing on `collection` while the block loads points.
+
+    Sets indexing_threshold=0 on enter and restores the previous threshold
+    (Qdrant's default 20000 if unknown) on exit, so the index is built once
+    at the end instead of being maintained batch by batch.
+    """
+    threshold = _DEFAULT_INDEXING_THRESHOLD
+    try:
+        info = client.get_collection(collection)
+        current = info.config.optimizer_config.indexing_threshold
+        if current:
+            threshold = current
+    except Exception:
+        pass
+
+    try:
+        client.update_collection(
+            collection_name=collection,
+            optimizer_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+    except Exception as e:
+        log.warning("could not pause indexing on '%s': %s", collection, e)
+    try:
+        yield
+    finally:
+        try:
+            client.update_collection(
+                collection_name=collection,
+                optimizer_config=models.OptimizersConfigDiff(
+                    indexing_threshold=threshold
+                ),
+            )
+        except Exception as e:
+            log.error("could not restore indexing on '%s': %s", collection, e)
+
+
+def _submit_points(
+    qc: QdrantClient,
+    col: str,
+    ids: List[Any],
+    vectors: List[List[float]],
+    payloads: List[Dict[str, Any]],
+    batch_size: int,
+    wait_last: bool = True,
+    parallel: Optional[int] = 1,
+) -> int:
+    """Send validated columns to Qdrant; returns the number of points submitted.
+
+    Upserts go out with wait=False except the last one when `wait_last`.
+    `parallel` is passed to `_upload_columns` for large inputs: 1 keeps the
+    upload in this process, None uses the configured worker processes.
+    """
+    total = 0
+    if len(ids) >= settings.QDRANT_UPLOAD_MIN_POINTS:
+        total = _upload_columns(
+            qc, col, ids, vectors, payloads, batch_size, parallel, wait=wait_last
+        )
+    else:
+        batches = zip(
+            _batched(ids, batch_size),
+            _batched(vectors, batch_size),
+            _batched(payloads, batch_size),
+        )
+        n_batches = -(-len(ids) // batch_size)
+        for i, (batch_ids, batch_vectors, batch_payloads) in enumerate(batches, 1):
+            # Create points with unnamed vector format
+            batch = _points_batch(batch_ids, batch_vectors, batch_payloads)
+            try:
+                qc.upsert(
+                    collection_name=col,
+                    wait=wait_last and i == n_batches,
+                    points=batch,
+                )
+                total += len(batch_ids)
+                log.debug(
+                    "upserted %d pts to %s (first_id=%s)",
+                    len(batch_ids),
+                    col,
+                    batch_ids[0],
+                )
+            except Exception as e:
+                _forget_ensured_on_server_error(col, e)
+                _report_upsert_error(e, batch)
+
+    return total
+
+
+def _upload_columns(
+    qc: QdrantClient,
+    col: str,
+    ids: List[Any],
+    vectors: List[List[float]] | np.ndarray,
+    payloads: List[Dict[str, Any]],
+    batch_size: int,
+    parallel: Optional[int] = None,
+    wait: bool = False,
+) -> int:
+    """Ship validated columns through `upload_collection`; returns points sent.
+
+    The client batches and ships concurrently with wait=False, dropping the
+    per-batch sync barrier. Without `wait`, points become searchable shortly
+    after this returns rather than before it. With `wait`, the last batch is
+    held back and sent afterwards as a waiting `upsert`; Qdrant applies
+    updates in order, so everything is searchable once that returns.
+    """
+    parallel = (
+        parallel or settings.QDRANT_UPLOAD_PARALLEL or min(8, os.cpu_count() or 1)
+    )
+    tail = None
+    if wait:
+        cut = max(0, len(ids) - batch_size)
+        tail = (ids[cut:], vectors[cut:], payloads[cut:])
+        ids, vectors, payloads = ids[:cut], vectors[:cut], payloads[:cut]
+
+    sent = 0
+    if len(ids):
+        if settings.QDRANT_PREFER_GRPC:
+            # One float32 block the uploader slices per batch; REST keeps the
+            # lists, since widened float32 values would bloat the JSON bodies
+            vectors = np.asarray(vectors, dtype=np.float32)
+        try:
+            qc.upload_collection(
+                collection_name=col,
+                ids=ids,
+                vectors=vectors,
+                payload=payloads,
+                batch_size=batch_size,
+                parallel=parallel,
+                wait=False,
+            )
+            log.debug("uploaded %d pts to %s", len(ids), col)
+            sent = len(ids)
+        except Exception as e:
+            _forget_ensured_on_server_error(col, e)
+            log.error("bulk upload failed: %s", e)
+            return 0
+
+    if tail is not None:
+        tail_ids, tail_vectors, tail_payloads = tail
+        if isinstance(tail_vectors, np.ndarray):
+            tail_vectors = tail_vectors.tolist()
+        batch = _points_batch(tail_ids, tail_vectors, tail_payloads)
+        try:
+            qc.upsert(collection_name=col, wait=True, points=batch)
+            sent += len(tail_ids)
+        except Exception as e:
+            _forget_ensured_on_server_error(col, e)
+            _report_upsert_error(e, batch)
+    return sent
+
+
+def _forget_ensured_on_server_error(col: str, e: Exception) -> None:
+    # Qdrant rejected the write (collection dropped or changed behind our
+    # back?): make the next upsert_points re-run the ensure instead of
+    # trusting the cache
+    if isinstance(e, UnexpectedResponse):
+        invalidate_ensure_cache(col)
+
+
+def _points_batch(
+    ids: List[Any], vectors: List[List[float]], payloads: List[Dict[str, Any]]
+) -> models.Batch:
+    """One columnar Batch for columns that already passed `_valid_columns`.
+
+    A single Batch replaces one PointStruct per point, and model_construct
+    skips pydantic's per-float re-validation of every vector; the data was
+    checked once already and the server rejects anything malformed.
+    """
+    return models.Batch.model_construct(ids=ids, vectors=vectors, payloads=payloads)
+
+
+def _valid_columns(
+    items: List[Tuple[str, List[float], Dict[str, Any]]], expected_dim: int
+) -> Tuple[List[Any], List[List[float]], List[Dict[str, Any]], int]:
+    """Split items into id/vector/payload lists, dropping invalid vectors.
+
+    The common all-valid case is one O(N) pass over the rows (plain list of
+    the expected length; no copy of the data). Any other batch goes through
+    the per-point checks, which log a warning for each skipped point, so
+    tuples, ndarray rows or strings never slip through. Callers holding an
+    (N, D) ndarray check its shape instead (see `bulk_upload`).
+    Returns (ids, vectors, payloads, skipped_count).
+    """
+    ids, vectors, payloads = (list(col) for col in zip(*items))
+    all_valid = all(type(v) is list and len(v) == expected_dim for v in vectors)
+
+    skipped = 0
+    if not all_valid:
+        ids, vectors, payloads = [], [], []
+        for pid, vec, payload in items:
             # Validate vector format and dimension
             if not isinstance(vec, list):
-                points_skipped_embed_error += 1
-                print(
-                    f"[warn] Skipping upsert id={pid} due to embedding type: got {type(vec).__name__}, expected list"
+                skipped += 1
+                log.warning(
+                    "Skipping upsert id=%s due to embedding type: got %s, expected list",
+                    pid,
+                    type(vec).__name__,
                 )
                 continue
 
             if len(vec) != expected_dim:
-                points_skipped_embed_error += 1
-                print(
-                    f"[warn] Skipping upsert id={pid} due to wrong embedding dimension: got {len(vec)}, expected {expected_dim}"
+                skipped += 1
+                log.warning(
+                    "Skipping upsert id=%s due to wrong embedding dimension: got %d, expected %d",
+                    pid,
+                    len(vec),
+                    expected_dim,
                 )
                 continue
 
-            # Standardize payload: ensure 'content' key for hybrid search
-            if "content" not in payload and "text" in payload:
-                payload["content"] = payload.pop("text")
-
-            # Create point with unnamed vector format
-            valid_points.append(models.PointStruct(id=pid, vector=vec, payload=payload))
+            ids.append(pid)
+            vectors.append(vec)
+            payloads.append(payload)
 
-        if not valid_points:
-            continue
+    # Standardize payload: ensure 'content' key for hybrid search
+    for payload in payloads:
+        if "content" not in payload and "text" in payload:
+            payload["content"] = payload.pop("text")
 
-        try:
-            qc.upsert(collection_name=col, wait=True, points=valid_points)
-            total += len(valid_points)
-        except Exception as e:
-            # Provide concise error information for debugging
-            try:
-                from qdrant_client.http.exceptions import UnexpectedResponse
-
-                if isinstance(e, UnexpectedResponse):
-                    # Concise error summary focusing on what's needed to diagnose common issues
-                    point_count = len(valid_points)
-                    first_point_info = {}
-
-                    if valid_points:
-                        first_point = valid_points[0]
-                        vector_len = (
-                            len(first_point.vector)
-                            if hasattr(first_point, "vector")
-                            else "unknown"
-                        )
-                        first_point_info = {
-                            "id_type": type(first_point.id).__name__,
-                            "vector_len": vector_len,
-                            "payload_keys": (
-                                list(first_point.payload.keys())
-                                if hasattr(first_point, "payload")
-                                else []
-                            ),
-                        }
-
-                    print(
-                        f"[qdrant error] status={e.status_code} body={e.body} points={point_count} first_point={first_point_info}",
-                        file=sys.stderr,
-                    )
-                else:
-                    print(f"[error] upsert failed: {e}", file=sys.stderr)
-            except Exception:
-                print(f"[error] upsert failed: {e}", file=sys.stderr)
+    return ids, vectors, payloads, skipped
 
-    if points_skipped_embed_error > 0:
-        print(
-            f"[warn] Total points skipped due to embedding errors: {points_skipped_embed_error}"
-        )
 
-    return total
+def _report_upsert_error(e: Exception, batch: models.Batch) -> None:
+    """Log a concise summary of a failed upsert batch for debugging."""
+    if not log.isEnabledFor(logging.ERROR):
+        return
+    try:
+        if isinstance(e, UnexpectedResponse):
+            # Concise error summary focusing on what's needed to diagnose common issues
+            point_count = len(batch.ids)
+            first_point_info = {}
+
+            if batch.ids:
+                first_point_info = {
+                    "id_type": type(batch.ids[0]).__name__,
+                    "vector_len": len(batch.vectors[0]),
+                    "payload_keys": list((batch.payloads or [{}])[0].keys()),
+                }
+
+            log.error(
+                "[qdrant error] status=%s body=%s points=%d first_point=%s",
+                e.status_code,
+                e.content,
+                point_count,
+                first_point_info,
+            )
+        else:
+            log.error("upsert failed: %s", e)
+    except Exception:
+        log.error("upsert failed: %s", e)
 
 
 def delete_by_document_id(
@@ -416,21 +928,79 @@ def delete_by_document_id(
     """Delete all points with payload.document_id == given value. Returns deleted count (best-effort)."""
     qc = client or get_qdrant_client()
     col = collection_name or settings.QDRANT_COLLECTION
-    flt = models.Filter(
-        must=[
-            models.FieldCondition(
-                key="document_id", match=models.MatchValue(value=document_id)
-            )
-        ]
-    )
+    flt = _single_match_filter("document_id", document_id)
     try:
         res = qc.delete(
             collection_name=col, points_selector=models.FilterSelector(filter=flt)
         )
-        # qdrant doesn't always return a count; try to read it, else -1 (unknown)
-        return int(getattr(res, "status", 0) == "acknowledged") or -1
     except Exception:
         return 0
+    # After the (waiting) delete, so a racing search can't re-cache the old hits
+    clear_search_cache(col)
+    # qdrant doesn't always return a count; try to read it, else -1 (unknown)
+    return int(getattr(res, "status", 0) == "acknowledged") or -1
+
+
+def replace_document(
+    document_id: str,
+    items: List[Tuple[str, List[float], Dict[str, Any]]],
+    *,
+    collection_name: Optional[str] = None,
+    client: Optional[QdrantClient] = None,
+    batch_size: int = 128,
+) -> int:
+    """Swap a document's points for `items`; returns the number of points submitted.
+
+    The delete-by-document_id and the first batch of points go to Qdrant as a
+    single `batch_update_points` request, so a re-ingest costs one round trip
+    (and one index mutation) instead of a delete followed by an upsert. A
+    document that fits in that first batch (`batch_size` points) is swapped
+    atomically: searches never see it missing. Further batches are sent with
+    `upsert` as in `upsert_points`, so a larger document is briefly only
+    partly searchable until they land. The collection must already exist.
+    """
+    qc = client or get_qdrant_client()
+    col = collection_name or settings.QDRANT_COLLECTION
+    expected_dim = getattr(settings, "EMBEDDING_DIM", 768)
+
+    ids, vectors, payloads, skipped = (
+        _valid_columns(items, expected_dim) if items else ([], [], [], 0)
+    )
+    if skipped:
+        log.warning("Total points skipped due to embedding errors: %d", skipped)
+
+    head = _points_batch(ids[:batch_size], vectors[:batch_size], payloads[:batch_size])
+    ops: List[models.UpdateOperation] = [
+        models.DeleteOperation(
+            delete=models.FilterSelector(
+                filter=_single_match_filter("document_id", document_id)
+            )
+        )
+    ]
+    if head.ids:
+        ops.append(models.UpsertOperation(upsert=models.PointsBatch(batch=head)))
+    try:
+        qc.batch_update_points(
+            collection_name=col,
+            update_operations=ops,
+            wait=len(ids) <= batch_size,  # else the last tail batch waits
+        )
+    except Exception as e:
+        _report_upsert_error(e, head)
+        return 0
+
+    total = len(head.ids) + _submit_points(
+        qc,
+        col,
+        ids[batch_size:],
+        vectors[batch_size:],
+        payloads[batch_size:],
+        batch_size,
+    )
+    # Only once the last (waiting) write returned: clearing earlier lets a
+    # search in between re-cache the pre-replace hits
+    clear_search_cache(col)
+    return total
 
 
 # ------------------------------ Search ---------------------------------
@@ -444,30 +1014,106 @@ def build_filter(
     extra_must: Optional[List[models.Condition]] = None,
 ) -> Optional[models.Filter]:
     """Convenience helper to compose common filters."""
-    must: List[models.Condition] = []
-    if document_id:
-        must.append(
-            models.FieldCondition(
-                key="document_id", match=models.MatchValue(value=document_id)
-            )
-        )
-    if kind:
-        must.append(
-            models.FieldCondition(key="kind", match=models.MatchValue(value=kind))
-        )
-    if path:
-        must.append(
-            models.FieldCondition(key="path", match=models.MatchValue(value=path))
-        )
-
+    pairs = [
+        (key, value)
+        for key, value in (("document_id", document_id), ("kind", kind), ("path", path))
+        if value
+    ]
+    if len(pairs) == 1 and not extra_must:
+        # Common single-field case: hand back the interned filter
+        return _single_match_filter(*pairs[0])
+
+    must: List[models.Condition] = [_match_condition(k, v) for k, v in pairs]
     if extra_must:
         must.extend(extra_must)
 
     return models.Filter(must=must) if must else None
 
 
+@lru_cache(maxsize=1024)
+def _match_condition(key: str, value: str) -> models.FieldCondition:
+    """Interned `key == value` condition (pydantic construction isn't free)."""
+    return models.FieldCondition(key=key, match=models.MatchValue(value=value))
+
+
+@lru_cache(maxsize=1024)
+def _single_match_filter(key: str, value: str) -> models.Filter:
+    """Interned single-condition filter; treat the result as read-only."""
+    return models.Filter(must=[_match_condition(key, value)])
+
+
+# collection -> (fetched_at, dim, distance); schema changes are rare and go
+# through ensure_collection, which drops the entry via invalidate_ensure_cache
+_SCHEMA_CACHE: Dict[str, Tuple[float, Optional[int], Optional[str]]] = {}
+_SCHEMA_TTL = 60.0
+
+
+def _get_schema(qc: QdrantClient, collection_name: str) -> Tuple[Optional[int], Any]:
+    """(dim, distance) of the collection's vectors, cached for `_SCHEMA_TTL` seconds."""
+    now = time.monotonic()
+    hit = _SCHEMA_CACHE.get(collection_name)
+    if hit is not None and now - hit[0] < _SCHEMA_TTL:
+        return hit[1], hit[2]
+
+    info = qc.get_collection(collection_name)
+    cfg = getattr(info, "config", None)
+    params = getattr(cfg, "params", None)
+    vectors = getattr(params, "vectors", None)
+
+    # Extract vector dimension and distance from config
+    dim = None
+    dist = None
+
+    # Support both unnamed vector format (direct size/distance) and named vectors
+    if hasattr(vectors, "size"):
+        # Object-based unnamed vector
+        dim = int(vectors.size)
+        dist = getattr(vectors, "distance", None)
+    elif isinstance(vectors, dict):
+        # Either unnamed vector as dict or named vectors
+        if "size" in vectors:
+            # Unnamed vector as dict
+            dim = int(vectors["size"])
+            dist = vectors.get("distance", "Cosine")
+        else:
+            # Named vectors - get first one (though this isn't our preferred format)
+            try:
+                first_key = next(iter(vectors.keys()))
+                first = vectors[first_key]
+                dim = int(getattr(first, "size", 0))
+                dist = getattr(first, "distance", None)
+            except Exception:
+                pass
+
+    _SCHEMA_CACHE[collection_name] = (now, dim, dist)
+    return dim, dist
+
+
+def _validate_collection_schema(
+    qc: QdrantClient, collection_name: str, expected_dim: int
+) -> None:
+    """Raise RuntimeError unless the collection's vectors are `expected_dim`-d cosine."""
+    try:
+        dim, dist = _get_schema(qc, collection_name)
+
+        # Validate dimension and distance
+        if dim != expected_dim:
+            raise RuntimeError(
+                f"Collection '{collection_name}' dimension mismatch: has {dim}, expected {expected_dim}"
+            )
+
+        if dist and str(dist).lower() != "cosine":
+            raise RuntimeError(
+                f"Collection '{collection_name}' distance mismatch: has {dist}, expected Cosine"
+            )
+    except Exception as e:
+        # Don't let a bad (or since-fixed) schema stick around for the TTL
+        _SCHEMA_CACHE.pop(collection_name, None)
+        raise RuntimeError(f"Failed to validate collection '{collection_name}': {e}")
+
+
 def search(
-    query_vector: Optional[List[float]] = None,
+    query_vector: Optional[Sequence[float] | np.ndarray] = None,
     *,
     query_text: Optional[str] = None,
     k: int = 5,
@@ -475,9 +1121,21 @@ def search(
     query_filter: Optional[models.Filter] = None,
     client: Optional[QdrantClient] = None,
     with_payload: bool = True,
-    debug: bool = False,
+    debug: bool | str = False,
+    hnsw_ef: Optional[int] = None,
+    indexed_only: bool = False,
+    exact: bool = False,
 ) -> List[models.ScoredPoint]:
-    """Search similar vectors in the explicit collection. Checks schema and prints debug diagnostics if requested."""
+    """Search similar vectors in the explicit collection. Checks schema and prints debug diagnostics if requested.
+
+    `debug=True` prints an approximate point count; `debug="verbose"` also
+    dumps the raw collection info from the REST API.
+
+    `hnsw_ef` (default settings.QDRANT_HNSW_EF), `indexed_only` and `exact`
+    map to Qdrant's SearchParams; with none of them set the server defaults
+    apply. `indexed_only=True` skips segments still being indexed instead of
+    brute-forcing them, which keeps latency flat during large ingests.
+    """
     qc = client or get_qdrant_client()
     if not collection_name:
         raise RuntimeError(
@@ -487,7 +1145,7 @@ def search(
     expected_dim = getattr(settings, "EMBEDDING_DIM", 768)
 
     # 1. Query Planning & Embedding
-    if not query_text and not query_vector:
+    if not query_text and (query_vector is None or not len(query_vector)):
         return []
 
     if query_vector is None:
@@ -499,79 +1157,51 @@ def search(
             return []
 
     # Validate query vector dimension
-    if not isinstance(query_vector, list) or len(query_vector) != expected_dim:
+    n = _vector_dim(query_vector)
+    if n != expected_dim:
         raise RuntimeError(
-            f"Query vector dimension mismatch: got {len(query_vector) if isinstance(query_vector, list) else type(query_vector).__name__}, expected {expected_dim}"
+            f"Query vector dimension mismatch: got {type(query_vector).__name__ if n is None else n}, expected {expected_dim}"
         )
 
-    # Check collection exists and schema matches
-    try:
-        info = qc.get_collection(collection_name)
-        cfg = getattr(info, "config", None)
-        params = getattr(cfg, "params", None)
-        vectors = getattr(params, "vectors", None)
-
-        # Extract vector dimension and distance from config
-        dim = None
-        dist = None
-
-        # Support both unnamed vector format (direct size/distance) and named vectors
-        if hasattr(vectors, "size"):
-            # Object-based unnamed vector
-            dim = int(vectors.size)
-            dist = getattr(vectors, "distance", None)
-        elif isinstance(vectors, dict):
-            # Either unnamed vector as dict or named vectors
-            if "size" in vectors:
-                # Unnamed vector as dict
-                dim = int(vectors["size"])
-                dist = vectors.get("distance", "Cosine")
-            else:
-                # Named vectors - get first one (though this isn't our preferred format)
-                try:
-                    first_key = next(iter(vectors.keys()))
-                    first = vectors[first_key]
-                    dim = int(getattr(first, "size", 0))
-                    dist = getattr(first, "distance", None)
-                except Exception:
-                    pass
-
-        # Validate dimension and distance
-        if dim != expected_dim:
-            raise RuntimeError(
-                f"Collection '{collection_name}' dimension mismatch: has {dim}, expected {expected_dim}"
-            )
+    # Repeat queries (same embedding, k, filter) are served from memory; the
+    # schema check is skipped too since a cached hit implies it passed
+    cache_key = None
+    if with_payload and not debug and settings.QDRANT_SEARCH_CACHE_TTL > 0:
+        cache_key = (
+            collection_name,
+            k,
+            hashlib.blake2b(
+                np.asarray(query_vector, dtype=np.float32).tobytes(), digest_size=16
+            ).digest(),
+            repr(query_filter),
+            (hnsw_ef, indexed_only, exact),
+        )
+        cached = _search_cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-        if dist and str(dist).lower() != "cosine":
-            raise RuntimeError(
-                f"Collection '{collection_name}' distance mismatch: has {dist}, expected Cosine"
-            )
-    except Exception as e:
-        raise RuntimeError(f"Failed to validate collection '{collection_name}': {e}")
+    # Check collection exists and schema matches
+    _validate_collection_schema(qc, collection_name, expected_dim)
 
-    # Debug diagnostics: raw collection JSON and parsed fields
+    # Debug diagnostics: approximate point count (cheap, shared client); the
+    # raw collection JSON only for debug="verbose"
     if debug:
-        import requests
-        import json
-
+        try:
+            approx = qc.count(collection_name=collection_name, exact=False).count
+            print(f"debug: collection={collection_name} approx_count={approx}")
+        except Exception as e:
+            print(f"debug: collection={collection_name} diagnostics error: {e}")
         url = getattr(settings, "QDRANT_URL", None)
-        if url:
+        if debug == "verbose" and url:
             endpoint = url.rstrip("/") + f"/collections/{collection_name}"
             try:
-                resp = requests.get(endpoint, timeout=10)
+                resp = _HTTP.get(endpoint, timeout=10)
                 if resp.status_code == 200:
-                    raw_json = resp.json()
-                    print(json.dumps(raw_json, ensure_ascii=False))
-                    result = raw_json.get("result", {})
-                    points_count = result.get("points") or result.get("points_count")
-                    indexed_vectors_count = result.get("indexed_vectors_count")
-                    # Some Qdrant versions nest indexed_vectors_count
-                    if indexed_vectors_count is None and "result" in result:
-                        indexed_vectors_count = result["result"].get(
-                            "indexed_vectors_count"
-                        )
+                    # Server body is already JSON; print it as-is
+                    print(resp.text)
+                    result = json_loads(resp.content).get("result", {})
                     print(
-                        f"debug: collection={collection_name} raw_points_count={points_count} indexed_vectors_count={indexed_vectors_count}"
+                        f"debug: collection={collection_name} raw_points_count={result.get('points_count')} indexed_vectors_count={result.get('indexed_vectors_count')}"
                     )
                 else:
                     print(
@@ -592,9 +1222,95 @@ def search(
         with_payload=with_payload,
         query_filter=query_filter,  # Use only the user-provided filter
         with_vectors=False,  # Requirements: strip out raw vectors
+        search_params=_search_params(hnsw_ef, indexed_only, exact),
     )
 
     # 4. Payload Cleanup
+    hits = _clean_hits(results)
+    if cache_key is not None:
+        _search_cache_put(cache_key, hits)
+    return hits
+
+
+# (collection, k, vector digest, filter repr, search params) -> (stored_at, hits)
+_SEARCH_CACHE: OrderedDict[Tuple[Any, ...], Tuple[float, List[models.ScoredPoint]]] = (
+    OrderedDict()
+)
+_SEARCH_CACHE_SIZE = 256
+# search() runs on FastAPI's threadpool; LRU reordering isn't atomic
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _search_cache_get(key: Tuple[Any, ...]) -> Optional[List[models.ScoredPoint]]:
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] >= settings.QDRANT_SEARCH_CACHE_TTL:
+            del _SEARCH_CACHE[key]
+            return None
+        _SEARCH_CACHE.move_to_end(key)
+    return list(hit[1])
+
+
+def _search_cache_put(key: Tuple[Any, ...], hits: List[models.ScoredPoint]) -> None:
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[key] = (time.monotonic(), list(hits))
+        _SEARCH_CACHE.move_to_end(key)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+
+
+def clear_search_cache(collection_name: Optional[str] = None) -> None:
+    """Drop cached search results for `collection_name` (or all, if None).
+
+    Writes through this module (upserts, deletes, replace_document) call this
+    for their collection once their waiting write has returned; writers in
+    other processes rely on the TTL. Writes sent with wait=False (bulk_upload,
+    upsert_points(wait=False), the async path) may be applied after the
+    clear, so a search in that window can cache pre-write results for up to
+    QDRANT_SEARCH_CACHE_TTL seconds.
+    """
+    with _SEARCH_CACHE_LOCK:
+        if collection_name is None:
+            _SEARCH_CACHE.clear()
+            return
+        for key in [k for k in _SEARCH_CACHE if k[0] == collection_name]:
+            del _SEARCH_CACHE[key]
+
+
+def _vector_dim(vec: Any) -> Optional[int]:
+    """Length of a list or 1-D ndarray query vector; None for anything else."""
+    if isinstance(vec, np.ndarray):
+        return vec.shape[0] if vec.ndim == 1 else None
+    return len(vec) if isinstance(vec, list) else None
+
+
+def _search_params(
+    hnsw_ef: Optional[int], indexed_only: bool, exact: bool
+) -> Optional[models.SearchParams]:
+    """SearchParams for the given knobs, or None to leave the server defaults."""
+    if hnsw_ef is None:
+        hnsw_ef = settings.QDRANT_HNSW_EF or None
+    quantization = None
+    if settings.QDRANT_QUANTIZATION and settings.QDRANT_QUANTIZATION_OVERSAMPLING > 1:
+        # Pull extra int8 candidates, then rescore them with the on-disk FP32
+        # originals so quantization costs little recall
+        quantization = models.QuantizationSearchParams(
+            rescore=True, oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING
+        )
+    if not (hnsw_ef or indexed_only or exact or quantization):
+        return None
+    return models.SearchParams(
+        hnsw_ef=hnsw_ef,
+        exact=exact,
+        indexed_only=indexed_only,
+        quantization=quantization,
+    )
+
+
+def _clean_hits(results: Iterable[models.ScoredPoint]) -> List[models.ScoredPoint]:
+    """Strip hit payloads down to the keys downstream code uses."""
     # Ensure usage of only necessary metadata (content, path, score)
     # Keeping document_id/kind/idx as they are small and critical for downstream join/identification
     allowed_keys = {"content", "path", "document_id", "kind", "idx"}
@@ -608,19 +1324,102 @@ def search(
     return clean_results
 
 
+# search_batch: above this many queries, split into chunks sent concurrently
+_SEARCH_BATCH_SPLIT_MIN = 64
+_SEARCH_BATCH_CHUNK = 32
+
+
+def search_batch(
+    query_vectors: Sequence[Sequence[float] | np.ndarray] | np.ndarray,
+    *,
+    k: int = 5,
+    collection_name: str,
+    query_filter: Optional[models.Filter] = None,
+    client: Optional[QdrantClient] = None,
+    with_payload: bool = True,
+    hnsw_ef: Optional[int] = None,
+    indexed_only: bool = False,
+    exact: bool = False,
+) -> List[List[models.ScoredPoint]]:
+    """Run several vector searches in one `query_batch_points` round-trip.
+
+    Returns one hit list per query vector, in input order, with the same
+    payload cleanup and search-param knobs as `search`. Prefer this over
+    looping `search()` when a caller has many queries for the same collection.
+    """
+    qc = client or get_qdrant_client()
+    if not collection_name:
+        raise RuntimeError(
+            "No Qdrant collection specified. Use --collection or set QDRANT_COLLECTION."
+        )
+    if len(query_vectors) == 0:
+        return []
+
+    expected_dim = getattr(settings, "EMBEDDING_DIM", 768)
+    for i, vec in enumerate(query_vectors):
+        n = _vector_dim(vec)
+        if n != expected_dim:
+            raise RuntimeError(
+                f"Query vector {i} dimension mismatch: got {type(vec).__name__ if n is None else n}, expected {expected_dim}"
+            )
+
+    _validate_collection_schema(qc, collection_name, expected_dim)
+
+    params = _search_params(hnsw_ef, indexed_only, exact)
+    requests_ = [
+        models.QueryRequest(
+            query=vec.tolist() if isinstance(vec, np.ndarray) else vec,
+            limit=k,
+            filter=query_filter,
+            params=params,
+            with_payload=with_payload,
+            with_vector=False,
+        )
+        for vec in query_vectors
+    ]
+    workers = settings.QDRANT_CLIENT_SEARCH_PARALLELISM
+    if len(requests_) <= _SEARCH_BATCH_SPLIT_MIN or workers <= 1:
+        responses = qc.query_batch_points(
+            collection_name=collection_name, requests=requests_
+        )
+        return [_clean_hits(resp.points) for resp in responses]
+
+    # Qdrant only parallelizes a batch across segments; several smaller
+    # batches in flight at once keep the server's cores busy even when the
+    # collection has a single segment.
+    chunks = list(_batched(requests_, _SEARCH_BATCH_CHUNK))
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        chunk_responses = pool.map(
+            lambda chunk: qc.query_batch_points(
+                collection_name=collection_name, requests=chunk
+            ),
+            chunks,
+        )
+        return [
+            _clean_hits(resp.points)
+            for responses in chunk_responses
+            for resp in responses
+        ]
+
+
 def count(
     *,
     collection_name: Optional[str] = None,
     query_filter: Optional[models.Filter] = None,
     client: Optional[QdrantClient] = None,
-    exact: bool = True,
+    exact: bool = False,
 ) -> int:
-    """Count points, optionally with a filter. Returns 0 on failure."""
+    """Count points, optionally with a filter. Returns 0 on failure.
+
+    Approximate by default: Qdrant answers from per-segment metadata instead
+    of scanning every point, which is plenty for progress/threshold checks.
+    With a filter the estimate can be noticeably off; pass `exact=True`
+    wherever the number is shown to users or compared for equality.
+    """
     qc = client or get_qdrant_client()
     col = collection_name or settings.QDRANT_COLLECTION
     try:
-        # Qdrant client count method doesn't support filters, so we ignore query_filter for now
-        res = qc.count(collection_name=col, exact=exact)
+        res = qc.count(collection_name=col, count_filter=query_filter, exact=exact)
         return int(getattr(res, "count", 0))
     except Exception:
         return 0
@@ -629,9 +1428,26 @@ def count(
 # ------------------------------ Utils ----------------------------------
 
 
-def _batched(seq: List[Any], n: int) -> Iterable[List[Any]]:
-    for i in range(0, len(seq), n):
-        yield seq[i : i + n]
+def _mark_last(items: Iterable[Any]) -> Iterator[Tuple[bool, Any]]:
+    """Yield (is_last, item) pairs, looking one item ahead."""
+    it = iter(items)
+    prev = next(it, _SENTINEL)
+    if prev is _SENTINEL:
+        return
+    for item in it:
+        yield False, prev
+        prev = item
+    yield True, prev
+
+
+_SENTINEL = object()
+
+
+def _batched(items: Iterable[Any], n: int) -> Iterator[List[Any]]:
+    """Yield lists of up to `n` items from any iterable (like 3.12's itertools.batched)."""
+    it = iter(items)
+    while batch := list(islice(it, n)):
+        yield batch
 
 
 # -------------------------- Count helpers --------------------------
@@ -639,37 +1455,29 @@ def _batched(seq: List[Any], n: int) -> Iterable[List[Any]]:
 
 def count_total(collection: str) -> int:
     """
-    Count total points in a collection using Qdrant's count endpoint.
+    Count total points in a collection via the shared client's count call.
     If the collection doesn't exist yet (404), return 0 instead of raising.
     """
-    url = f"{settings.QDRANT_URL}/collections/{collection}/points/count"
-    try:
-        r = requests.post(url, json={"exact": True}, timeout=5)
-        r.raise_for_status()
-        j = r.json()
-        return int(j.get("result", {}).get("count", 0))
-    except HTTPError as e:
-        if getattr(e, "response", None) is not None and e.response.status_code == 404:
-            return 0
-        raise
+    return _count_or_zero(collection)
 
 
 def count_match(collection: str, key: str, value: str) -> int:
     """
-    Count points matching a specific key-value filter using Qdrant's count endpoint.
+    Count points matching a specific key-value filter via the shared client.
     If the collection doesn't exist yet (404), return 0 instead of raising.
     """
-    url = f"{settings.QDRANT_URL}/collections/{collection}/points/count"
-    body = {
-        "exact": True,
-        "filter": {"must": [{"key": key, "match": {"value": value}}]},
-    }
+    return _count_or_zero(collection, _single_match_filter(key, value))
+
+
+def _count_or_zero(
+    collection: str, count_filter: Optional[models.Filter] = None
+) -> int:
     try:
-        r = requests.post(url, json=body, timeout=5)
-        r.raise_for_status()
-        j = r.json()
-        return int(j.get("result", {}).get("count", 0))
-    except HTTPError as e:
-        if getattr(e, "response", None) is not None and e.response.status_code == 404:
+        res = get_qdrant_client().count(
+            collection_name=collection, count_filter=count_filter, exact=True
+        )
+    except Exception as e:
+        if _is_not_found(e):
             return 0
         raise
+    return int(res.count)
@@ -1,10 +1,35 @@
 # worker/app/services/qdrant_minimal.py
 from __future__ import annotations
 
+import asyncio
+import httpx
 import requests
-from typing import Dict, Any
+import threading
+from operator import methodcaller
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib3.util.retry import Retry
 
 from worker.app.config import settings
+from worker.app.utils.http import json_loads, pooled_session
+
+# Keep-alive session for the control-plane calls below: repeated ensures reuse
+# pooled sockets instead of a fresh TCP handshake per GET/PUT/DELETE. Retries
+# (exponential backoff, honouring Retry-After on 429) cover Qdrant restarting
+# or shedding load behind a proxy (all calls here are idempotent).
+_SESSION = pooled_session(
+    pool_connections=8,
+    pool_maxsize=32,
+    retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[429, 502, 503, 504]),
+)
+
+
+def _json(r: requests.Response) -> Any:
+    return json_loads(r.content)
+
+
+def _vectors(dim: int, distance: str) -> Dict[str, Any]:
+    """Unnamed-vector params; a fresh dict each call (callers may mutate configs)."""
+    return {"size": dim, "distance": distance}
 
 
 def _qdrant_base() -> str:
@@ -12,37 +37,74 @@ def _qdrant_base() -> str:
     return settings.QDRANT_URL.rstrip("/")
 
 
+def _public_attrs(obj: Any) -> Dict[str, Any]:
+    return {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
+
+
+# type -> converter; the hasattr probes below run once per type, not per call
+_CONVERTERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _pick_converter(t: type) -> Callable[[Any], Dict[str, Any]]:
+    """Build the conversion chain for instances of `t` (same order as before:
+    model_dump, dict(), plain dict, public attributes)."""
+    if t is type(None):
+        return lambda obj: {}
+
+    steps: List[Callable[[Any], Dict[str, Any]]] = []
+    if hasattr(t, "model_dump"):  # Pydantic v2
+        steps.append(methodcaller("model_dump"))
+    if callable(getattr(t, "dict", None)):  # Pydantic v1 and look-alikes
+        steps.append(methodcaller("dict"))
+    if issubclass(t, dict):
+        if not steps:
+            return lambda obj: obj
+        steps.append(lambda obj: obj)
+    else:
+        steps.append(_public_attrs)
+
+    def convert(obj: Any) -> Dict[str, Any]:
+        for step in steps:
+            try:
+                return step(obj)
+            except Exception:
+                pass
+        return {}
+
+    return convert
+
+
 def _as_dict(obj: Any) -> Dict[str, Any]:
     """Convert various object types to a dictionary.
 
     Handles Pydantic models, objects with model_dump/dict methods, and regular objects.
     """
-    if obj is None:
-        return {}
+    t = type(obj)
+    fn = _CONVERTERS.get(t)
+    if fn is None:
+        fn = _CONVERTERS[t] = _pick_converter(t)
+    return fn(obj)
+
+
+# Collections verified/created by ensure_collection_minimal in this process,
+# keyed by (qdrant url, name, dim, distance); a hit skips the GET round-trip.
+_ENSURED: Set[Tuple[str, str, int, str]] = set()
+
+# Singleflight for cold ensures: while one thread runs GET(+PUT) for a key,
+# other threads wanting the same key wait for it instead of racing their own
+# create. Followers of a failed leader retry on their own (failures aren't cached).
+_INFLIGHT: Dict[Tuple[str, str, int, str], threading.Event] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT_WAIT_S = 10.0
 
-    # Handle Pydantic v2 model_dump()
-    if hasattr(obj, "model_dump"):
-        try:
-            return obj.model_dump()
-        except Exception:
-            pass
-
-    # Handle Pydantic v1 dict() or other similar methods
-    if hasattr(obj, "dict") and callable(obj.dict):
-        try:
-            return obj.dict()
-        except Exception:
-            pass
-
-    # Handle standard dict
-    if isinstance(obj, dict):
-        return obj
-
-    # Last resort: try to convert object attributes to dict
-    try:
-        return {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
-    except Exception:
-        return {}
+
+def reset_ensure_cache(name: Optional[str] = None) -> None:
+    """Forget verified collections (all, or just `name`), e.g. after a drop."""
+    if name is None:
+        _ENSURED.clear()
+        return
+    for key in [k for k in _ENSURED if k[1] == name]:
+        _ENSURED.discard(key)
 
 
 def ensure_collection_minimal(
@@ -63,99 +125,143 @@ def ensure_collection_minimal(
 
     Raises:
         RuntimeError: If collection exists with wrong schema and recreate_bad=False
+
+    A collection verified once is remembered for the process; call
+    reset_ensure_cache() after dropping it out of band. Concurrent first
+    calls for the same collection share one GET/PUT.
     """
-    url = f"{_qdrant_base()}/collections/{name}"
+    key = (_qdrant_base(), name, dim, distance.lower())
+    synthetic = {"params": {"vectors": _vectors(dim, distance)}}
+    if key in _ENSURED:
+        return synthetic
+
+    with _INFLIGHT_LOCK:
+        done = _INFLIGHT.get(key)
+        leader = done is None
+        if leader:
+            done = _INFLIGHT[key] = threading.Event()
+
+    if not leader:
+        done.wait(_INFLIGHT_WAIT_S)
+        if key in _ENSURED:
+            return synthetic
+        # Leader failed (or is stuck): try ourselves so the caller sees the error
+        config = _ensure_collection_http(name, dim, distance, recreate_bad)
+        _ENSURED.add(key)
+        return config
 
     try:
-        # Check if collection exists
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-
-            # Extract vectors config - handle both newer and older API response formats
-            config = _as_dict(data.get("config", {}))
+        config = _ensure_collection_http(name, dim, distance, recreate_bad)
+        _ENSURED.add(key)
+        return config
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        done.set()
+
+
+def _match_existing(
+    data: Dict[str, Any], name: str, dim: int, distance: str
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Classify a GET /collections/{name} body.
+
+    Returns (config, "") when it has unnamed vectors of `dim`/`distance`,
+    else (None, a descriptive schema-mismatch message).
+    """
+    # Extract vectors config - handle both newer and older API response formats
+    config = _as_dict(data.get("config", {}))
+    params = _as_dict(config.get("params", {}))
+    vectors = _as_dict(params.get("vectors", {}))
+
+    # First try to get the result field if present (newer Qdrant versions)
+    if not config and "result" in data:
+        result_config = _as_dict(data.get("result", {}).get("config", {}))
+        if result_config:
+            config = result_config
             params = _as_dict(config.get("params", {}))
             vectors = _as_dict(params.get("vectors", {}))
 
-            # First try to get the result field if present (newer Qdrant versions)
-            if not config and "result" in data:
-                result_config = _as_dict(data.get("result", {}).get("config", {}))
-                if result_config:
-                    config = result_config
-                    params = _as_dict(config.get("params", {}))
-                    vectors = _as_dict(params.get("vectors", {}))
-
-            # Classify vector configuration
-            is_valid = False
-            is_named_vectors = False
-            vector_size = None
-            vector_distance = None
-
-            # Case 1: Valid unnamed vectors {'size': 768, 'distance': 'Cosine', ...}
-            if isinstance(vectors, dict) and "size" in vectors:
-                vector_size = vectors.get("size")
-                vector_distance = vectors.get("distance", "")
-                # Case-insensitive distance comparison
-                is_valid = (
-                    vector_size == dim
-                    and str(vector_distance).lower() == distance.lower()
-                )
-
-            # Case 2: Empty vectors config
-            elif not vectors:
-                is_valid = False
-
-            # Case 3: Named vectors {'text': {'size': 768, ...}}
-            elif isinstance(vectors, dict):
-                is_named_vectors = any(
-                    isinstance(v, dict) and "size" in v for v in vectors.values()
-                )
+    # Classify vector configuration
+    is_valid = False
+    is_named_vectors = False
+    vector_size = None
+    vector_distance = None
+
+    # Case 1: Valid unnamed vectors {'size': 768, 'distance': 'Cosine', ...}
+    if isinstance(vectors, dict) and "size" in vectors:
+        vector_size = vectors.get("size")
+        vector_distance = vectors.get("distance", "")
+        # Case-insensitive distance comparison
+        is_valid = (
+            vector_size == dim and str(vector_distance).lower() == distance.lower()
+        )
+
+    # Case 2: Empty vectors config
+    elif not vectors:
+        is_valid = False
+
+    # Case 3: Named vectors {'text': {'size': 768, ...}}
+    elif isinstance(vectors, dict):
+        is_named_vectors = any(
+            isinstance(v, dict) and "size" in v for v in vectors.values()
+        )
+
+    # If valid, return the config
+    if is_valid:
+        return config, ""
+
+    # Schema mismatch - prepare descriptive message
+    vector_desc = f"type={type(vectors).__name__}"
+    if isinstance(vectors, dict):
+        vector_desc += f", keys={list(vectors.keys())}"
+
+    mismatch_msg = (
+        f"qdrant collection schema mismatch for {name}: "
+        f"expected unnamed(size={dim}, distance={distance}), got {vector_desc}"
+    )
+
+    # Add specific details if we could extract size/distance
+    if vector_size is not None or vector_distance:
+        mismatch_msg += f" with size={vector_size}, distance={vector_distance}"
+
+    # Add named vectors info if detected
+    if is_named_vectors:
+        mismatch_msg += " (appears to be using named vectors)"
+
+    return None, mismatch_msg
+
+
+def _ensure_collection_http(
+    name: str, dim: int, distance: str, recreate_bad: bool, _raced: bool = False
+) -> Dict[str, Any]:
+    url = f"{_qdrant_base()}/collections/{name}"
 
-            # If valid, return the config
-            if is_valid:
+    try:
+        # Check if collection exists
+        r = _SESSION.get(url, timeout=5)
+        if r.status_code == 200:
+            config, mismatch_msg = _match_existing(_json(r), name, dim, distance)
+            if config is not None:
                 return config
 
-            # Schema mismatch - prepare descriptive message
-            vector_desc = f"type={type(vectors).__name__}"
-            if isinstance(vectors, dict):
-                vector_desc += f", keys={list(vectors.keys())}"
-
-            mismatch_msg = (
-                f"qdrant collection schema mismatch for {name}: "
-                f"expected unnamed(size={dim}, distance={distance}), got {vector_desc}"
-            )
-
-            # Add specific details if we could extract size/distance
-            if vector_size is not None or vector_distance:
-                mismatch_msg += f" with size={vector_size}, distance={vector_distance}"
-
-            # Add named vectors info if detected
-            if is_named_vectors:
-                mismatch_msg += " (appears to be using named vectors)"
-
             if recreate_bad:
                 # Drop and recreate
                 delete_url = url
-                delete_r = requests.delete(delete_url, timeout=10)
+                delete_r = _SESSION.delete(delete_url, timeout=10)
                 if delete_r.status_code not in (200, 204):
                     raise RuntimeError(
                         f"Failed to drop collection '{name}': status {delete_r.status_code}"
                     )
 
                 # Now recreate with correct schema
-                payload = {"vectors": {"size": dim, "distance": distance}}
-                create_r = requests.put(url, json=payload, timeout=10)
+                payload = {"vectors": _vectors(dim, distance)}
+                create_r = _SESSION.put(url, json=payload, timeout=10)
                 if create_r.status_code != 200:
                     raise RuntimeError(
                         f"Failed to recreate collection '{name}': status {create_r.status_code}"
                     )
 
-                # Get the final config
-                get_r = requests.get(url, timeout=5)
-                if get_r.status_code == 200:
-                    return get_r.json().get("config", {}) or {
-                        "params": {"vectors": payload["vectors"]}
-                    }
+                # PUT succeeded with exactly this schema: no need to GET it back
                 return {"params": {"vectors": payload["vectors"]}}
             else:
                 # Raise error on mismatch when not recreating
@@ -163,16 +269,16 @@ def ensure_collection_minimal(
 
         # Not found → create it
         if r.status_code == 404:
-            payload = {"vectors": {"size": dim, "distance": distance}}
-            pr = requests.put(url, json=payload, timeout=10)
+            payload = {"vectors": _vectors(dim, distance)}
+            pr = _SESSION.put(url, json=payload, timeout=10)
             if pr.status_code == 200:
-                # Get the final config
-                get_r = requests.get(url, timeout=5)
-                if get_r.status_code == 200:
-                    return get_r.json().get("config", {}) or {
-                        "params": {"vectors": payload["vectors"]}
-                    }
+                # PUT succeeded with exactly this schema: no need to GET it back
                 return {"params": {"vectors": payload["vectors"]}}
+            if pr.status_code == 409 and not _raced:
+                # Someone else created it since our GET: verify theirs instead
+                return _ensure_collection_http(
+                    name, dim, distance, recreate_bad, _raced=True
+                )
 
             raise RuntimeError(
                 f"Failed to create collection '{name}': status {pr.status_code} {pr.text}"
@@ -181,8 +287,121 @@ def ensure_collection_minimal(
         # Any other GET status is unexpected
         raise RuntimeError(f"Unexpected status {r.status_code}: {r.text}")
 
-    except Exception as e:
-        if isinstance(e, RuntimeError):
-            raise
-        # Network or other exceptions
-        raise RuntimeError(f"Qdrant operation failed: {e}")
+    except (requests.RequestException, ValueError) as e:
+        # Transport errors (incl. exhausted retries) and unparseable bodies;
+        # anything else is a bug and propagates as-is
+        raise RuntimeError(f"Qdrant operation failed: {e}") from e
+
+
+# Pool limits for the async variant's client (one per event loop: httpx
+# connections are bound to the loop that opened them)
+_ASYNC_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=_ASYNC_LIMITS, timeout=5.0)
+
+
+async def aensure_collection_minimal(
+    *,
+    name: str,
+    dim: int,
+    distance: str = "Cosine",
+    recreate_bad: bool = False,
+    http: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
+    """
+    Async ensure_collection_minimal: same checks, cache and errors, over httpx.
+
+    Pass `http` to share one AsyncClient across calls (see
+    aensure_collections_minimal); otherwise a short-lived one is used.
+    """
+    key = (_qdrant_base(), name, dim, distance.lower())
+    if key in _ENSURED:
+        return {"params": {"vectors": _vectors(dim, distance)}}
+
+    if http is None:
+        async with _async_client() as http:
+            config = await _aensure_collection_http(
+                http, name, dim, distance, recreate_bad
+            )
+    else:
+        config = await _aensure_collection_http(http, name, dim, distance, recreate_bad)
+    _ENSURED.add(key)
+    return config
+
+
+async def aensure_collections_minimal(
+    specs: Iterable[Tuple[str, int]],
+    *,
+    distance: str = "Cosine",
+    recreate_bad: bool = False,
+) -> List[Dict[str, Any]]:
+    """Ensure several (name, dim) collections concurrently over one AsyncClient."""
+    async with _async_client() as http:
+        return list(
+            await asyncio.gather(
+                *(
+                    aensure_collection_minimal(
+                        name=name,
+                        dim=dim,
+                        distance=distance,
+                        recreate_bad=recreate_bad,
+                        http=http,
+                    )
+                    for name, dim in specs
+                )
+            )
+        )
+
+
+async def _aensure_collection_http(
+    http: httpx.AsyncClient,
+    name: str,
+    dim: int,
+    distance: str,
+    recreate_bad: bool,
+    _raced: bool = False,
+) -> Dict[str, Any]:
+    url = f"{_qdrant_base()}/collections/{name}"
+    payload = {"vectors": _vectors(dim, distance)}
+
+    try:
+        r = await http.get(url)
+        if r.status_code == 200:
+            config, mismatch_msg = _match_existing(
+                json_loads(r.content), name, dim, distance
+            )
+            if config is not None:
+                return config
+            if not recreate_bad:
+                raise RuntimeError(mismatch_msg)
+
+            delete_r = await http.delete(url, timeout=10)
+            if delete_r.status_code not in (200, 204):
+                raise RuntimeError(
+                    f"Failed to drop collection '{name}': status {delete_r.status_code}"
+                )
+            create_r = await http.put(url, json=payload, timeout=10)
+            if create_r.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to recreate collection '{name}': status {create_r.status_code}"
+                )
+            return {"params": {"vectors": payload["vectors"]}}
+
+        if r.status_code == 404:
+            pr = await http.put(url, json=payload, timeout=10)
+            if pr.status_code == 200:
+                return {"params": {"vectors": payload["vectors"]}}
+            if pr.status_code == 409 and not _raced:
+                return await _aensure_collection_http(
+                    http, name, dim, distance, recreate_bad, _raced=True
+                )
+            raise RuntimeError(
+                f"Failed to create collection '{name}': status {pr.status_code} {pr.text}"
+            )
+
+        raise RuntimeError(f"Unexpected status {r.status_code}: {r.text}")
+
+    except (httpx.HTTPError, ValueError) as e:
+        raise RuntimeError(f"Qdrant operation failed: {e}") from e
@@ -1,8 +1,10 @@
 # worker/app/telemetry.py
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import queue
 import threading
 import time
 import uuid
@@ -16,22 +18,80 @@ import logging
 log = logging.getLogger(__name__)
 
 
+def _json_line(entry: Dict[str, Any]) -> bytes:
+    # default=str: an odd value is written as text rather than losing the line
+    return (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+try:  # optional: several times faster than json.dumps, emits UTF-8 bytes directly
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+    def _jsonl(entry: Dict[str, Any]) -> bytes:
+        # Non-str keys become strings as with json; anything else orjson
+        # rejects (big ints, unknown types) goes through json instead of
+        # dropping the event. NaN/inf are written as null.
+        try:
+            return orjson.dumps(entry, option=_ORJSON_OPTS)
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            return _json_line(entry)
+
+except ImportError:
+    _jsonl = _json_line
+
+
+# Append-only, created on demand; O_BINARY keeps Windows from adding \r
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+# Counter names accepted by Telemetry.increment (and reported by get_stats)
+_COUNTERS = (
+    "ingest_total",
+    "ingest_failed",
+    "watcher_triggers_total",
+    "export_total",
+    "ask_synth_total",
+)
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_ISO_SECOND: tuple = (-1, "")
+
+
+def _iso_now() -> str:
+    """UTC now in datetime.isoformat() form, formatting the date part once per second."""
+    global _ISO_SECOND
+    now = time.time()
+    sec = int(now)
+    cached = _ISO_SECOND
+    if cached[0] != sec:
+        stamp = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        cached = _ISO_SECOND = (sec, stamp)
+    us = round((now - sec) * 1_000_000)
+    if us == 1_000_000:  # rounds up into the next second
+        return datetime.fromtimestamp(now, timezone.utc).isoformat()
+    if us:
+        return f"{cached[1]}.{us:06d}+00:00"
+    return f"{cached[1]}+00:00"
+
+
 class Telemetry:
     """
     Thread-safe telemetry singleton for worker service.
 
     Provides in-memory counters and structured JSON logging to data/logs/worker.jsonl.
     All operations are wrapped in try/except to ensure telemetry failures never crash the app.
+
+    JSONL writes happen off the request path: callers enqueue the entry and a
+    single background thread drains the queue, appending everything pending
+    for a file in one os.write on a persistent O_APPEND fd (so a burst of
+    events costs one syscall, not one open/write/close each). Call flush()
+    to wait for pending lines.
     """
 
     def __init__(self):
         self._lock = threading.Lock()
         self._uptime_start = time.time()
-        self._ingest_total = 0
-        self._ingest_failed = 0
-        self._watcher_triggers_total = 0
-        self._export_total = 0
-        self._ask_synth_total = 0
+        self._counters: Dict[str, int] = dict.fromkeys(_COUNTERS, 0)
         self._last_error: Optional[str] = None
 
         # Log file configuration
@@ -53,20 +113,24 @@ class Telemetry:
         except Exception as e:
             log.warning(f"Failed to create log directory {self._log_dir}: {e}")
 
+        # Background JSONL writer: queue of (path, entry) or a flush Event
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._fds: Dict[Path, int] = {}
+        self._sizes: Dict[Path, int] = {}  # current size of each open file
+        self._writer = threading.Thread(
+            target=self._drain, name="telemetry-writer", daemon=True
+        )
+        self._writer.start()
+        # Daemon thread dies with the interpreter: write out what's queued
+        atexit.register(self.flush, 2.0)
+
     def increment(self, counter_name: str) -> None:
         """Thread-safe counter increment."""
         try:
             with self._lock:
-                if counter_name == "ingest_total":
-                    self._ingest_total += 1
-                elif counter_name == "ingest_failed":
-                    self._ingest_failed += 1
-                elif counter_name == "watcher_triggers_total":
-                    self._watcher_triggers_total += 1
-                elif counter_name == "export_total":
-                    self._export_total += 1
-                elif counter_name == "ask_synth_total":
-                    self._ask_synth_total += 1
+                # Unknown names are ignored, as before
+                if counter_name in self._counters:
+                    self._counters[counter_name] += 1
         except Exception as e:
             log.debug(f"Telemetry increment failed for {counter_name}: {e}")
 
@@ -87,33 +151,84 @@ class Telemetry:
         try:
             # Prepare log entry
             log_entry = {
-                "ts": datetime.now(timezone.utc).isoformat(),
+                "ts": _iso_now(),
                 "level": level,
                 "subsystem": "worker",
                 "event": event,
                 **fields,
             }
 
-            # Check if log rotation is needed
-            self._maybe_rotate_log()
-
-            # Write to log file
-            with self._lock:
-                with open(self._log_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            # Written (and rotated) by the background writer
+            self._queue.put((self._log_file, log_entry))
 
         except Exception as e:
             log.debug(f"Telemetry log_json failed: {e}")
 
-    def _maybe_rotate_log(self) -> None:
-        """Rotate log file if it exceeds size limit (2-deep: .1, .2)."""
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk (or `timeout` passes)."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _drain(self) -> None:
+        """Writer thread: serialize queued entries, one write per file per batch."""
+        while True:
+            item = self._queue.get()
+            pending: Dict[Path, List[bytes]] = {}
+            waiters = []
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    path, entry = item
+                    try:
+                        pending.setdefault(path, []).append(_jsonl(entry))
+                    except Exception as e:
+                        log.debug(f"Telemetry serialize for {path} failed: {e}")
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            for path, lines in pending.items():
+                self._maybe_rotate(path)
+                self._append(path, b"".join(lines))
+            for done in waiters:
+                done.set()
+
+    def _append(self, path: Path, data: bytes) -> None:
+        """Append `data` through a persistent O_APPEND fd (no file object, no flush)."""
+        try:
+            fd = self._fds.get(path)
+            if fd is None:
+                fd = self._fds[path] = os.open(path, _APPEND_FLAGS, 0o644)
+                self._sizes[path] = os.fstat(fd).st_size
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            self._sizes[path] += len(data)
+        except Exception as e:
+            log.debug(f"Telemetry write to {path} failed: {e}")
+
+    def _maybe_rotate(self, path: Path) -> None:
+        """Rotate a JSONL file if it exceeds the size limit (2-deep: .1, .2)."""
+        limit = (
+            self._ingest_activity_max_bytes
+            if path == self._ingest_activity_file
+            else self._max_log_bytes
+        )
+        # Bytes we've written (plus the size at open) stand in for a stat()
+        if self._sizes.get(path, 0) <= limit:
+            return
         try:
-            if (
-                self._log_file.exists()
-                and self._log_file.stat().st_size > self._max_log_bytes
-            ):
-                log_file_2 = self._log_file.with_suffix(".jsonl.2")
-                log_file_1 = self._log_file.with_suffix(".jsonl.1")
+            # Close our handle first; the next write reopens a fresh file
+            self._sizes.pop(path, None)
+            fd = self._fds.pop(path, None)
+            if fd is not None:
+                os.close(fd)
+            if path.exists():
+                log_file_2 = path.with_suffix(".jsonl.2")
+                log_file_1 = path.with_suffix(".jsonl.1")
 
                 # If .2 exists, delete it (oldest)
                 if log_file_2.exists():
@@ -124,36 +239,25 @@ class Telemetry:
                     log_file_1.rename(log_file_2)
 
                 # Rename current to .1
-                self._log_file.rename(log_file_1)
-
-                # Current file is now gone; next write will create a new one
+                path.rename(log_file_1)
         except Exception as e:
-            log.warning(f"Log rotation failed: {e}")
+            log.warning(f"Log rotation failed for {path}: {e}")
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get current telemetry statistics."""
+        """Get current telemetry statistics.
+
+        Lock-free: dict.copy() and attribute reads are atomic under the GIL,
+        so health/status scrapes never wait on the ingest path.
+        """
         try:
-            with self._lock:
-                return {
-                    "uptime_s": int(time.time() - self._uptime_start),
-                    "ingest_total": self._ingest_total,
-                    "ingest_failed": self._ingest_failed,
-                    "watcher_triggers_total": self._watcher_triggers_total,
-                    "export_total": self._export_total,
-                    "ask_synth_total": self._ask_synth_total,
-                    "last_error": self._last_error,
-                }
-        except Exception as e:
-            log.debug(f"Telemetry get_stats failed: {e}")
             return {
-                "uptime_s": 0,
-                "ingest_total": 0,
-                "ingest_failed": 0,
-                "watcher_triggers_total": 0,
-                "export_total": 0,
-                "ask_synth_total": 0,
-                "last_error": None,
+                "uptime_s": int(time.time() - self._uptime_start),
+                **self._counters.copy(),
+                "last_error": self._last_error,
             }
+        except Exception as e:
+            log.debug(f"Telemetry get_stats failed: {e}")
+            return {"uptime_s": 0, **dict.fromkeys(_COUNTERS, 0), "last_error": None}
 
     def record_ingest_activity(
         self,
@@ -177,7 +281,7 @@ class Telemetry:
         """
         try:
             activity_id = activity_id or str(uuid.uuid4())
-            now_iso = datetime.now(timezone.utc).isoformat()
+            now_iso = _iso_now()
 
             record = {
                 "id": activity_id,
@@ -194,50 +298,16 @@ class Telemetry:
                 or (now_iso if status != "processing" else None),
             }
 
-            # Add to ring buffer
-            with self._lock:
-                self._ingest_activity_buffer.append(record)
-
-            # Append to JSONL file
-            self._maybe_rotate_ingest_activity_log()
-            try:
-                with self._lock:
-                    with open(self._ingest_activity_file, "a", encoding="utf-8") as f:
-                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
-            except Exception as e:
-                log.debug(f"Failed to write ingest activity to JSONL: {e}")
+            # Ring buffer for get_recent_activity + JSONL via the writer thread;
+            # bounded deque.append and SimpleQueue.put are both thread-safe
+            self._ingest_activity_buffer.append(record)
+            self._queue.put((self._ingest_activity_file, record))
 
             return activity_id
         except Exception as e:
             log.debug(f"Telemetry record_ingest_activity failed: {e}")
             return activity_id or str(uuid.uuid4())
 
-    def _maybe_rotate_ingest_activity_log(self) -> None:
-        """Rotate ingest activity log file if it exceeds size limit (2-deep: .1, .2)."""
-        try:
-            if (
-                self._ingest_activity_file.exists()
-                and self._ingest_activity_file.stat().st_size
-                > self._ingest_activity_max_bytes
-            ):
-                log_file_2 = self._ingest_activity_file.with_suffix(".jsonl.2")
-                log_file_1 = self._ingest_activity_file.with_suffix(".jsonl.1")
-
-                # If .2 exists, delete it (oldest)
-                if log_file_2.exists():
-                    log_file_2.unlink()
-
-                # If .1 exists, rename to .2
-                if log_file_1.exists():
-                    log_file_1.rename(log_file_2)
-
-                # Rename current to .1
-                self._ingest_activity_file.rename(log_file_1)
-
-                # Current file is now gone; next write will create a new one
-        except Exception as e:
-            log.warning(f"Ingest activity log rotation failed: {e}")
-
     def get_recent_activity(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get recent ingest activity records (trimmed for API response).
@@ -246,30 +316,30 @@ class Telemetry:
         started_at, finished_at, kind, path.
         """
         try:
-            with self._lock:
-                # Get latest N records (most recent last in deque)
-                recent = list(self._ingest_activity_buffer)[-limit:]
-                # Reverse to show most recent first
-                recent.reverse()
-
-                # Trim to essential fields
-                trimmed = []
-                for record in recent:
-                    trimmed.append(
-                        {
-                            "id": record.get("id"),
-                            "filename": record.get("filename"),
-                            "status": record.get("status"),
-                            "reason": record.get("reason"),
-                            "chunks": record.get("chunks", 0),
-                            "images": record.get("images", 0),
-                            "started_at": record.get("started_at"),
-                            "finished_at": record.get("finished_at"),
-                            "kind": record.get("kind"),
-                            "path": record.get("path"),
-                        }
-                    )
-                return trimmed
+            # Get latest N records (most recent last in deque); list(deque) is
+            # atomic under the GIL, so no lock is needed for the snapshot
+            recent = list(self._ingest_activity_buffer)[-limit:]
+            # Reverse to show most recent first
+            recent.reverse()
+
+            # Trim to essential fields
+            trimmed = []
+            for record in recent:
+                trimmed.append(
+                    {
+                        "id": record.get("id"),
+                        "filename": record.get("filename"),
+                        "status": record.get("status"),
+                        "reason": record.get("reason"),
+                        "chunks": record.get("chunks", 0),
+                        "images": record.get("images", 0),
+                        "started_at": record.get("started_at"),
+                        "finished_at": record.get("finished_at"),
+                        "kind": record.get("kind"),
+                        "path": record.get("path"),
+                    }
+                )
+            return trimmed
         except Exception as e:
             log.debug(f"Telemetry get_recent_activity failed: {e}")
             return []
@@ -4,6 +4,7 @@ Centralizes:
   * DEFAULT_NAMESPACE (stable UUID namespace)
   * document_id_for_relpath(relpath) -> UUID
   * chunk_id_for(document_id, idx) -> UUID
+  * chunk_ids_for(document_id, n) -> [UUID] (batched chunk_id_for)
   * canonicalize_relpath(path, dropzone_dir) -> canonical POSIX relative path
 
 Canonical path rules:
@@ -19,7 +20,11 @@ re-ingests replace instead of duplicate.
 
 from __future__ import annotations
 
+import hashlib
+import os
+from functools import lru_cache
 from pathlib import Path
+from typing import List
 import uuid
 
 DEFAULT_NAMESPACE = uuid.UUID("00000000-0000-5000-8000-000000000000")
@@ -27,6 +32,14 @@ DEFAULT_NAMESPACE = uuid.UUID("00000000-0000-5000-8000-000000000000")
 
 def canonicalize_relpath(path: str | Path, dropzone_dir: str | Path) -> str:
     """Return canonical POSIX relpath of path within dropzone_dir (ValueError if outside)."""
+    path, dropzone_dir = str(path), str(dropzone_dir)
+    if os.path.isabs(path) and os.path.isabs(dropzone_dir):
+        # Absolute inputs don't depend on the cwd: memoize the resolve() stats
+        return _canonicalize_cached(path, dropzone_dir)
+    return _canonicalize(path, dropzone_dir)
+
+
+def _canonicalize(path: str, dropzone_dir: str) -> str:
     p = Path(path).resolve()
     root = Path(dropzone_dir).resolve()
     try:
@@ -41,6 +54,12 @@ def canonicalize_relpath(path: str | Path, dropzone_dir: str | Path) -> str:
     return rel_posix
 
 
+# Ingest loops canonicalize the same few paths over and over; symlinks under
+# the dropzone are not expected to be re-pointed while the worker runs.
+_canonicalize_cached = lru_cache(maxsize=4096)(_canonicalize)
+
+
+@lru_cache(maxsize=4096)
 def document_id_for_relpath(relpath: str) -> uuid.UUID:
     return uuid.uuid5(DEFAULT_NAMESPACE, relpath)
 
@@ -49,9 +68,25 @@ def chunk_id_for(document_id: uuid.UUID, idx: int) -> uuid.UUID:
     return uuid.uuid5(document_id, f"chunk:{idx}")
 
 
+def chunk_ids_for(document_id: uuid.UUID, n: int) -> List[uuid.UUID]:
+    """chunk_id_for(document_id, i) for i in range(n), sharing the namespace hash.
+
+    uuid5 is SHA-1 over namespace bytes + name: hash the namespace once and
+    copy() that state per chunk instead of rehashing it N times.
+    """
+    base = hashlib.sha1(document_id.bytes)
+    out = []
+    for idx in range(n):
+        h = base.copy()
+        h.update(b"chunk:%d" % idx)
+        out.append(uuid.UUID(bytes=h.digest()[:16], version=5))
+    return out
+
+
 __all__ = [
     "DEFAULT_NAMESPACE",
     "canonicalize_relpath",
     "document_id_for_relpath",
     "chunk_id_for",
+    "chunk_ids_for",
 ]
@@ -0,0 +1,15 @@
+"""Path-or-stream helper shared by the text parsers (parse_json, parse_csv)."""
+
+from contextlib import nullcontext
+from typing import Any, ContextManager, TextIO, Union
+
+
+def open_text(path: Union[str, TextIO], **kwargs: Any) -> ContextManager[TextIO]:
+    """Open `path` as UTF-8 text, or pass an already-open text stream through.
+
+    Streams are yielded as-is and left open for the caller. `kwargs` (e.g.
+    newline, errors) only apply when a path is opened.
+    """
+    if hasattr(path, "read"):
+        return nullcontext(path)
+    return open(path, "r", encoding="utf-8", **kwargs)
@@ -11,11 +11,31 @@ Usage:
         model="llama3.1:8b",
         timeout=180
     )
+
+    # or piece by piece, as tokens arrive
+    for piece in generate_stream("Answer this..."):
+        ...
 """
 
+import time
+from typing import Iterator, Optional
+
 import requests
-from typing import Optional
 from worker.app.config import settings
+from worker.app.utils.http import json_loads, pooled_session
+
+# Keep-alive pool shared by every synthesis call (no TCP connect per answer)
+_SESSION = pooled_session(pool_connections=10, pool_maxsize=50)
+
+# Generation options come from env-derived settings that don't change at
+# runtime: build them once and share the (never mutated) dict across calls
+_OPTIONS = {
+    "temperature": settings.LLM_TEMPERATURE,
+    "top_p": settings.LLM_TOP_P,
+    "repeat_penalty": settings.LLM_REPEAT_PENALTY,
+    "num_ctx": settings.LLM_NUM_CTX,
+    "num_predict": settings.LLM_MAX_TOKENS,
+}
 
 
 def generate(
@@ -31,42 +51,65 @@ def generate(
         prompt: The prompt to send to the LLM
         host: Ollama host (default: settings.OLLAMA_HOST or http://localhost:11434)
         model: Model to use (default: settings.OLLAMA_MODEL or llama3.1:8b)
-        timeout: Request timeout in seconds (default: 180)
+        timeout: Overall deadline in seconds for the whole answer (default: 180)
 
     Returns:
         Generated text on success, empty string on failure
     """
+    try:
+        return "".join(generate_stream(prompt, host, model, timeout)).strip()
+    except Exception:
+        # Return empty string on any failure
+        return ""
+
+
+def generate_stream(
+    prompt: str,
+    host: Optional[str] = None,
+    model: Optional[str] = None,
+    timeout: int = 180,
+) -> Iterator[str]:
+    """
+    Yield response pieces as Ollama produces them (same arguments as generate).
+
+    Uses Ollama's JSONL streaming mode, so the first tokens arrive after
+    per-token latency rather than after the whole completion. Stops at the
+    chunk marked "done".
+
+    `timeout` is an overall deadline: requests alone would only bound the
+    connect and the gap between two lines, so a model that keeps trickling
+    tokens could run forever. Raises requests.HTTPError on a non-2xx
+    response, requests.Timeout past the deadline, and RuntimeError when
+    Ollama reports an error mid-stream (e.g. the model ran out of memory).
+    """
     # Get defaults from settings or use sensible defaults
     if host is None:
         host = settings.OLLAMA_HOST
     if model is None:
         model = settings.OLLAMA_MODEL
 
-    try:
-        response = requests.post(
-            f"{host}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": settings.LLM_TEMPERATURE,
-                    "top_p": settings.LLM_TOP_P,
-                    "repeat_penalty": settings.LLM_REPEAT_PENALTY,
-                    "num_ctx": settings.LLM_NUM_CTX,
-                    "num_predict": settings.LLM_MAX_TOKENS,
-                },
-            },
-            timeout=timeout,
-        )
-
-        # Handle non-2xx responses gracefully
-        if not (200 <= response.status_code < 300):
-            return ""
-
-        data = response.json()
-        return data.get("response", "").strip()
-
-    except Exception:
-        # Return empty string on any failure
-        return ""
+    deadline = time.monotonic() + timeout
+    with _SESSION.post(
+        f"{host}/api/generate",
+        json={
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": _OPTIONS,
+        },
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            piece = json_loads(line)
+            if piece.get("error"):
+                raise RuntimeError(f"Ollama generate failed: {piece['error']}")
+            if piece.get("response"):
+                yield piece["response"]
+            if piece.get("done"):
+                break
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"Ollama generate exceeded {timeout}s")
@@ -6,6 +6,7 @@ import os
 import sys
 import socket
 from pathlib import Path
+from urllib.parse import urlparse
 import pytest
 
 TESTS_DIR = Path(__file__).resolve().parent  # .../worker/tests
@@ -26,41 +27,85 @@ os.environ.setdefault("QDRANT_URL", os.getenv("QDRANT_URL", "http://localhost:63
 os.environ.setdefault("OLLAMA_URL", os.getenv("OLLAMA_URL", "http://localhost:11434"))
 
 
-def _port_open(host: str, port: int, timeout: float = 0.25) -> bool:
+_HOST_CACHE: dict[str, str] = {}
+
+
+def _port_open(host: str, port: int, timeout: float = 0.05) -> bool:
+    # Resolve once, then a bare connect_ex: no repeat DNS, no exception on refusal
     try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True
+        ip = _HOST_CACHE.get(host)
+        if ip is None:
+            ip = _HOST_CACHE[host] = socket.gethostbyname(host)
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     except OSError:
         return False
+    s.settimeout(timeout)
+    try:
+        return s.connect_ex((ip, port)) == 0
+    except OSError:
+        return False
+    finally:
+        s.close()
 
 
 def _is_qdrant_up() -> bool:
     # Cheap reachability check to decide whether to collect Qdrant-dependent tests
-    from urllib.parse import urlparse
-
     u = urlparse(os.environ.get("QDRANT_URL", "http://localhost:6333"))
     host = u.hostname or "localhost"
     port = u.port or (443 if u.scheme == "https" else 80)
     return _port_open(host, port)
 
 
-QDRANT_AVAILABLE = _is_qdrant_up()
+# Within one session, probe at most once (collection hook + fixture)
+_PROBED = pytest.StashKey[bool]()
+
+
+def _qdrant_available(config: pytest.Config) -> bool:
+    if _PROBED in config.stash:
+        return config.stash[_PROBED]
+    config.stash[_PROBED] = up = _is_qdrant_up()
+    return up
+
+
+@pytest.fixture(scope="session")
+def qdrant_available(pytestconfig: pytest.Config) -> bool:
+    """Whether QDRANT_URL answers; lets a test pick real vs mocked Qdrant itself."""
+    return _qdrant_available(pytestconfig)
 
 
 def pytest_configure(config: pytest.Config) -> None:
     config.addinivalue_line("markers", "qdrant: hits a running Qdrant instance")
+    # Owned by pytest-xdist; registered here too for runs without the plugin
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run these tests on the same xdist worker"
+    )
 
 
 def pytest_collection_modifyitems(
     config: pytest.Config, items: list[pytest.Item]
 ) -> None:
-    # Auto-skip any tests that mention 'qdrant' in their nodeid if Qdrant isn't reachable.
+    # Auto-skip tests marked @pytest.mark.qdrant if Qdrant isn't reachable.
     # Keeps local runs green without requiring the service, while still allowing them to run when up.
-    if QDRANT_AVAILABLE:
+    # Mocked qdrant_* unit tests carry no marker and always run.
+    needs_qdrant = [item for item in items if item.get_closest_marker("qdrant")]
+    # Only probe when something selected actually depends on Qdrant
+    if not needs_qdrant or _qdrant_available(config):
         return
     skip = pytest.mark.skip(
         reason="Qdrant not reachable; set QDRANT_URL and start the service to run these tests"
     )
-    for item in items:
-        if "qdrant" in item.nodeid.lower():
-            item.add_marker(skip)
+    for item in needs_qdrant:
+        item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def sample_docx(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """A small .docx (one paragraph + a 1x2 table), built and saved once per run."""
+    Document = pytest.importorskip("docx").Document
+    p = tmp_path_factory.mktemp("docx") / "s.docx"
+    doc = Document()
+    doc.add_paragraph("Hello world")
+    row = doc.add_table(rows=1, cols=2).rows[0]
+    row.cells[0].text, row.cells[1].text = "A", "B"
+    doc.save(p)
+    return str(p)
@@ -0,0 +1,45 @@
+"""Unit tests for document/chunk id helpers and relpath canonicalization."""
+
+import uuid
+
+import pytest
+
+from worker.app.utils import docids
+from worker.app.utils.docids import canonicalize_relpath, document_id_for_relpath
+
+
+class TestCanonicalizeRelpath:
+    def test_absolute_paths_are_memoized(self, tmp_path):
+        docids._canonicalize_cached.cache_clear()
+        f = tmp_path / "sub" / "a.txt"
+
+        assert canonicalize_relpath(f, tmp_path) == "sub/a.txt"
+        assert canonicalize_relpath(str(f), str(tmp_path)) == "sub/a.txt"
+        assert docids._canonicalize_cached.cache_info().hits == 1
+
+    def test_relative_paths_follow_the_cwd(self, tmp_path, monkeypatch):
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        for d in ("one", "two"):
+            monkeypatch.chdir(tmp_path / d)
+            assert canonicalize_relpath("x.txt", tmp_path) == f"{d}/x.txt"
+
+    def test_outside_root_raises_every_time(self, tmp_path):
+        for _ in range(2):
+            with pytest.raises(ValueError, match="outside dropzone"):
+                canonicalize_relpath(tmp_path.parent / "x.txt", tmp_path)
+
+
+def test_document_id_is_uuid5_of_relpath():
+    assert document_id_for_relpath("a/b.txt") == uuid.uuid5(
+        docids.DEFAULT_NAMESPACE, "a/b.txt"
+    )
+
+
+def test_chunk_ids_for_matches_chunk_id_for():
+    doc = document_id_for_relpath("a/b.txt")
+
+    assert docids.chunk_ids_for(doc, 12) == [
+        docids.chunk_id_for(doc, i) for i in range(12)
+    ]
+    assert docids.chunk_ids_for(doc, 0) == []
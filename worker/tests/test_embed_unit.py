@@ -1,69 +1,92 @@
+import json
 import pytest
-from unittest.mock import patch, Mock
-import os
-import sys
-import requests
-from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Add the app directory to the path
-sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+# app.services.embed_ollama (and requests) are imported inside each test so that
+# collecting this module, or selecting other tests, doesn't pay for them.
+# patch("app.services.embed_ollama...") resolves its target only when the test runs.
 
-from services.embed_ollama import (
-    embed_texts,
-    _parse_embeddings,
-    _generate_dummy_embedding,
-)
+
+def _fake_resp(status=200, payload=None, raise_=None):
+    """Minimal stand-in for requests.Response: status, body bytes, raise_for_status."""
+
+    def _raise():
+        if raise_:
+            raise raise_
+
+    return SimpleNamespace(
+        status_code=status,
+        content=json.dumps(payload).encode(),
+        json=lambda: payload,
+        raise_for_status=_raise,
+    )
+
+
+@pytest.fixture
+def no_dev_mode(monkeypatch):
+    """Real (mocked-HTTP) embedding path: EMBED_DEV_MODE unset for this test."""
+    monkeypatch.delenv("EMBED_DEV_MODE", raising=False)
 
 
 class TestEmbedOllama:
-    def test_dev_mode_returns_correct_shape(self):
+    def test_dev_mode_returns_correct_shape(self, monkeypatch):
         """Test that dev mode returns vectors of correct shape and is deterministic."""
-        # Set dev mode
-        os.environ["EMBED_DEV_MODE"] = "1"
+        from app.services.embed_ollama import embed_texts
 
-        try:
-            texts = ["hello world", "test text"]
-            embeddings = embed_texts(texts, dim=768)
+        monkeypatch.setenv("EMBED_DEV_MODE", "1")
 
-            # Check shape
-            assert len(embeddings) == 2
-            assert len(embeddings[0]) == 768
-            assert len(embeddings[1]) == 768
+        texts = ["hello world", "test text"]
+        embeddings = embed_texts(texts, dim=768)
 
-            # Check deterministic (same input -> same vector)
-            embeddings2 = embed_texts(texts, dim=768)
-            assert embeddings == embeddings2
+        # Check shape
+        assert len(embeddings) == 2
+        assert len(embeddings[0]) == 768
+        assert len(embeddings[1]) == 768
 
-            # Check values are in [0, 1)
-            for emb in embeddings:
-                for val in emb:
-                    assert 0 <= val < 1
+        # Check deterministic (same input -> same vector)
+        embeddings2 = embed_texts(texts, dim=768)
+        assert embeddings == embeddings2
 
-        finally:
-            # Clean up
-            if "EMBED_DEV_MODE" in os.environ:
-                del os.environ["EMBED_DEV_MODE"]
+        # Check values are in [0, 1)
+        for emb in embeddings:
+            for val in emb:
+                assert 0 <= val < 1
 
-    def test_dev_mode_different_texts_different_vectors(self):
+    def test_dev_mode_different_texts_different_vectors(self, monkeypatch):
         """Test that different texts produce different vectors in dev mode."""
-        os.environ["EMBED_DEV_MODE"] = "1"
+        from app.services.embed_ollama import embed_texts
+
+        monkeypatch.setenv("EMBED_DEV_MODE", "1")
+
+        text1 = ["hello"]
+        text2 = ["world"]
 
-        try:
-            text1 = ["hello"]
-            text2 = ["world"]
+        emb1 = embed_texts(text1, dim=10)
+        emb2 = embed_texts(text2, dim=10)
 
-            emb1 = embed_texts(text1, dim=10)
-            emb2 = embed_texts(text2, dim=10)
+        # Different texts should produce different vectors
+        assert emb1 != emb2
 
-            # Different texts should produce different vectors
-            assert emb1 != emb2
+    def test_embed_texts_array_shape_and_dtype(self, monkeypatch):
+        """Test the ndarray variant packs vectors into one float32 matrix."""
+        from app.services.embed_ollama import embed_texts, embed_texts_array
 
-        finally:
-            if "EMBED_DEV_MODE" in os.environ:
-                del os.environ["EMBED_DEV_MODE"]
+        np = pytest.importorskip("numpy")
+        monkeypatch.setenv("EMBED_DEV_MODE", "1")
+
+        arr = embed_texts_array(["hello", "world"], dim=16)
+        assert arr.shape == (2, 16)
+        assert arr.dtype == np.float32
+        assert arr[0].tolist() == pytest.approx(embed_texts(["hello"], dim=16)[0])
+
+        empty = embed_texts_array([], dim=16)
+        assert empty.shape == (0, 16)
 
     def test_parse_embeddings_single_input(self):
         """Test parser accepts single-input shape."""
+        from app.services.embed_ollama import _parse_embeddings
+
         response = {"embedding": [0.1, 0.2, 0.3]}
         result = _parse_embeddings(response)
 
@@ -71,6 +94,8 @@ class TestEmbedOllama:
 
     def test_parse_embeddings_batch_input(self):
         """Test parser accepts batch shape."""
+        from app.services.embed_ollama import _parse_embeddings
+
         response = {
             "embeddings": [
                 {"embedding": [0.1, 0.2, 0.3]},
@@ -83,88 +108,74 @@ class TestEmbedOllama:
 
     def test_parse_embeddings_invalid_format(self):
         """Test parser accepts batch shape."""
+        from app.services.embed_ollama import _parse_embeddings
+
         response = {"data": [{"embedding": [0.1, 0.2]}]}
 
         with pytest.raises(ValueError, match="Unexpected Ollama response format"):
             _parse_embeddings(response)
 
-    @patch("requests.post")
-    def test_ollama_api_single_response(self, mock_post):
+    @patch("app.services.embed_ollama._SESSION.post")
+    def test_ollama_api_single_response(self, mock_post, no_dev_mode):
         """Test Ollama API call with single response format."""
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"embedding": [0.1, 0.2, 0.3]}
-        mock_post.return_value = mock_response
+        from app.services.embed_ollama import embed_texts
 
-        # Ensure dev mode is off
-        if "EMBED_DEV_MODE" in os.environ:
-            del os.environ["EMBED_DEV_MODE"]
+        mock_post.return_value = _fake_resp(200, {"embedding": [0.1, 0.2, 0.3]})
 
         result = embed_texts(["test"], dim=3)
 
         assert result == [[0.1, 0.2, 0.3]]
         mock_post.assert_called_once()
 
-    @patch("requests.post")
-    def test_ollama_api_batch_response(self, mock_post):
+    @patch("app.services.embed_ollama._SESSION.post")
+    def test_ollama_api_batch_response(self, mock_post, no_dev_mode):
         """Test Ollama API call with batch response format."""
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "embeddings": [
-                {"embedding": [0.1, 0.2, 0.3]},
-                {"embedding": [0.4, 0.5, 0.6]},
-            ]
-        }
-        mock_post.return_value = mock_response
-
-        # Ensure dev mode is off
-        if "EMBED_DEV_MODE" in os.environ:
-            del os.environ["EMBED_DEV_MODE"]
+        from app.services.embed_ollama import embed_texts
+
+        mock_post.return_value = _fake_resp(
+            200,
+            {
+                "embeddings": [
+                    {"embedding": [0.1, 0.2, 0.3]},
+                    {"embedding": [0.4, 0.5, 0.6]},
+                ]
+            },
+        )
 
         result = embed_texts(["test1", "test2"], dim=3)
 
         assert result == [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
         mock_post.assert_called_once()
 
-    @patch("requests.post")
-    def test_ollama_api_http_error(self, mock_post):
+    @patch("app.services.embed_ollama._SESSION.post")
+    def test_ollama_api_http_error(self, mock_post, no_dev_mode):
         """Test Ollama API call with HTTP error."""
-        # Mock HTTP error
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.raise_for_status.side_effect = requests.HTTPError(
-            "Internal Server Error"
-        )
-        mock_post.return_value = mock_response
+        import requests
+
+        from app.services.embed_ollama import embed_texts
 
-        # Ensure dev mode is off
-        if "EMBED_DEV_MODE" in os.environ:
-            del os.environ["EMBED_DEV_MODE"]
+        mock_post.return_value = _fake_resp(
+            500, raise_=requests.HTTPError("Internal Server Error")
+        )
 
         with pytest.raises(ValueError, match="Ollama API error"):
             embed_texts(["test"], dim=3)
 
-    @patch("requests.post")
-    def test_ollama_api_count_mismatch(self, mock_post):
+    @patch("app.services.embed_ollama._SESSION.post")
+    def test_ollama_api_count_mismatch(self, mock_post, no_dev_mode):
         """Test Ollama API call with count mismatch."""
-        # Mock response with wrong count
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"embedding": [0.1, 0.2, 0.3]}
-        mock_post.return_value = mock_response
+        from app.services.embed_ollama import embed_texts
 
-        # Ensure dev mode is off
-        if "EMBED_DEV_MODE" in os.environ:
-            del os.environ["EMBED_DEV_MODE"]
+        # One vector back for two inputs
+        mock_post.return_value = _fake_resp(200, {"embedding": [0.1, 0.2, 0.3]})
 
         with pytest.raises(ValueError, match="Embedding count mismatch"):
             embed_texts(["test1", "test2"], dim=3)
 
     def test_generate_dummy_embedding(self):
         """Test dummy embedding generation."""
+        from app.services.embed_ollama import _generate_dummy_embedding
+
         text = "hello world"
         dim = 10
 
@@ -176,3 +187,11 @@ class TestEmbedOllama:
         # Same text should produce same embedding
         result2 = _generate_dummy_embedding(text, dim)
         assert result == result2
+
+    def test_session_retries_post_on_gateway_errors(self):
+        """The embed POST is retried on 502/503/504, not only on connect errors."""
+        from app.services.embed_ollama import _SESSION
+
+        retries = _SESSION.get_adapter("http://ollama").max_retries
+        assert retries.is_retry("POST", 503)
+        assert not retries.is_retry("POST", 400)
@@ -0,0 +1,66 @@
+# worker/tests/test_media_cache_unit.py
+from app.services import media_cache
+from app.services.media_cache import content_cached, file_fingerprint
+
+settings = media_cache.settings
+
+
+def test_content_cached_hits_on_identical_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_CACHE_DIR", str(tmp_path / "cache"))
+    calls = []
+
+    @content_cached(model_key=lambda: "m1")
+    def describe(path):
+        calls.append(path)
+        return f"described {len(calls)}"
+
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+
+    assert describe(str(a)) == "described 1"
+    # Different name, same content -> served from cache
+    assert describe(str(b)) == "described 1"
+    assert len(calls) == 1
+
+    b.write_bytes(b"other bytes")
+    assert describe(str(b)) == "described 2"
+
+
+def test_content_cached_bypass_and_disabled(tmp_path, monkeypatch):
+    p = tmp_path / "a.bin"
+    p.write_bytes(b"x")
+    calls = []
+
+    @content_cached(model_key=lambda: "m1", bypass=lambda: True)
+    def bypassed(path):
+        calls.append(path)
+        return "out"
+
+    monkeypatch.setattr(settings, "MEDIA_CACHE_DIR", str(tmp_path / "cache"))
+    bypassed(str(p))
+    bypassed(str(p))
+    assert len(calls) == 2
+
+    monkeypatch.setattr(settings, "MEDIA_CACHE_DIR", "")
+
+    @content_cached(model_key=lambda: "m1")
+    def disabled(path):
+        calls.append(path)
+        return "out"
+
+    disabled(str(p))
+    disabled(str(p))
+    assert len(calls) == 4
+
+
+def test_file_fingerprint_large_file_uses_head_tail(tmp_path):
+    p = tmp_path / "big.bin"
+    p.write_bytes(b"a" * (3 << 20))
+    fp1 = file_fingerprint(p)
+    # Mutating the middle is invisible by design; the tail is not
+    with open(p, "r+b") as f:
+        f.seek(-1, 2)
+        f.write(b"b")
+    assert file_fingerprint(p) != fp1
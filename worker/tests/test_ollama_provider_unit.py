@@ -0,0 +1,82 @@
+"""Unit tests for the Ollama LLM provider (HTTP session is mocked)."""
+
+import itertools
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from worker.providers.llm import ollama
+
+
+def _streaming_response(pieces, status_code=200):
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    resp.status_code = status_code
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    resp.iter_lines.return_value = [json.dumps(p).encode() for p in pieces]
+    return resp
+
+
+class TestGenerate:
+    def test_joins_streamed_pieces_until_done(self, monkeypatch):
+        session = MagicMock()
+        session.post.return_value = _streaming_response(
+            [
+                {"response": " Hello", "done": False},
+                {"response": ", world", "done": False},
+                {"response": "", "done": True},
+                {"response": "ignored", "done": False},
+            ]
+        )
+        monkeypatch.setattr(ollama, "_SESSION", session)
+
+        assert ollama.generate("hi", host="http://h", model="m") == "Hello, world"
+        kwargs = session.post.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["json"]["stream"] is True
+        assert kwargs["json"]["options"]["num_ctx"] == ollama.settings.LLM_NUM_CTX
+
+    def test_stream_yields_pieces(self, monkeypatch):
+        session = MagicMock()
+        session.post.return_value = _streaming_response(
+            [{"response": "a"}, {"response": "b", "done": True}]
+        )
+        monkeypatch.setattr(ollama, "_SESSION", session)
+
+        assert list(ollama.generate_stream("hi", host="http://h")) == ["a", "b"]
+
+    def test_http_error_returns_empty_string(self, monkeypatch):
+        session = MagicMock()
+        session.post.return_value = _streaming_response([], status_code=500)
+        monkeypatch.setattr(ollama, "_SESSION", session)
+
+        assert ollama.generate("hi", host="http://h") == ""
+
+    def test_error_line_raises(self, monkeypatch):
+        session = MagicMock()
+        session.post.return_value = _streaming_response(
+            [{"response": "a"}, {"error": "model requires more system memory"}]
+        )
+        monkeypatch.setattr(ollama, "_SESSION", session)
+
+        with pytest.raises(RuntimeError, match="more system memory"):
+            list(ollama.generate_stream("hi", host="http://h"))
+        assert ollama.generate("hi", host="http://h") == ""
+
+    def test_overall_deadline_is_enforced(self, monkeypatch):
+        session = MagicMock()
+        session.post.return_value = _streaming_response(
+            [{"response": "x"} for _ in range(10)]
+        )
+        monkeypatch.setattr(ollama, "_SESSION", session)
+        # Each line arrives "1s" after the previous one: never a long gap
+        clock = itertools.count()
+        fake_time = SimpleNamespace(monotonic=lambda: next(clock))
+        monkeypatch.setattr(ollama, "time", fake_time)
+
+        with pytest.raises(requests.Timeout):
+            list(ollama.generate_stream("hi", host="http://h", timeout=3))
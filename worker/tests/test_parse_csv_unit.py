@@ -1,13 +1,79 @@
 import csv
+import io
+import pytest
 from app.services.parse_csv import extract_text_from_csv
 
 
-def test_extract_text_from_csv(tmp_path):
-    p = tmp_path / "s.csv"
-    with open(p, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["name", "age"])
-        w.writerow(["alice", "30"])
-    text = extract_text_from_csv(str(p))
+def test_extract_text_from_csv():
+    text = extract_text_from_csv(io.StringIO("name,age\nalice,30\n"))
     assert "name | age" in text
     assert "alice | 30" in text
+
+
+def test_extract_text_from_csv_rejects_unseekable_stream():
+    class Pipe(io.StringIO):
+        def seekable(self):
+            return False
+
+    with pytest.raises(ValueError, match="seekable"):
+        extract_text_from_csv(Pipe("a,b\n1,2\n"))
+
+
+def test_extract_text_from_csv_arrow_matches_stdlib(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from app.services import parse_csv
+
+    p = tmp_path / "wide.csv"
+    with open(p, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "price", "note"])
+        for i in range(50):
+            w.writerow([str(i), f"{i}.50", f"note {i}"])
+
+    expected = parse_csv.extract_text_from_csv(str(p), max_rows=10)
+    monkeypatch.setattr(parse_csv, "_ARROW_MIN_BYTES", 0)
+    assert parse_csv.extract_text_from_csv(str(p), max_rows=10) == expected
+    assert "3 | 3.50 | note 3" in expected
+
+
+def test_extract_text_from_csv_blank_lines_match_arrow(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from app.services import parse_csv
+
+    p = tmp_path / "gaps.csv"
+    p.write_text("a,b\n1,2\n\n3,4\n", encoding="utf-8")
+
+    expected = parse_csv.extract_text_from_csv(str(p), max_rows=2)
+    assert expected == "a | b\n1 | 2\n3 | 4"
+    monkeypatch.setattr(parse_csv, "_ARROW_MIN_BYTES", 0)
+    assert parse_csv.extract_text_from_csv(str(p), max_rows=2) == expected
+
+
+def test_parse_csv_rows_caps(tmp_path):
+    from app.services.parsers_csv import parse_csv
+
+    p = tmp_path / "r.csv"
+    with open(p, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([" a ", "b", "c"])
+        w.writerow([])
+        w.writerow(["x" * 30, "y"])
+    assert parse_csv(str(p), max_cols=2, max_len=10) == ["a | b", "x" * 10]
+
+
+def test_parse_csv_arrow_matches_stdlib(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from app.services import parsers_csv
+
+    p = tmp_path / "big.csv"
+    with open(p, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "name", "note", "extra"])
+        for i in range(40):
+            w.writerow([str(i), f"  n{i} ", "x" * (i % 7), "" if i % 3 else "q"])
+        w.writerow([" ", "", "", ""])
+
+    expected = parsers_csv.parse_csv(str(p), max_cols=3, max_len=12)
+    monkeypatch.setattr(parsers_csv, "_ARROW_MIN_BYTES", 0)
+    assert parsers_csv.parse_csv(str(p), max_cols=3, max_len=12) == expected
+    assert expected[1] == "0 | n0 | "
@@ -1,29 +1,33 @@
 # worker/tests/test_parse_docx_unit.py
 import pytest
 
-try:
-    from docx import Document  # type: ignore
+Document = pytest.importorskip(
+    "docx",
+    reason="python-docx not installed; install with 'pip install python-docx' to run this test",
+).Document
 
-    DOCX_AVAILABLE = True
-except Exception:
-    DOCX_AVAILABLE = False
+from app.services.parse_docx import extract_text_from_docx  # noqa: E402
 
-from app.services.parse_docx import extract_text_from_docx
 
-pytestmark = pytest.mark.skipif(
-    not DOCX_AVAILABLE,
-    reason="python-docx not installed; install with 'pip install python-docx' to run this test",
-)
+def test_extract_text_from_docx(sample_docx):
+    txt = extract_text_from_docx(sample_docx)
+    assert "Hello world" in txt
+    assert "A" in txt and "B" in txt
 
 
-def test_extract_text_from_docx(tmp_path):
-    p = tmp_path / "s.docx"
+def test_parse_docx_streams_body_paragraphs(tmp_path):
+    from app.services.parsers_docx import parse_docx
+
+    p = tmp_path / "p.docx"
     doc = Document()
-    doc.add_paragraph("Hello world")
-    row = doc.add_table(rows=1, cols=2).rows[0]
-    row.cells[0].text, row.cells[1].text = "A", "B"
+    doc.add_paragraph("First")
+    doc.add_paragraph("   ")
+    para = doc.add_paragraph("a\tb")
+    para.add_run("line").add_break()
+    para.add_run("next")
+    doc.add_table(rows=1, cols=1).rows[0].cells[0].text = "in table"
+    doc.add_paragraph("Last")
     doc.save(p)
 
-    txt = extract_text_from_docx(str(p))
-    assert "Hello world" in txt
-    assert "A" in txt and "B" in txt
+    expected = [q.text.strip() for q in Document(str(p)).paragraphs if q.text.strip()]
+    assert parse_docx(str(p)) == expected == ["First", "a\tbline\nnext", "Last"]
@@ -0,0 +1,34 @@
+from app.services import parsers_html
+from app.services.parsers_html import parse_html
+
+
+def test_parse_html_drops_scripts_and_blank_lines(tmp_path):
+    p = tmp_path / "s.html"
+    p.write_text(
+        "<html><head><title>Title</title><style>p{}</style>"
+        "<script>var a = 1;</script></head><body><p>Hello <b>world</b></p>"
+        "<noscript>enable js</noscript><div>  two\n  lines </div></body></html>",
+        encoding="utf-8",
+    )
+    assert parse_html(str(p)) == ["Title\nHello\nworld\ntwo\nlines"]
+
+
+def test_parse_html_empty(tmp_path):
+    p = tmp_path / "e.html"
+    p.write_text("<html><body><script>x()</script></body></html>", encoding="utf-8")
+    assert parse_html(str(p)) == []
+
+
+def test_parse_html_streaming_matches(tmp_path, monkeypatch):
+    p = tmp_path / "big.html"
+    p.write_text(
+        "<p>alpha &amp; beta</p><script>if (a < b) {}</script>"
+        "<div>gamma<!-- note -->delta</div>" * 20,
+        encoding="utf-8",
+    )
+    expected = parse_html(str(p))
+    # Force the chunked lxml path with tiny reads to cross token boundaries
+    monkeypatch.setattr(parsers_html, "_STREAM_MIN_BYTES", 0)
+    monkeypatch.setattr(parsers_html, "_READ_CHUNK", 7)
+    assert parse_html(str(p)) == expected
+    assert expected[0].startswith("alpha & beta\ngamma\ndelta")
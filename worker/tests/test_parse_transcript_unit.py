@@ -1,5 +1,7 @@
 """Unit tests for generic transcript detection and parsing."""
 
+import pytest
+
 from worker.app.services.parse_transcript import (
     detect_transcript,
     parse_transcript,
@@ -56,6 +58,82 @@ There's no assistant response, so it's not really a conversation."""
         assert is_transcript is True
         assert confidence >= DETECTION_THRESHOLD
 
+    def test_detect_transcript_no_colon_short_circuits(self):
+        """Text without any ':' can't match a role marker."""
+        text = "User said hello and the assistant replied politely.\n" * 50
+        assert detect_transcript(text, "chat.txt") == (False, 0.0)
+
+    def test_detect_transcript_cached_by_content(self, monkeypatch):
+        """Repeated detection of identical content reuses the cached result."""
+        from worker.app.services import parse_transcript as pt
+
+        calls = []
+        real = pt._detect_transcript_uncached
+
+        def counting(text, filename):
+            calls.append(filename)
+            return real(text, filename)
+
+        monkeypatch.setattr(pt, "_detect_transcript_uncached", counting)
+        text = "User: cache me please\nAssistant: sure thing, cached"
+        first = detect_transcript(text, "cache_test.txt")
+        assert detect_transcript(text, "cache_test.txt") == first
+        assert calls == ["cache_test.txt"]
+
+    def test_detect_transcript_scans_text_once(self, monkeypatch):
+        """Counts and roles for all detectors come from a single finditer pass."""
+        from worker.app.services import parse_transcript as pt
+
+        scans = []
+        real = pt._COMBINED_PATTERN
+
+        class CountingPattern:
+            def finditer(self, text):
+                scans.append(len(text))
+                return real.finditer(text)
+
+        monkeypatch.setattr(pt, "_COMBINED_PATTERN", CountingPattern())
+        text = "[2024-01-15 10:30] user: Hi\n**Assistant**: Hello\nUser: bye\n"
+        is_transcript, _ = pt._detect_transcript_uncached(text, "single_pass.txt")
+        assert is_transcript is True
+        assert len(scans) == 1
+
+    def test_detect_transcript_samples_large_input(self, monkeypatch):
+        """Past the sampling threshold the verdict matches a full scan."""
+        from worker.app.services import parse_transcript as pt
+
+        text = "User: how are you doing?\nAssistant: fine, thanks.\n" * 400
+        full = pt._detect_transcript_uncached(text, "big.txt")
+
+        monkeypatch.setattr(pt, "_SAMPLE_MIN_CHARS", 2000)
+        monkeypatch.setattr(pt, "_SAMPLE_HEAD", 500)
+        monkeypatch.setattr(pt, "_SAMPLE_MIDDLE", 300)
+        monkeypatch.setattr(pt, "_SAMPLE_TAIL", 500)
+        sample = pt._sample_text(text)
+        assert len(sample) < 1300
+        assert sample.startswith("User:") and sample.endswith("thanks.\n")
+        assert pt._detect_transcript_uncached(text, "big.txt") == full
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "User: hi\nAssistant: hello\nUser: bye",
+            "[2024-01-15 10:30] user: hi\n[2024-01-15 10:31] assistant: hello",
+            "**User**: hi\n**Assistant**: hello\n**User**: bye",
+        ],
+        ids=["prefix", "timestamped", "markdown"],
+    )
+    def test_no_regex_compiled_per_call(self, text, monkeypatch):
+        """Detection and parsing only use the patterns compiled at import."""
+        from worker.app.services import parse_transcript as pt
+
+        # Any call-time re/re2 use (compile, search, split...) now raises
+        monkeypatch.setattr(pt, "_re", None)
+        monkeypatch.setattr(pt, "re", None)
+
+        assert pt._detect_transcript_uncached(text, "chat.txt")[0] is True
+        assert pt.parse_transcript(text, "chat.txt")
+
 
 class TestParseTranscript:
     """Test transcript parsing logic."""
@@ -0,0 +1,44 @@
+"""Networked /process smoke tests: need a live Qdrant + embedder (SERVICES_UP=1)."""
+
+import os
+
+import pytest
+
+# Skip the whole module before anything below is imported or collected
+if os.getenv("SERVICES_UP") != "1":
+    pytest.skip(
+        "SERVICES_UP not set to 1 - skipping networked tests",
+        allow_module_level=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+class TestProcessTextIntegration:
+    """Integration tests that require external services."""
+
+    def test_process_text_endpoint_smoke(self, client):
+        """Smoke test for /process/text endpoint."""
+        request_data = {
+            "document_id": "00000000-0000-0000-0000-000000000000",
+            "text": "Hello world, this is a test document for the jsonify2ai pipeline.",
+        }
+
+        response = client.post("/process/text", json=request_data)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["ok"] is True
+        assert data["document_id"] == request_data["document_id"]
+        assert data["chunks"] > 0
+        assert data["embedded"] > 0
+        assert data["upserted"] > 0
+        assert data["collection"] == "jsonify2ai_chunks"
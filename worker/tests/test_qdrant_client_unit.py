@@ -0,0 +1,939 @@
+"""Unit tests for the qdrant_client wrapper (client calls are mocked)."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from worker.app.config import settings
+from worker.app.services import qdrant_client as qc_mod
+
+
+def _items(n, dim=None):
+    dim = dim or settings.EMBEDDING_DIM
+    return [(i, [0.1] * dim, {"text": f"chunk {i}"}) for i in range(n)]
+
+
+def _client_with_collection(dim=None):
+    dim = dim or settings.EMBEDDING_DIM
+    client = Mock()
+    vectors = SimpleNamespace(size=dim, distance="Cosine")
+    client.get_collection.return_value = SimpleNamespace(
+        config=SimpleNamespace(params=SimpleNamespace(vectors=vectors))
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    qc_mod._SCHEMA_CACHE.clear()
+    qc_mod.clear_search_cache()
+    yield
+    qc_mod._SCHEMA_CACHE.clear()
+    qc_mod.clear_search_cache()
+
+
+class TestUpsertPoints:
+    def test_small_input_uses_batched_upsert(self):
+        client = Mock()
+        items = _items(5) + [(99, [0.1] * 3, {"text": "bad dim"})]
+
+        n = qc_mod.upsert_points(
+            items, collection_name="c", client=client, batch_size=2, ensure=False
+        )
+
+        assert n == 5
+        assert client.upsert.call_count == 3
+        client.upload_collection.assert_not_called()
+        batch = client.upsert.call_args_list[0].kwargs["points"]
+        assert isinstance(batch, qc_mod.models.Batch)
+        assert batch.ids == [0, 1]
+        assert batch.payloads[0] == {"content": "chunk 0"}
+
+    def test_one_debug_record_per_batch(self, caplog):
+        caplog.set_level("DEBUG", logger=qc_mod.log.name)
+        client = Mock()
+
+        qc_mod.upsert_points(
+            _items(5), collection_name="c", client=client, batch_size=2, ensure=False
+        )
+
+        assert [r.getMessage() for r in caplog.records] == [
+            "upserted 2 pts to c (first_id=0)",
+            "upserted 2 pts to c (first_id=2)",
+            "upserted 1 pts to c (first_id=4)",
+        ]
+
+    def test_only_final_batch_waits(self, monkeypatch):
+        monkeypatch.setattr(qc_mod, "_STREAM_WINDOW", 4)
+        client = Mock()
+
+        qc_mod.upsert_points(
+            iter(_items(7)),
+            collection_name="c",
+            client=client,
+            batch_size=2,
+            ensure=False,
+        )
+
+        waits = [c.kwargs["wait"] for c in client.upsert.call_args_list]
+        assert waits == [False, False, False, True]
+
+    def test_wait_false_never_blocks(self):
+        client = Mock()
+
+        qc_mod.upsert_points(
+            _items(3),
+            collection_name="c",
+            client=client,
+            batch_size=2,
+            ensure=False,
+            wait=False,
+        )
+
+        assert not any(c.kwargs["wait"] for c in client.upsert.call_args_list)
+
+    def test_valid_batch_skips_per_point_checks(self, caplog):
+        client = Mock()
+        n = qc_mod.upsert_points(
+            _items(3), collection_name="c", client=client, ensure=False
+        )
+        assert n == 3
+        assert not caplog.records
+
+    def test_ragged_batch_falls_back_to_per_point_checks(self, caplog):
+        client = Mock()
+        items = _items(2) + [(7, None, {}), (8, [0.1], {})]
+        n = qc_mod.upsert_points(
+            items, collection_name="c", client=client, ensure=False
+        )
+        assert n == 2
+        out = caplog.text
+        assert "id=7 due to embedding type" in out
+        assert "id=8 due to wrong embedding dimension" in out
+
+    def test_non_list_rows_never_take_the_fast_path(self, caplog):
+        dim = settings.EMBEDDING_DIM
+        items = _items(1) + [
+            (1, tuple([0.1] * dim), {}),
+            (2, np.full(dim, 0.1), {}),
+        ]
+
+        ids, vectors, _, skipped = qc_mod._valid_columns(items, dim)
+
+        assert ids == [0]
+        assert skipped == 2
+        assert all(type(v) is list for v in vectors)
+        assert "id=1 due to embedding type: got tuple" in caplog.text
+
+    def test_bulk_upload_passes_float32_array_on_grpc(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_MIN_POINTS", 4)
+        monkeypatch.setattr(settings, "QDRANT_PREFER_GRPC", 1)
+        client = Mock()
+
+        qc_mod.upsert_points(
+            _items(4), collection_name="c", client=client, ensure=False, wait=False
+        )
+
+        vectors = client.upload_collection.call_args.kwargs["vectors"]
+        assert isinstance(vectors, np.ndarray)
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (4, settings.EMBEDDING_DIM)
+
+    def test_bulk_upload_keeps_lists_on_rest(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_MIN_POINTS", 4)
+        monkeypatch.setattr(settings, "QDRANT_PREFER_GRPC", 0)
+        client = Mock()
+
+        qc_mod.upsert_points(
+            _items(4), collection_name="c", client=client, ensure=False, wait=False
+        )
+
+        assert isinstance(client.upload_collection.call_args.kwargs["vectors"], list)
+
+    def test_generator_input_streams_in_windows(self, monkeypatch):
+        monkeypatch.setattr(qc_mod, "_STREAM_WINDOW", 4)
+        client = Mock()
+
+        n = qc_mod.upsert_points(
+            (item for item in _items(10)),
+            collection_name="c",
+            client=client,
+            batch_size=3,
+            ensure=False,
+        )
+
+        assert n == 10
+        sizes = [len(c.kwargs["points"].ids) for c in client.upsert.call_args_list]
+        assert sizes == [3, 1, 3, 1, 2]
+        assert qc_mod.upsert_points(iter([]), client=client, ensure=False) == 0
+
+    def test_large_input_uses_upload_collection(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_MIN_POINTS", 4)
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_PARALLEL", 2)
+        client = Mock()
+
+        n = qc_mod.upsert_points(
+            _items(6), collection_name="c", client=client, ensure=False, wait=False
+        )
+
+        assert n == 6
+        client.upsert.assert_not_called()
+        kwargs = client.upload_collection.call_args.kwargs
+        assert kwargs["ids"] == list(range(6))
+        # No worker processes outside bulk loads (request handlers)
+        assert kwargs["parallel"] == 1
+        assert kwargs["wait"] is False
+        assert kwargs["payload"][0] == {"content": "chunk 0"}
+
+    def test_bulk_upload_path_uses_worker_processes(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_MIN_POINTS", 4)
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_PARALLEL", 2)
+        client = Mock()
+
+        qc_mod.upsert_points(
+            _items(6),
+            collection_name="c",
+            client=client,
+            ensure=False,
+            bulk=True,
+            wait=False,
+        )
+
+        assert client.upload_collection.call_args.kwargs["parallel"] == 2
+
+    def test_upload_path_waits_on_the_last_batch(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_UPLOAD_MIN_POINTS", 4)
+        client = Mock()
+
+        n = qc_mod.upsert_points(
+            _items(6), collection_name="c", client=client, batch_size=4, ensure=False
+        )
+
+        assert n == 6
+        assert client.upload_collection.call_args.kwargs["ids"] == [0, 1]
+        assert client.upload_collection.call_args.kwargs["wait"] is False
+        # The held-back tail is the barrier, sent after the upload
+        names = [c[0] for c in client.method_calls]
+        assert names == ["upload_collection", "upsert"]
+        assert client.upsert.call_args.kwargs["wait"] is True
+        assert client.upsert.call_args.kwargs["points"].ids == [2, 3, 4, 5]
+
+    def test_bulk_pauses_and_restores_indexing(self):
+        client = Mock()
+        client.get_collection.return_value.config.optimizer_config.indexing_threshold = 5000
+
+        qc_mod.upsert_points(
+            _items(2), collection_name="c", client=client, ensure=False, bulk=True
+        )
+
+        names = [c[0] for c in client.method_calls]
+        assert names.index("update_collection") < names.index("upsert")
+        thresholds = [
+            c.kwargs["optimizer_config"].indexing_threshold
+            for c in client.update_collection.call_args_list
+        ]
+        assert thresholds == [0, 5000]
+
+    def test_async_upsert_sends_batches_concurrently(self):
+        import asyncio
+
+        client = AsyncMock()
+        items = _items(5) + [(99, [0.1], {})]
+
+        n = asyncio.run(
+            qc_mod.upsert_points_async(
+                items, collection_name="c", client=client, batch_size=2
+            )
+        )
+
+        assert n == 5
+        assert client.upsert.await_count == 3
+        assert all(c.kwargs["wait"] is False for c in client.upsert.await_args_list)
+        client.close.assert_not_called()
+
+    def test_sync_wrapper_runs_async_path(self):
+        client = AsyncMock()
+
+        n = qc_mod.upsert_points_concurrent(
+            _items(3), collection_name="c", client=client, batch_size=2
+        )
+
+        assert n == 3
+        assert client.upsert.await_count == 2
+
+
+class TestBulkUpload:
+    def test_small_columns_still_use_parallel_uploader(self):
+        client = Mock()
+        ids, vectors, payloads = (list(c) for c in zip(*_items(3)))
+        vectors.append([0.1] * 3)
+        ids.append(99)
+        payloads.append({})
+
+        n = qc_mod.bulk_upload(
+            ids,
+            vectors,
+            payloads,
+            collection_name="c",
+            client=client,
+            parallel=2,
+            ensure=False,
+        )
+
+        assert n == 3
+        client.upsert.assert_not_called()
+        kwargs = client.upload_collection.call_args.kwargs
+        assert kwargs["ids"] == [0, 1, 2]
+        assert kwargs["parallel"] == 2
+        assert kwargs["batch_size"] == 256
+
+    def test_ndarray_vectors_checked_by_shape(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_PREFER_GRPC", 0)
+        client = Mock()
+        vectors = np.full((2, settings.EMBEDDING_DIM), 0.5, dtype=np.float32)
+
+        n = qc_mod.bulk_upload(
+            [1, 2], vectors, [{}, {}], collection_name="c", client=client, ensure=False
+        )
+
+        assert n == 2
+        sent = client.upload_collection.call_args.kwargs["vectors"]
+        assert isinstance(sent, list) and sent[0][0] == 0.5
+
+    def test_ndarray_wrong_dim_uploads_nothing(self):
+        client = Mock()
+
+        n = qc_mod.bulk_upload(
+            [1],
+            np.zeros((1, 3)),
+            [{}],
+            collection_name="c",
+            client=client,
+            ensure=False,
+        )
+
+        assert n == 0
+        client.upload_collection.assert_not_called()
+
+    def test_mismatched_columns_raise(self):
+        with pytest.raises(ValueError):
+            qc_mod.bulk_upload([1, 2], [[0.1]], [{}, {}], client=Mock(), ensure=False)
+
+
+class TestEnsureCollectionCache:
+    def test_second_ensure_skips_round_trips(self):
+        client = _client_with_collection()
+        qc_mod.invalidate_ensure_cache("cached_col")
+
+        qc_mod.ensure_collection(client, "cached_col", settings.EMBEDDING_DIM)
+        calls = len(client.mock_calls)
+        qc_mod.ensure_collection(client, "cached_col", settings.EMBEDDING_DIM)
+
+        assert len(client.mock_calls) == calls
+        client.create_collection.assert_not_called()
+
+    def test_cache_is_per_client(self, monkeypatch):
+        qc_mod.invalidate_ensure_cache("shared_col")
+        shared, other = _client_with_collection(), _client_with_collection()
+        monkeypatch.setattr(qc_mod, "_CLIENT", shared)
+
+        qc_mod.ensure_collection(shared, "shared_col", settings.EMBEDDING_DIM)
+        qc_mod.ensure_collection(other, "shared_col", settings.EMBEDDING_DIM)
+
+        # Same name via another client (maybe another server) is verified there
+        for client in (shared, other):
+            client.get_collection.assert_called()
+            client.create_payload_index.assert_called()
+        assert (
+            settings.QDRANT_URL.rstrip("/"),
+            "shared_col",
+            settings.EMBEDDING_DIM,
+            "Cosine",
+            bool(settings.QDRANT_QUANTIZATION),
+        ) in qc_mod._ENSURED
+
+    def test_invalidate_forces_recheck(self):
+        client = _client_with_collection()
+        qc_mod.ensure_collection(client, "stale_col", settings.EMBEDDING_DIM)
+        client.reset_mock()
+
+        qc_mod.invalidate_ensure_cache("stale_col")
+        qc_mod.ensure_collection(client, "stale_col", settings.EMBEDDING_DIM)
+
+        client.get_collection.assert_called()
+        client.create_payload_index.assert_called()
+
+    def test_rejected_upsert_drops_cached_ensure(self):
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        client = _client_with_collection()
+        qc_mod.invalidate_ensure_cache("dropped_col")
+        qc_mod.ensure_collection(client, "dropped_col", settings.EMBEDDING_DIM)
+        client.upsert.side_effect = UnexpectedResponse(404, "Not Found", b"{}", {})
+
+        qc_mod.upsert_points(_items(1), collection_name="dropped_col", client=client)
+
+        assert not any(k[1] == "dropped_col" for k in qc_mod._ENSURED)
+
+    def test_quantized_collection_created_with_int8(self):
+        client = Mock()
+        client.get_collection.side_effect = RuntimeError("Collection does not exist")
+        qc_mod.invalidate_ensure_cache("quant_col")
+
+        qc_mod.ensure_collection(
+            client,
+            "quant_col",
+            settings.EMBEDDING_DIM,
+            quantization=True,
+            create_payload_indexes=False,
+        )
+
+        kwargs = client.create_collection.call_args.kwargs
+        scalar = kwargs["quantization_config"].scalar
+        assert scalar.type == qc_mod.models.ScalarType.INT8
+        assert kwargs["vectors_config"].on_disk is True
+
+    def test_create_returns_requested_config_without_reread(self):
+        client = Mock()
+        client.get_collection.side_effect = RuntimeError("Collection does not exist")
+        qc_mod.invalidate_ensure_cache("fresh_col")
+
+        cfg = qc_mod.ensure_collection(
+            client, "fresh_col", 8, create_payload_indexes=False
+        )
+
+        assert cfg["params"]["vectors"]["size"] == 8
+        client.create_collection.assert_called_once()
+        assert client.get_collection.call_count == 1
+
+    def test_existing_unquantized_collection_kept_without_recreate_bad(self):
+        client = _client_with_collection()
+        client.get_collection.return_value.config.quantization_config = None
+        qc_mod.invalidate_ensure_cache("plain_col")
+
+        qc_mod.ensure_collection(
+            client,
+            "plain_col",
+            settings.EMBEDDING_DIM,
+            quantization=True,
+            recreate_bad=False,
+            create_payload_indexes=False,
+        )
+
+        client.delete_collection.assert_not_called()
+        client.create_collection.assert_not_called()
+
+    def test_payload_indexes_only_for_missing_fields(self):
+        client = Mock()
+        client.get_collection.return_value.payload_schema = {"content": {}, "kind": {}}
+
+        qc_mod._ensure_payload_indexes(client, "idx_col")
+
+        fields = {
+            c.kwargs["field_name"] for c in client.create_payload_index.call_args_list
+        }
+        assert fields == {name for name, _ in qc_mod._PAYLOAD_INDEX_FIELDS} - {"kind"}
+
+    def test_timestamp_indexes_are_range_only(self):
+        client = _client_with_collection()
+        client.get_collection.return_value.payload_schema = {}
+
+        qc_mod._ensure_payload_indexes(client, "ts_col")
+
+        schemas = {
+            c.kwargs["field_name"]: c.kwargs["field_schema"]
+            for c in client.create_payload_index.call_args_list
+        }
+        for field in ("meta.ingested_at_ts", "meta.created_at_ts"):
+            assert schemas[field].range is True
+            assert schemas[field].lookup is False
+
+    def test_schema_mismatch_raises_without_recreate_bad(self):
+        client = _client_with_collection(dim=3)
+        qc_mod.invalidate_ensure_cache("mismatch_col")
+
+        with pytest.raises(RuntimeError, match="schema mismatch"):
+            qc_mod.ensure_collection(
+                client, "mismatch_col", settings.EMBEDDING_DIM, recreate_bad=False
+            )
+        client.delete_collection.assert_not_called()
+        client.create_collection.assert_not_called()
+
+    def test_schema_mismatch_recreates_with_recreate_bad(self):
+        client = _client_with_collection(dim=3)
+        qc_mod.invalidate_ensure_cache("mismatch_col")
+
+        qc_mod.ensure_collection(
+            client,
+            "mismatch_col",
+            settings.EMBEDDING_DIM,
+            recreate_bad=True,
+            create_payload_indexes=False,
+        )
+        client.delete_collection.assert_called_once_with(collection_name="mismatch_col")
+        size = client.create_collection.call_args.kwargs["vectors_config"].size
+        assert size == settings.EMBEDDING_DIM
+
+
+class TestUpsertErrorReport:
+    def test_details_skipped_when_error_logging_disabled(self, monkeypatch):
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        class Untouchable:
+            def __getattr__(self, name):
+                raise AssertionError(f"inspected batch.{name}")
+
+        err = Mock(spec=UnexpectedResponse)
+        monkeypatch.setattr(qc_mod.log, "isEnabledFor", lambda level: False)
+        monkeypatch.setattr(qc_mod.log, "error", Mock())
+
+        qc_mod._report_upsert_error(err, Untouchable())
+
+        qc_mod.log.error.assert_not_called()
+
+    def test_rejected_batch_summarized(self, caplog):
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        err = UnexpectedResponse(400, "Bad Request", b"{}", {})
+        batch = qc_mod._points_batch(["a", "b"], [[0.1] * 3] * 2, [{"x": 1}] * 2)
+
+        qc_mod._report_upsert_error(err, batch)
+
+        assert "points=2" in caplog.text
+        assert "'vector_len': 3" in caplog.text
+        assert "'payload_keys': ['x']" in caplog.text
+
+    def test_failure_logged_at_error(self, caplog):
+        qc_mod._report_upsert_error(
+            RuntimeError("boom"), qc_mod._points_batch([], [], [])
+        )
+
+        assert caplog.records[0].levelname == "ERROR"
+        assert "upsert failed: boom" in caplog.text
+
+
+class TestReplaceDocument:
+    def test_delete_and_upsert_share_one_request(self):
+        client = Mock()
+
+        n = qc_mod.replace_document(
+            "doc-1", _items(3), collection_name="c", client=client
+        )
+
+        assert n == 3
+        client.batch_update_points.assert_called_once()
+        client.delete.assert_not_called()
+        client.upsert.assert_not_called()
+        delete_op, upsert_op = client.batch_update_points.call_args.kwargs[
+            "update_operations"
+        ]
+        assert delete_op.delete.filter.must[0].match.value == "doc-1"
+        assert upsert_op.upsert.batch.ids == [0, 1, 2]
+
+    def test_overflow_batches_are_upserted_after(self):
+        client = Mock()
+
+        n = qc_mod.replace_document(
+            "doc-1", _items(5), collection_name="c", client=client, batch_size=2
+        )
+
+        assert n == 5
+        assert client.upsert.call_count == 2
+
+    def test_tail_batch_is_the_barrier(self):
+        client = Mock()
+
+        qc_mod.replace_document(
+            "doc-1", _items(3), collection_name="c", client=client, batch_size=2
+        )
+
+        assert client.batch_update_points.call_args.kwargs["wait"] is False
+        assert client.upsert.call_args.kwargs["wait"] is True
+
+    def test_search_cache_cleared_after_the_writes(self, monkeypatch):
+        calls = Mock()
+        monkeypatch.setattr(qc_mod, "clear_search_cache", calls.clear_search_cache)
+
+        qc_mod.replace_document(
+            "doc-1", _items(3), collection_name="c", client=calls.client, batch_size=2
+        )
+        qc_mod.delete_by_document_id("doc-1", collection_name="c", client=calls.client)
+
+        names = [c[0] for c in calls.mock_calls]
+        assert names == [
+            "client.batch_update_points",
+            "client.upsert",
+            "clear_search_cache",
+            "client.delete",
+            "clear_search_cache",
+        ]
+
+    def test_no_items_only_deletes(self):
+        client = Mock()
+
+        assert (
+            qc_mod.replace_document("doc-1", [], collection_name="c", client=client)
+            == 0
+        )
+        (op,) = client.batch_update_points.call_args.kwargs["update_operations"]
+        assert isinstance(op, qc_mod.models.DeleteOperation)
+
+
+class TestCollectionExists:
+    def test_uses_direct_lookup(self):
+        client = Mock()
+        client.collection_exists.return_value = True
+
+        assert qc_mod._collection_exists(client, "c") is True
+        client.get_collections.assert_not_called()
+
+    def test_falls_back_to_listing_on_old_clients(self):
+        client = Mock(spec=["get_collections"])
+        client.get_collections.return_value = SimpleNamespace(
+            collections=[SimpleNamespace(name="a"), SimpleNamespace(name="c")]
+        )
+
+        assert qc_mod._collection_exists(client, "c") is True
+        assert qc_mod._collection_exists(client, "zzz") is False
+
+
+class TestBuildFilter:
+    def test_single_field_filter_is_interned(self):
+        a = qc_mod.build_filter(kind="text")
+        assert a is qc_mod.build_filter(kind="text")
+        assert a.must[0].key == "kind" and a.must[0].match.value == "text"
+
+    def test_multi_field_filter_is_fresh(self):
+        extra = [qc_mod._match_condition("idx", "1")]
+        a = qc_mod.build_filter(kind="text", path="a.md", extra_must=extra)
+        assert [c.key for c in a.must] == ["kind", "path", "idx"]
+        assert a is not qc_mod.build_filter(kind="text", path="a.md", extra_must=extra)
+        assert qc_mod.build_filter() is None
+
+
+class TestSearchBatch:
+    def test_one_round_trip_for_all_queries(self):
+        client = _client_with_collection()
+        hit = SimpleNamespace(payload={"content": "x", "secret": 1})
+        client.query_batch_points.return_value = [
+            SimpleNamespace(points=[hit]),
+            SimpleNamespace(points=[]),
+        ]
+        vec = [0.0] * settings.EMBEDDING_DIM
+
+        out = qc_mod.search_batch([vec, vec], k=3, collection_name="c", client=client)
+
+        assert client.query_batch_points.call_count == 1
+        reqs = client.query_batch_points.call_args.kwargs["requests"]
+        assert [r.limit for r in reqs] == [3, 3]
+        assert out == [[hit], []]
+        assert hit.payload == {"content": "x"}
+
+    def test_large_batch_split_into_concurrent_chunks(self):
+        client = _client_with_collection()
+        client.query_batch_points.side_effect = lambda collection_name, requests: [
+            SimpleNamespace(points=[SimpleNamespace(payload=None, id=r.query[0])])
+            for r in requests
+        ]
+        vecs = [[float(i)] * settings.EMBEDDING_DIM for i in range(70)]
+
+        out = qc_mod.search_batch(vecs, collection_name="c", client=client)
+
+        sizes = [
+            len(c.kwargs["requests"]) for c in client.query_batch_points.call_args_list
+        ]
+        assert sorted(sizes) == [6, 32, 32]
+        assert [hits[0].id for hits in out] == [float(i) for i in range(70)]
+
+    def test_parallelism_one_keeps_single_request(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_CLIENT_SEARCH_PARALLELISM", 1)
+        client = _client_with_collection()
+        client.query_batch_points.return_value = []
+        vecs = [[0.0] * settings.EMBEDDING_DIM] * 70
+
+        qc_mod.search_batch(vecs, collection_name="c", client=client)
+
+        assert client.query_batch_points.call_count == 1
+
+    def test_accepts_ndarray_queries(self):
+        client = _client_with_collection()
+        client.query_batch_points.return_value = [SimpleNamespace(points=[])] * 2
+        vecs = np.zeros((2, settings.EMBEDDING_DIM), dtype=np.float32)
+
+        assert qc_mod.search_batch(vecs, collection_name="c", client=client) == [[], []]
+        reqs = client.query_batch_points.call_args.kwargs["requests"]
+        assert all(isinstance(r.query, list) for r in reqs)
+
+    def test_rejects_wrong_dimension_before_calling_qdrant(self):
+        client = _client_with_collection()
+        with pytest.raises(RuntimeError, match="Query vector 1"):
+            qc_mod.search_batch(
+                [[0.0] * settings.EMBEDDING_DIM, [0.0]],
+                collection_name="c",
+                client=client,
+            )
+        client.query_batch_points.assert_not_called()
+
+
+class TestSearchVectorInput:
+    def test_ndarray_forwarded_without_conversion(self):
+        client = _client_with_collection()
+        client.search.return_value = []
+        vec = np.zeros(settings.EMBEDDING_DIM, dtype=np.float32)
+
+        qc_mod.search(vec, collection_name="c", client=client)
+
+        assert client.search.call_args.kwargs["query_vector"] is vec
+
+    @pytest.mark.parametrize(
+        "vec",
+        [
+            np.zeros((1, settings.EMBEDDING_DIM), dtype=np.float32),
+            np.zeros(3),
+            [0.0] * 3,
+            (0.0,) * settings.EMBEDDING_DIM,
+        ],
+    )
+    def test_bad_shapes_rejected(self, vec):
+        client = _client_with_collection()
+        with pytest.raises(RuntimeError, match="dimension mismatch"):
+            qc_mod.search(vec, collection_name="c", client=client)
+        client.search.assert_not_called()
+
+
+class TestSearchParams:
+    def test_server_defaults_when_nothing_set(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_HNSW_EF", 0)
+        client = _client_with_collection()
+        client.search.return_value = []
+
+        qc_mod.search(
+            [0.0] * settings.EMBEDDING_DIM, collection_name="c", client=client
+        )
+
+        assert client.search.call_args.kwargs["search_params"] is None
+
+    def test_settings_ef_and_indexed_only_forwarded(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_HNSW_EF", 64)
+        client = _client_with_collection()
+        client.search.return_value = []
+
+        qc_mod.search(
+            [0.0] * settings.EMBEDDING_DIM,
+            collection_name="c",
+            client=client,
+            indexed_only=True,
+        )
+
+        params = client.search.call_args.kwargs["search_params"]
+        assert params.hnsw_ef == 64
+        assert params.indexed_only is True
+        assert params.exact is False
+
+
+class TestSearchCache:
+    @pytest.fixture(autouse=True)
+    def _cache_on(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_SEARCH_CACHE_TTL", 30)
+
+    def _search(self, client, vec=None, **kw):
+        vec = vec or [0.0] * settings.EMBEDDING_DIM
+        return qc_mod.search(vec, collection_name="c", client=client, **kw)
+
+    def test_repeat_query_served_from_cache(self):
+        client = _client_with_collection()
+        hit = SimpleNamespace(payload={"content": "x"})
+        client.search.return_value = [hit]
+
+        assert self._search(client) == [hit]
+        assert self._search(client) == [hit]
+
+        assert client.search.call_count == 1
+        assert client.get_collection.call_count == 1
+
+    def test_different_vector_or_k_misses(self):
+        client = _client_with_collection()
+        client.search.return_value = []
+
+        self._search(client)
+        self._search(client, k=7)
+        self._search(client, vec=[1.0] * settings.EMBEDDING_DIM)
+
+        assert client.search.call_count == 3
+
+    def test_writes_invalidate_collection(self):
+        client = _client_with_collection()
+        client.search.return_value = []
+
+        self._search(client)
+        qc_mod.upsert_points(
+            _items(1), collection_name="c", client=client, ensure=False
+        )
+        self._search(client)
+        qc_mod.delete_by_document_id("d", collection_name="c", client=client)
+        self._search(client)
+
+        assert client.search.call_count == 3
+
+    def test_expired_and_disabled(self, monkeypatch):
+        client = _client_with_collection()
+        client.search.return_value = []
+        monkeypatch.setattr(settings, "QDRANT_SEARCH_CACHE_TTL", 0)
+
+        self._search(client)
+        self._search(client)
+
+        assert client.search.call_count == 2
+        assert not qc_mod._SEARCH_CACHE
+
+
+class TestSearchDebug:
+    def test_debug_prints_server_body_verbatim(self, monkeypatch, capsys):
+        body = '{"result":{"points_count":3,"indexed_vectors_count":2,"name":"café"}}'
+        http = Mock()
+        http.get.return_value = SimpleNamespace(
+            status_code=200, text=body, content=body.encode()
+        )
+        monkeypatch.setattr(qc_mod, "_HTTP", http)
+        client = _client_with_collection()
+        client.search.return_value = []
+
+        client.count.return_value = SimpleNamespace(count=3)
+
+        qc_mod.search(
+            [0.0] * settings.EMBEDDING_DIM,
+            collection_name="c",
+            client=client,
+            debug="verbose",
+        )
+
+        out = capsys.readouterr().out.splitlines()
+        assert "approx_count=3" in out[0]
+        assert out[1] == body
+        assert "raw_points_count=3 indexed_vectors_count=2" in out[2]
+
+    def test_plain_debug_uses_approx_count_without_http(self, monkeypatch, capsys):
+        http = Mock()
+        monkeypatch.setattr(qc_mod, "_HTTP", http)
+        client = _client_with_collection()
+        client.search.return_value = []
+        client.count.return_value = SimpleNamespace(count=7)
+
+        qc_mod.search(
+            [0.0] * settings.EMBEDDING_DIM,
+            collection_name="c",
+            client=client,
+            debug=True,
+        )
+
+        client.count.assert_called_once_with(collection_name="c", exact=False)
+        http.get.assert_not_called()
+        assert "approx_count=7" in capsys.readouterr().out
+
+
+class TestQuantizedSearchParams:
+    def test_oversampling_and_rescore_when_quantized(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", 1)
+        monkeypatch.setattr(settings, "QDRANT_QUANTIZATION_OVERSAMPLING", 3.0)
+        monkeypatch.setattr(settings, "QDRANT_HNSW_EF", 0)
+
+        params = qc_mod._search_params(None, False, False)
+
+        assert params.quantization.rescore is True
+        assert params.quantization.oversampling == 3.0
+
+    def test_unquantized_leaves_server_defaults(self, monkeypatch):
+        monkeypatch.setattr(settings, "QDRANT_QUANTIZATION", 0)
+        monkeypatch.setattr(settings, "QDRANT_HNSW_EF", 0)
+
+        assert qc_mod._search_params(None, False, False) is None
+
+
+class TestSchemaCache:
+    def test_schema_fetched_once_within_ttl(self):
+        client = _client_with_collection()
+        client.query_batch_points.return_value = [SimpleNamespace(points=[])]
+        vec = [0.0] * settings.EMBEDDING_DIM
+
+        for _ in range(3):
+            qc_mod.search_batch([vec], collection_name="c", client=client)
+
+        assert client.get_collection.call_count == 1
+
+    def test_expired_entry_is_refetched(self, monkeypatch):
+        client = _client_with_collection()
+        qc_mod._validate_collection_schema(client, "c", settings.EMBEDDING_DIM)
+        monkeypatch.setattr(qc_mod, "_SCHEMA_TTL", 0.0)
+
+        qc_mod._validate_collection_schema(client, "c", settings.EMBEDDING_DIM)
+
+        assert client.get_collection.call_count == 2
+
+    def test_mismatch_is_not_cached(self):
+        client = _client_with_collection(dim=3)
+        with pytest.raises(RuntimeError, match="dimension mismatch"):
+            qc_mod._validate_collection_schema(client, "c", settings.EMBEDDING_DIM)
+
+        assert "c" not in qc_mod._SCHEMA_CACHE
+
+
+class TestCountHelpers:
+    def test_count_match_sends_filter_through_client(self, monkeypatch):
+        client = Mock()
+        client.count.return_value = SimpleNamespace(count=7)
+        monkeypatch.setattr(qc_mod, "get_qdrant_client", lambda: client)
+
+        assert qc_mod.count_match("c", "kind", "pdf") == 7
+        flt = client.count.call_args.kwargs["count_filter"]
+        assert flt.must[0].key == "kind"
+        assert flt.must[0].match.value == "pdf"
+
+    def test_missing_collection_counts_as_zero(self, monkeypatch):
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        client = Mock()
+        client.count.side_effect = UnexpectedResponse(404, "Not Found", b"", {})
+        monkeypatch.setattr(qc_mod, "get_qdrant_client", lambda: client)
+
+        assert qc_mod.count_total("missing") == 0
+
+    def test_other_errors_propagate(self, monkeypatch):
+        client = Mock()
+        client.count.side_effect = ConnectionError("refused")
+        monkeypatch.setattr(qc_mod, "get_qdrant_client", lambda: client)
+
+        with pytest.raises(ConnectionError):
+            qc_mod.count_total("c")
+
+    def test_count_is_approximate_by_default(self):
+        client = Mock()
+        client.count.return_value = SimpleNamespace(count=5)
+
+        assert qc_mod.count(collection_name="c", client=client) == 5
+        assert client.count.call_args.kwargs["exact"] is False
+
+
+class TestSharedClient:
+    def test_concurrent_first_calls_create_one_client(self, monkeypatch):
+        import threading
+
+        created = []
+        monkeypatch.setattr(qc_mod, "_CLIENT", None)
+        monkeypatch.setattr(
+            qc_mod, "_new_client", lambda: created.append(object()) or created[-1]
+        )
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(qc_mod.get_qdrant_client()))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(created) == 1
+        assert all(r is created[0] for r in results)
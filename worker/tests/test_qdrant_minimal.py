@@ -1,101 +1,267 @@
-from unittest.mock import patch, Mock
-from app.services.qdrant_minimal import ensure_collection_minimal
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, patch
+
+import httpx
+import pytest
+import requests
+from pydantic import BaseModel
+
+from app.services import qdrant_minimal
+from app.services.qdrant_minimal import _as_dict, ensure_collection_minimal
+
+# Keep this file on one xdist worker (--dist=loadgroup): its class-scoped
+# session patch and the module's ensure/in-flight caches are per process
+pytestmark = pytest.mark.xdist_group(name="qdrant_mocks")
+
+
+def _response(status_code, body=None, text="", content=None):
+    """Plain stand-in for requests.Response: only what qdrant_minimal reads."""
+    if content is None:
+        content = json.dumps(body if body is not None else {}).encode()
+    return SimpleNamespace(status_code=status_code, content=content, text=text)
+
+
+def _vectors(size):
+    return {"size": size, "distance": "Cosine"}
+
+
+def _existing(size):
+    return {"config": {"params": {"vectors": _vectors(size)}}}
+
+
+@pytest.fixture(scope="class")
+def _patched_session():
+    # Patched once per class; `http` resets the mocks between tests
+    with patch.multiple(
+        qdrant_minimal._SESSION, get=DEFAULT, put=DEFAULT, autospec=True
+    ) as mocks:
+        yield SimpleNamespace(**mocks)
+
+
+@pytest.fixture
+def http(_patched_session):
+    for m in (_patched_session.get, _patched_session.put):
+        m.reset_mock()  # calls; each test sets the return_value it needs
+        m.side_effect = None
+    qdrant_minimal.reset_ensure_cache()
+    return _patched_session
 
 
 class TestQdrantMinimal:
-    @patch("requests.get")
-    @patch("requests.put")
-    def test_ensure_collection_existing_success(self, mock_put, mock_get):
-        """Test successful verification of existing collection"""
-        # Mock existing collection response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "config": {"params": {"vectors": {"size": 768, "distance": "Cosine"}}}
-        }
-        mock_get.return_value = mock_response
-
-        success, error = ensure_collection_minimal("test_collection", 768)
-
-        assert success is True
-        assert error is None
-        mock_get.assert_called_once()
-        mock_put.assert_not_called()
-
-    @patch("requests.get")
-    @patch("requests.put")
-    def test_ensure_collection_existing_dimension_mismatch(self, mock_put, mock_get):
-        """Test dimension mismatch in existing collection"""
-        # Mock existing collection with wrong dimension
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "config": {"params": {"vectors": {"size": 512, "distance": "Cosine"}}}
-        }
-        mock_get.return_value = mock_response
-
-        success, error = ensure_collection_minimal("test_collection", 768)
-
-        assert success is False
-        assert "dimension 512, but model expects 768" in error
-        mock_get.assert_called_once()
-        mock_put.assert_not_called()
-
-    @patch("requests.get")
-    @patch("requests.put")
-    def test_ensure_collection_create_new(self, mock_put, mock_get):
-        """Test creating new collection"""
-        # Mock collection not found
-        mock_get_response = Mock()
-        mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
-
-        # Mock successful creation
-        mock_put_response = Mock()
-        mock_put_response.status_code = 200
-        mock_put.return_value = mock_put_response
-
-        success, error = ensure_collection_minimal("test_collection", 768)
-
-        assert success is True
-        assert error is None
-        mock_get.assert_called_once()
-        mock_put.assert_called_once()
-
-        # Verify PUT call arguments
-        put_call = mock_put.call_args
-        assert put_call[0][0].endswith("/collections/test_collection")
-        assert put_call[1]["json"] == {"vectors": {"size": 768, "distance": "Cosine"}}
-
-    @patch("requests.get")
-    @patch("requests.put")
-    def test_ensure_collection_create_failure(self, mock_put, mock_get):
-        """Test failure when creating collection"""
-        # Mock collection not found
-        mock_get_response = Mock()
-        mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
-
-        # Mock creation failure
-        mock_put_response = Mock()
-        mock_put_response.status_code = 500
-        mock_put_response.text = "Internal server error"
-        mock_put.return_value = mock_put_response
-
-        success, error = ensure_collection_minimal("test_collection", 768)
-
-        assert success is False
-        assert "Failed to create collection" in error
-        assert "status 500" in error
-        assert "Internal server error" in error
-
-    @patch("requests.get")
-    def test_ensure_collection_request_exception(self, mock_get):
+    # (get status, GET body, PUT status, PUT text, expected size or error match)
+    CASES = [
+        pytest.param(200, _existing(768), None, "", 768, id="existing_ok"),
+        pytest.param(200, _existing(512), None, "", "size=512", id="mismatch"),
+        pytest.param(404, {}, 200, "", 768, id="create_ok"),
+        pytest.param(
+            404,
+            {},
+            500,
+            "Internal server error",
+            r"Failed to create collection .*status 500 Internal server error",
+            id="create_fail",
+        ),
+    ]
+
+    @pytest.mark.parametrize("get_status,get_body,put_status,put_text,expected", CASES)
+    def test_ensure_collection(
+        self, http, get_status, get_body, put_status, put_text, expected
+    ):
+        """Verify an existing collection, or create it on 404"""
+        http.get.return_value = _response(get_status, get_body)
+        http.put.return_value = _response(put_status, text=put_text)
+
+        if isinstance(expected, str):
+            with pytest.raises(RuntimeError, match=expected):
+                ensure_collection_minimal(None, name="test_collection", dim=768)
+        else:
+            config = ensure_collection_minimal(None, name="test_collection", dim=768)
+            assert config["params"]["vectors"] == _vectors(expected)
+
+        assert http.get.call_count == 1
+        if put_status is None:
+            assert http.put.call_count == 0
+        else:
+            # Created with exactly the requested unnamed-vector schema
+            url, kwargs = http.put.call_args[0][0], http.put.call_args[1]
+            assert url.endswith("/collections/test_collection")
+            assert kwargs["json"] == {"vectors": _vectors(768)}
+
+    def test_ensure_collection_request_exception(self, http):
         """Test handling of request exceptions"""
-        mock_get.side_effect = Exception("Connection error")
+        http.get.side_effect = requests.ConnectionError("Connection error")
+
+        with pytest.raises(
+            RuntimeError, match="Qdrant operation failed: Connection error"
+        ):
+            ensure_collection_minimal(None, name="test_collection", dim=768)
+
+    def test_unparseable_body_is_wrapped_but_bugs_propagate(self, http):
+        http.get.return_value = _response(200, content=b"<html>proxy error</html>")
+        with pytest.raises(RuntimeError, match="Qdrant operation failed"):
+            ensure_collection_minimal(None, name="test_collection", dim=768)
+
+        http.get.side_effect = KeyError("bug")
+        with pytest.raises(KeyError):
+            ensure_collection_minimal(None, name="test_collection", dim=768)
+
+
+class TestAsDict:
+    def test_converts_models_dicts_and_plain_objects(self):
+        class Params(BaseModel):
+            size: int = 768
+
+        class Plain:
+            def __init__(self):
+                self.size = 4
+                self._hidden = 1
+
+        raw = {"size": 1}
+        assert _as_dict(None) == {}
+        assert _as_dict(raw) is raw
+        assert _as_dict(Params()) == {"size": 768}
+        assert _as_dict(Plain()) == {"size": 4}
+
+    def test_converter_is_cached_per_type(self):
+        class Params(BaseModel):
+            size: int = 1
+
+        _as_dict(Params())
+        fn = qdrant_minimal._CONVERTERS[Params]
+        _as_dict(Params(size=2))
+        assert qdrant_minimal._CONVERTERS[Params] is fn
+
+    def test_failing_model_dump_falls_through(self):
+        class Broken:
+            def __init__(self):
+                self.size = 9
+
+            def model_dump(self):
+                raise ValueError("boom")
+
+        assert _as_dict(Broken()) == {"size": 9}
+
+
+class TestEnsureCache:
+    def test_second_ensure_skips_the_round_trip(self, http):
+        http.get.return_value = _response(200, _existing(768))
+
+        first = ensure_collection_minimal(None, name="c", dim=768)
+        second = ensure_collection_minimal(None, name="c", dim=768)
+
+        assert http.get.call_count == 1
+        assert first["params"]["vectors"]["size"] == 768
+        assert second["params"]["vectors"]["size"] == 768
+
+    def test_mismatch_is_not_cached_and_reset_forgets(self, http):
+        http.get.return_value = _response(200, _existing(512))
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                ensure_collection_minimal(None, name="c", dim=768)
+        assert http.get.call_count == 2
+
+        http.get.reset_mock()
+        http.get.return_value = _response(200, _existing(768))
+        ensure_collection_minimal(None, name="c", dim=768)
+        qdrant_minimal.reset_ensure_cache("c")
+        ensure_collection_minimal(None, name="c", dim=768)
+        assert http.get.call_count == 2
+
+
+class TestCreatePath:
+    def test_create_does_not_read_the_collection_back(self, http):
+        http.get.return_value = _response(404)
+        http.put.return_value = _response(200)
+
+        cfg = ensure_collection_minimal(None, name="c", dim=768)
+
+        assert cfg == {"params": {"vectors": _vectors(768)}}
+        assert http.get.call_count == 1
+        assert http.put.call_count == 1
+
+    def test_concurrent_create_is_verified_instead_of_failing(self, http):
+        http.get.side_effect = [_response(404), _response(200, _existing(768))]
+        http.put.return_value = _response(409)
+
+        cfg = ensure_collection_minimal(None, name="c", dim=768)
+
+        assert cfg["params"]["vectors"]["size"] == 768
+        assert http.get.call_count == 2
+
+    def test_ensure_collection_singleflight(self, http):
+        not_found = _response(404)
+        # Slow GET so the other threads arrive while the first is in flight
+        http.get.side_effect = lambda *a, **k: time.sleep(0.05) or not_found
+        http.put.return_value = _response(200)
+        start = threading.Barrier(8)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(ensure_collection_minimal(None, name="c", dim=768))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert len(results) == 8
+        assert http.get.call_count == 1
+        assert http.put.call_count == 1
+        assert qdrant_minimal._INFLIGHT == {}
+
+
+class TestAsyncEnsure:
+    def _serve(self, monkeypatch, existing):
+        """MockTransport Qdrant: `existing` maps name -> dim; records requests."""
+        seen = []
+
+        def handler(request):
+            name = request.url.path.rsplit("/", 1)[-1]
+            seen.append((request.method, name))
+            if request.method == "GET":
+                if name not in existing:
+                    return httpx.Response(404, json={})
+                vectors = {"size": existing[name], "distance": "Cosine"}
+                return httpx.Response(
+                    200, json={"result": {"config": {"params": {"vectors": vectors}}}}
+                )
+            if request.method == "PUT":
+                existing[name] = json.loads(request.content)["vectors"]["size"]
+                return httpx.Response(200, json={"result": True})
+            return httpx.Response(405)
+
+        monkeypatch.setattr(
+            qdrant_minimal,
+            "_async_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        qdrant_minimal.reset_ensure_cache()
+        return seen
+
+    def test_ensures_many_collections_in_one_gather(self, monkeypatch):
+        seen = self._serve(monkeypatch, {"a": 768})
+
+        configs = asyncio.run(
+            qdrant_minimal.aensure_collections_minimal([("a", 768), ("b", 384)])
+        )
+
+        assert [c["params"]["vectors"]["size"] for c in configs] == [768, 384]
+        assert sorted(seen) == [("GET", "a"), ("GET", "b"), ("PUT", "b")]
+
+        # Verified collections are shared with the sync path's cache
+        seen.clear()
+        asyncio.run(qdrant_minimal.aensure_collection_minimal(name="b", dim=384))
+        assert seen == []
 
-        success, error = ensure_collection_minimal("test_collection", 768)
+    def test_mismatch_raises_like_the_sync_path(self, monkeypatch):
+        self._serve(monkeypatch, {"a": 512})
 
-        assert success is False
-        assert "Unexpected error" in error
-        assert "Connection error" in error
+        with pytest.raises(RuntimeError, match="size=512"):
+            asyncio.run(qdrant_minimal.aensure_collection_minimal(name="a", dim=768))
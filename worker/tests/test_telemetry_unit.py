@@ -0,0 +1,112 @@
+"""Unit tests for worker telemetry (counters + background JSONL writer)."""
+
+import json
+
+import pytest
+
+from worker.app.telemetry import Telemetry
+
+
+@pytest.fixture
+def tel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Telemetry()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestJsonlWriter:
+    def test_log_json_is_written_after_flush(self, tel):
+        tel.log_json("ingest", level="info", path="a.txt", note="café")
+        tel.log_json("ingest", level="error", path="b.txt")
+
+        assert tel.flush(timeout=5)
+        entries = _lines(tel._log_file)
+        assert [e["path"] for e in entries] == ["a.txt", "b.txt"]
+        assert entries[0]["note"] == "café"
+        assert entries[1]["subsystem"] == "worker"
+
+    def test_entries_orjson_rejects_are_still_written(self, tel):
+        tel.log_json("ingest", level="info", path="a.txt", counts={1: 2})
+        tel.log_json("ingest", level="info", path="b.txt", big=1 << 70)
+        tel.log_json("ingest", level="info", path="c.txt", tags={"x"})
+
+        assert tel.flush(timeout=5)
+        entries = _lines(tel._log_file)
+        assert [e["path"] for e in entries] == ["a.txt", "b.txt", "c.txt"]
+        assert entries[0]["counts"] == {"1": 2}
+        assert entries[1]["big"] == 1 << 70
+        assert entries[2]["tags"] == "{'x'}"
+
+    def test_activity_goes_to_buffer_and_file(self, tel):
+        aid = tel.record_ingest_activity(
+            path="x.pdf", filename="x.pdf", kind="pdf", status="processed", reason=""
+        )
+
+        assert tel.flush(timeout=5)
+        assert _lines(tel._ingest_activity_file)[0]["id"] == aid
+        assert tel.get_recent_activity()[0]["id"] == aid
+
+    def test_rotates_when_over_limit(self, tel):
+        tel._max_log_bytes = 50
+        for i in range(3):
+            tel.log_json("e", i=i)
+            assert tel.flush(timeout=5)
+
+        rotated = tel._log_file.with_suffix(".jsonl.1")
+        assert rotated.exists()
+        tel.log_json("after")
+        assert tel.flush(timeout=5)
+        assert _lines(tel._log_file)[-1]["event"] == "after"
+
+    def test_size_check_uses_byte_counter_not_stat(self, tel, monkeypatch):
+        tel.log_json("first")
+        assert tel.flush(timeout=5)
+        size = tel._log_file.stat().st_size
+        assert tel._sizes[tel._log_file] == size
+
+        calls = []
+        real_stat = type(tel._log_file).stat
+
+        def counting_stat(self, *a, **k):
+            calls.append(self)
+            return real_stat(self, *a, **k)
+
+        monkeypatch.setattr(type(tel._log_file), "stat", counting_stat)
+        tel.log_json("second")
+        assert tel.flush(timeout=5)
+        assert calls == []
+        assert tel._sizes[tel._log_file] > size
+
+
+class TestCounters:
+    def test_increment_and_stats(self, tel):
+        tel.increment("ingest_total")
+        tel.increment("ingest_total")
+        tel.increment("export_total")
+        tel.set_error("boom")
+
+        stats = tel.get_stats()
+        assert stats["ingest_total"] == 2
+        assert stats["export_total"] == 1
+        assert stats["ingest_failed"] == 0
+        assert stats["last_error"] == "boom"
+
+    def test_unknown_counter_is_ignored(self, tel):
+        tel.increment("nope")
+
+        assert "nope" not in tel.get_stats()
+
+
+class TestIsoNow:
+    def test_matches_datetime_isoformat(self, monkeypatch):
+        from datetime import datetime, timezone
+
+        from worker.app import telemetry as tel_mod
+
+        for t in (1700000000.25, 1700000000.5, 1700000001.0):
+            monkeypatch.setattr(tel_mod.time, "time", lambda t=t: t)
+            expected = datetime.fromtimestamp(t, timezone.utc).isoformat()
+            assert tel_mod._iso_now() == expected